@@ -0,0 +1,94 @@
+"""
+Carte des distances vers une cible (Dijkstra map / flow field)
+
+One breadth-first search from the target (the hero) gives the walking
+distance of every reachable cell. Any number of monsters can then walk
+towards the target by descending the map, in O(1) per step, instead of
+running one A* search per monster.
+"""
+from array import array
+from collections import deque
+from typing import List, Optional
+
+from algo.occupancy import BLOCKING, OCCUPIED, OccupancyGrid
+
+UNREACHABLE = -1
+
+
+class DistanceMap:
+    """
+    Walking distances to ``target`` over an occupancy grid (4 directions).
+
+    Walls and closed doors block the search; monsters do not, since they move
+    every round. The map is only rebuilt by update() when the target moves or
+    a door changes state (grid.door_version).
+    """
+
+    def __init__(self, grid: OccupancyGrid):
+        self.grid = grid
+        self.target: Optional[tuple] = None
+        self.door_version = -1
+        self.distances = array('i')
+        self.builds = 0
+
+    def update(self, target: tuple) -> bool:
+        """Rebuild the map for target if needed; returns True if a search was run"""
+        if target == self.target and self.door_version == self.grid.door_version and len(self.distances) == self.grid.width * self.grid.height:
+            return False
+        grid = self.grid
+        w, h, cells = grid.width, grid.height, grid.cells
+        distances = array('i', [UNREACHABLE]) * (w * h)
+        self.target = target
+        self.door_version = grid.door_version
+        self.distances = distances
+        self.builds += 1
+        if not grid.in_bounds(*target):
+            return True
+
+        start = target[1] * w + target[0]
+        distances[start] = 0
+        to_visit = deque([start])
+        while to_visit:
+            i = to_visit.popleft()
+            d = distances[i] + 1
+            x = i % w
+            for n in (i - 1 if x > 0 else -1, i - w, i + 1 if x < w - 1 else -1, i + w):
+                if 0 <= n < w * h and distances[n] == UNREACHABLE and not cells[n] & BLOCKING:
+                    distances[n] = d
+                    to_visit.append(n)
+        return True
+
+    def distance(self, pos: tuple) -> int:
+        """Walking distance from pos to the target, or UNREACHABLE"""
+        x, y = pos
+        if not self.grid.in_bounds(x, y):
+            return UNREACHABLE
+        return self.distances[y * self.grid.width + x]
+
+    def descend(self, pos: tuple, steps: int, avoid_occupied: bool = True) -> List[tuple]:
+        """
+        Up to ``steps`` cells walked from pos towards the target, stopping next to it
+        (the target cell itself is never entered). Returns [] if pos cannot get closer.
+        """
+        grid = self.grid
+        w, h, cells, distances = grid.width, grid.height, grid.cells, self.distances
+        x, y = pos
+        if not grid.in_bounds(x, y):
+            return []
+        i = y * w + x
+        path: List[tuple] = []
+        for _ in range(steps):
+            d = distances[i]
+            if d <= 1:
+                break
+            x = i % w
+            best = -1
+            for n in (i - 1 if x > 0 else -1, i - w, i + 1 if x < w - 1 else -1, i + w):
+                if 0 <= n < w * h and distances[n] == d - 1 and not (avoid_occupied and cells[n] & OCCUPIED):
+                    best = n
+                    break
+            if best == -1:
+                break
+            i = best
+            path.append((i % w, i // w))
+        return path
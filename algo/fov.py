@@ -0,0 +1,89 @@
+"""
+Champ de vision par ombrage récursif (recursive shadowcasting)
+
+Computes every cell visible from an origin in a single pass over the
+8 octants, instead of tracing one Bresenham line per candidate cell
+(see algo/brehensam.py). Walls and closed doors are lit but stop the light.
+"""
+from collections import OrderedDict
+from typing import Callable, FrozenSet, Set
+
+from algo.occupancy import OccupancyGrid
+
+# Transformations (xx, xy, yx, yy) mapping octant 0 onto the 8 octants
+OCTANTS = [(1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+           (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1)]
+
+
+def _cast_light(is_blocked: Callable[[int, int], bool], in_bounds: Callable[[int, int], bool],
+                cx: int, cy: int, row: int, start: float, end: float, radius: int,
+                xx: int, xy: int, yx: int, yy: int, visible: Set[tuple]):
+    if start < end:
+        return
+    radius_sq = radius * radius
+    new_start = start
+    for j in range(row, radius + 1):
+        dx, dy = -j - 1, -j
+        blocked = False
+        while dx <= 0:
+            dx += 1
+            x, y = cx + dx * xx + dy * xy, cy + dx * yx + dy * yy
+            l_slope, r_slope = (dx - 0.5) / (dy + 0.5), (dx + 0.5) / (dy - 0.5)
+            if start < r_slope:
+                continue
+            elif end > l_slope:
+                break
+            if dx * dx + dy * dy <= radius_sq and in_bounds(x, y):
+                visible.add((x, y))
+            if blocked:
+                if is_blocked(x, y):
+                    new_start = r_slope
+                else:
+                    blocked = False
+                    start = new_start
+            elif is_blocked(x, y) and j < radius:
+                # Début d'une ombre : on éclaire la partie encore visible de la ligne suivante
+                blocked = True
+                _cast_light(is_blocked, in_bounds, cx, cy, j + 1, start, l_slope, radius, xx, xy, yx, yy, visible)
+                new_start = r_slope
+        if blocked:
+            break
+
+
+def compute_fov(is_blocked: Callable[[int, int], bool], in_bounds: Callable[[int, int], bool], x: int, y: int, radius: int) -> Set[tuple]:
+    """
+    Cells visible from (x, y) within a euclidean radius.
+    :param is_blocked: (x, y) -> True if the cell stops light
+    :param in_bounds: (x, y) -> True if the cell is on the map
+    """
+    visible: Set[tuple] = {(x, y)}
+    for xx, xy, yx, yy in OCTANTS:
+        _cast_light(is_blocked, in_bounds, x, y, 1, 1.0, 0.0, radius, xx, xy, yx, yy, visible)
+    return visible
+
+
+class FieldOfView:
+    """
+    Field of view bound to an occupancy grid, memoized by
+    (origin, radius, door state) so that redrawing from the same position is free.
+    """
+
+    def __init__(self, grid: OccupancyGrid, max_entries: int = 256):
+        self.grid = grid
+        self.max_entries = max_entries
+        self._cache: OrderedDict = OrderedDict()
+
+    def visible_from(self, pos: tuple, radius: int) -> FrozenSet[tuple]:
+        key = (pos, radius, self.grid.door_version)
+        visible = self._cache.get(key)
+        if visible is not None:
+            self._cache.move_to_end(key)
+            return visible
+        visible = frozenset(compute_fov(self.grid.is_blocked, self.grid.in_bounds, *pos, radius))
+        self._cache[key] = visible
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return visible
+
+    def clear(self):
+        self._cache.clear()
@@ -0,0 +1,143 @@
+"""
+Grille d'occupation d'un niveau de donjon
+
+Flat bytearray view of a level map that answers "is this cell blocked?"
+in O(1), and keeps the obstacle / walkable sets up to date incrementally
+when a door is toggled or a monster moves, instead of rescanning the map.
+"""
+from typing import Dict, Iterable, List, Optional, Set
+
+# Cell flags
+WALL = 0x01
+CLOSED_DOOR = 0x02
+OCCUPIED = 0x04
+
+BLOCKING = WALL | CLOSED_DOOR
+
+WALKABLE_TILES = ('.', '<', '>')
+
+
+class OccupancyGrid:
+    """
+    Occupancy grid of a level, indexed by ``y * width + x``.
+
+    - ``cells`` holds the WALL / CLOSED_DOOR / OCCUPIED flags of each cell
+    - ``occupants`` counts the monsters standing on each cell
+    - ``door_version`` is bumped every time a door changes state, so that
+      callers can key their own caches (field of view, paths...) on it
+    """
+
+    def __init__(self, world_map: List[List[str]], doors: Dict[tuple, bool], occupants: Iterable[tuple] = ()):
+        self.height = len(world_map)
+        self.width = max((len(row) for row in world_map), default=0)
+        self.cells = bytearray(self.width * self.height)
+        self.occupants = bytearray(self.width * self.height)
+        self.door_version = 0
+        self._obstacles: Set[tuple] = set()
+        self._walkable: Set[tuple] = set()
+        self._carte: Optional[List[List[int]]] = None
+
+        for y, row in enumerate(world_map):
+            for x in range(self.width):
+                tile = row[x] if x < len(row) else '#'
+                if tile in WALKABLE_TILES:
+                    self._walkable.add((x, y))
+                elif tile == '#':
+                    self.cells[y * self.width + x] = WALL
+                    self._obstacles.add((x, y))
+        for pos, is_open in doors.items():
+            if not is_open:
+                self._close(pos)
+        for pos in occupants:
+            self.add_occupant(pos)
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        """True if the cell stops movement and line of sight (wall or closed door)"""
+        return not self.in_bounds(x, y) or bool(self.cells[y * self.width + x] & BLOCKING)
+
+    def is_free(self, x: int, y: int) -> bool:
+        """True if a character can step into the cell (not blocked, no monster)"""
+        return self.in_bounds(x, y) and not self.cells[y * self.width + x] & (BLOCKING | OCCUPIED)
+
+    def is_occupied(self, x: int, y: int) -> bool:
+        return self.in_bounds(x, y) and bool(self.cells[y * self.width + x] & OCCUPIED)
+
+    @property
+    def obstacles(self) -> Set[tuple]:
+        """Walls and closed doors (read-only: updated in place by the grid)"""
+        return self._obstacles
+
+    @property
+    def walkable(self) -> Set[tuple]:
+        """Floor and stairs cells that are not behind a closed door (read-only)"""
+        return self._walkable
+
+    def _close(self, pos: tuple):
+        x, y = pos
+        i = y * self.width + x
+        if not self.cells[i] & BLOCKING:
+            self._obstacles.add(pos)
+            self._walkable.discard(pos)
+        self.cells[i] |= CLOSED_DOOR
+
+    def _open(self, pos: tuple):
+        x, y = pos
+        i = y * self.width + x
+        self.cells[i] &= ~CLOSED_DOOR & 0xFF
+        if not self.cells[i] & WALL:
+            self._obstacles.discard(pos)
+            self._walkable.add(pos)
+
+    def set_door(self, pos: tuple, is_open: bool) -> bool:
+        """Open or close the door at ``pos``; returns True if its state changed"""
+        x, y = pos
+        if not self.in_bounds(x, y):
+            return False
+        was_open = not self.cells[y * self.width + x] & CLOSED_DOOR
+        if was_open == is_open:
+            return False
+        if is_open:
+            self._open(pos)
+        else:
+            self._close(pos)
+        self.door_version += 1
+        self._carte = None
+        return True
+
+    def add_occupant(self, pos: tuple):
+        x, y = pos
+        if not self.in_bounds(x, y):
+            return
+        i = y * self.width + x
+        if self.occupants[i] < 255:
+            self.occupants[i] += 1
+        self.cells[i] |= OCCUPIED
+
+    def remove_occupant(self, pos: tuple):
+        x, y = pos
+        if not self.in_bounds(x, y):
+            return
+        i = y * self.width + x
+        if self.occupants[i]:
+            self.occupants[i] -= 1
+        if not self.occupants[i]:
+            self.cells[i] &= ~OCCUPIED & 0xFF
+
+    def move_occupant(self, old_pos: tuple, new_pos: tuple):
+        if old_pos != new_pos:
+            self.remove_occupant(old_pos)
+            self.add_occupant(new_pos)
+
+    def carte(self) -> List[List[int]]:
+        """Map as 0 (blocked) / 1 (open) rows, as expected by algo.lee; cached until a door toggles"""
+        if self._carte is None:
+            w, cells = self.width, self.cells
+            self._carte = [[0 if cells[y * w + x] & BLOCKING else 1 for x in range(w)] for y in range(self.height)]
+        return self._carte
+
@@ -0,0 +1,122 @@
+"""
+Recherche de chemin A* réutilisable
+
+PathFinder is bound to a level's OccupancyGrid and works on flat cell
+indices (y * width + x). Its visited / parent / cost buffers are allocated
+once and invalidated between searches with a generation stamp, so each
+search only touches the cells it actually explores.
+"""
+import heapq
+from array import array
+from typing import Collection, List, Optional
+
+from algo.occupancy import BLOCKING, OCCUPIED, OccupancyGrid
+
+_MAX_GENERATION = 2 ** 32 - 1
+
+
+class PathFinder:
+    """
+    A* over an occupancy grid (4 directions, Manhattan heuristic).
+
+    - walls and closed doors are read live from the grid, so opening a door needs no rebuild
+    - ``blockers`` adds dynamic obstacles for one search (the goal cell is always allowed)
+    - ``avoid_occupied`` treats cells holding a monster as obstacles
+    - ``max_steps`` returns only the first steps of the path
+    - ``max_expansions`` bounds the search and returns a partial path towards the
+      explored cell closest to the goal
+    """
+
+    def __init__(self, grid: OccupancyGrid):
+        self.grid = grid
+        self.generation = 0
+        self._size = 0
+        self._closed = array('I')
+        self._seen = array('I')
+        self._parent = array('i')
+        self._cost = array('i')
+
+    def _prepare(self) -> int:
+        size = self.grid.width * self.grid.height
+        if size != self._size or self.generation >= _MAX_GENERATION:
+            self._size = size
+            self._closed = array('I', [0]) * size
+            self._seen = array('I', [0]) * size
+            self._parent = array('i', [-1]) * size
+            self._cost = array('i', [0]) * size
+            self.generation = 0
+        self.generation += 1
+        return self.generation
+
+    def find_path(self, start: tuple, end: tuple, blockers: Collection[tuple] = (), avoid_occupied: bool = False,
+                  max_steps: Optional[int] = None, max_expansions: Optional[int] = None) -> List[tuple]:
+        """
+        Shortest path from start to end, both included, or [] if end cannot be reached.
+        """
+        grid = self.grid
+        if not grid.in_bounds(*start) or not grid.in_bounds(*end):
+            return []
+        gen = self._prepare()
+        w, h = grid.width, grid.height
+        cells = grid.cells
+        closed, seen, parent, cost = self._closed, self._seen, self._parent, self._cost
+        start_i, end_i = start[1] * w + start[0], end[1] * w + end[0]
+        end_x, end_y = end
+        if cells[end_i] & BLOCKING:
+            return []
+
+        forbidden = BLOCKING | OCCUPIED if avoid_occupied else BLOCKING
+        blocked = {y * w + x for x, y in blockers if 0 <= x < w and 0 <= y < h}
+        blocked.discard(end_i)
+
+        seen[start_i] = gen
+        cost[start_i] = 0
+        parent[start_i] = -1
+        best_i, best_h = start_i, abs(end_x - start[0]) + abs(end_y - start[1])
+        to_visit: list = [(best_h, 0, start_i)]  # (f_cost, g_cost, index)
+        found = False
+        expansions = 0
+
+        while to_visit:
+            f_cost, g_cost, i = heapq.heappop(to_visit)
+            if closed[i] == gen:
+                continue
+            closed[i] = gen
+            if i == end_i:
+                found = True
+                break
+            h_cost = f_cost - g_cost
+            if h_cost < best_h:
+                best_i, best_h = i, h_cost
+            expansions += 1
+            if max_expansions is not None and expansions >= max_expansions:
+                break
+
+            x, y = i % w, i // w
+            g_next = g_cost + 1
+            for nx, ny in ((x - 1, y), (x, y - 1), (x + 1, y), (x, y + 1)):
+                if not (0 <= nx < w and 0 <= ny < h):
+                    continue
+                n = ny * w + nx
+                if closed[n] == gen or n in blocked or (cells[n] & forbidden and n != end_i):
+                    continue
+                if seen[n] != gen or g_next < cost[n]:
+                    seen[n] = gen
+                    cost[n] = g_next
+                    parent[n] = i
+                    heapq.heappush(to_visit, (g_next + abs(end_x - nx) + abs(end_y - ny), g_next, n))
+
+        if not found:
+            if max_expansions is None or best_i == start_i:
+                return []
+            end_i = best_i
+
+        path: List[tuple] = []
+        i = end_i
+        while i != -1:
+            path.append((i % w, i // w))
+            i = parent[i]
+        path.reverse()
+        if max_steps is not None:
+            path = path[:max_steps + 1]
+        return path
@@ -0,0 +1,64 @@
+"""
+Index spatial des entités d'un niveau
+
+Maps each cell (x, y) to the entities standing on it, so that "what is at
+this cell?" and "what is inside this area?" no longer scan whole lists.
+The index is maintained explicitly on add / remove / move.
+"""
+from typing import Dict, Iterable, List
+
+
+class SpatialHash:
+    """Cell -> entities index (several entities may share a cell)"""
+
+    def __init__(self, entries: Iterable[tuple] = ()):
+        """:param entries: (entity, (x, y)) pairs"""
+        self._cells: Dict[tuple, list] = {}
+        self._count = 0
+        for entity, pos in entries:
+            self.add(entity, pos)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, entity, pos: tuple):
+        self._cells.setdefault(pos, []).append(entity)
+        self._count += 1
+
+    def remove(self, entity, pos: tuple) -> bool:
+        bucket = self._cells.get(pos)
+        if not bucket:
+            return False
+        for i, other in enumerate(bucket):
+            if other is entity:
+                del bucket[i]
+                break
+        else:
+            return False
+        if not bucket:
+            del self._cells[pos]
+        self._count -= 1
+        return True
+
+    def move(self, entity, old_pos: tuple, new_pos: tuple):
+        if old_pos != new_pos and self.remove(entity, old_pos):
+            self.add(entity, new_pos)
+
+    def at(self, pos: tuple) -> List:
+        """Entities at pos (empty list if none)"""
+        return self._cells.get(pos, [])
+
+    def first_at(self, pos: tuple):
+        bucket = self._cells.get(pos)
+        return bucket[0] if bucket else None
+
+    def __contains__(self, pos: tuple) -> bool:
+        return pos in self._cells
+
+    def within(self, cells: Iterable[tuple]) -> List:
+        """Entities standing on any of the given cells, iterating the smaller of the two sides"""
+        if not isinstance(cells, (set, frozenset)):
+            cells = set(cells)
+        if len(self._cells) <= len(cells):
+            return [e for pos, bucket in self._cells.items() if pos in cells for e in bucket]
+        return [e for pos in cells if pos in self._cells for e in self._cells[pos]]
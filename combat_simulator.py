@@ -0,0 +1,292 @@
+"""
+Simulateur de combats Monte Carlo (équilibrage)
+
+Non-interactive version of the explore_dungeon combat loop: N fights of a party
+against encounters drawn by main.generate_encounter, each round played by
+CombatSystem.character_turn / monster_turn in initiative order.
+
+Fights are split into batches run on a ProcessPoolExecutor. Each batch seeds the
+RNG with its own number (seed + batch), so results do not depend on the number of
+workers, and prints nothing. Batch statistics are merged per job (party and
+encounter level): win rate, rounds, damage dealt and taken, deaths.
+
+    python combat_simulator.py --classes fighter wizard --levels 1 3 5 --encounter-levels 1 3 5 --fights 500
+"""
+import argparse
+import contextlib
+import os
+import random
+import time
+from collections import Counter
+from copy import copy
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dnd_5e_core.combat import CombatSystem
+from dnd_5e_core.entities import Character, Monster
+from dnd_5e_core.equipment import Armor, Weapon
+
+CLASSES = ('barbarian', 'bard', 'cleric', 'druid', 'fighter', 'monk', 'paladin', 'ranger', 'rogue', 'sorcerer', 'warlock', 'wizard')
+MAX_ROUNDS = 100  # a fight still going on after that is a draw (timeout)
+
+PartySpec = Tuple[Tuple[str, int], ...]  # (class index, level) of each party member
+
+
+@dataclass(frozen=True)
+class SimulationJob:
+    """A party against encounters of a level (None: levels drawn like explore_dungeon does)"""
+    party: PartySpec
+    encounter_level: Optional[int] = None
+    monster_groups_count: int = 1
+
+    @property
+    def party_label(self) -> str:
+        return ' + '.join(f'{count} x {class_index} {level}' if count > 1 else f'{class_index} {level}'
+                          for (class_index, level), count in Counter(self.party).items())
+
+
+@dataclass
+class FightResult:
+    victory: bool
+    rounds: int
+    damage_dealt: int
+    damage_taken: int  # net of healing
+    deaths: int
+    timeout: bool = False
+
+
+@dataclass
+class SimulationStats:
+    fights: int = 0
+    victories: int = 0
+    timeouts: int = 0
+    rounds: int = 0
+    damage_dealt: int = 0
+    damage_taken: int = 0
+    deaths: int = 0
+    errors: int = 0
+    error: str = ''  # first error message
+
+    def add(self, result: FightResult):
+        self.fights += 1
+        self.victories += result.victory
+        self.timeouts += result.timeout
+        self.rounds += result.rounds
+        self.damage_dealt += result.damage_dealt
+        self.damage_taken += result.damage_taken
+        self.deaths += result.deaths
+
+    def merge(self, other: 'SimulationStats') -> 'SimulationStats':
+        for name in ('fights', 'victories', 'timeouts', 'rounds', 'damage_dealt', 'damage_taken', 'deaths', 'errors'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.error = self.error or other.error
+        return self
+
+    def _mean(self, total: int) -> float:
+        return total / self.fights if self.fights else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self._mean(self.victories)
+
+    @property
+    def mean_rounds(self) -> float:
+        return self._mean(self.rounds)
+
+    @property
+    def mean_damage_dealt(self) -> float:
+        return self._mean(self.damage_dealt)
+
+    @property
+    def mean_damage_taken(self) -> float:
+        return self._mean(self.damage_taken)
+
+
+# Databases of a worker process, loaded on its first batch
+_collections: Optional[dict] = None
+
+
+def _load_collections() -> dict:
+    global _collections
+    if _collections is None:
+        import main
+        races, subraces, classes, alignments, equipments, proficiencies, names, human_names, spells = main.load_character_collections()
+        monsters, armors, weapons, equipments, equipment_categories, potions = main.load_dungeon_collections()
+        _collections = dict(races=races, subraces=subraces, classes=classes, names=names, human_names=human_names, spells=spells,
+                            monsters=monsters, armors=armors, weapons=weapons, equipments=equipments, potions=potions,
+                            encounter_table=main.load_encounter_table())
+    return _collections
+
+
+def _weapon_score(weapon) -> float:
+    try:
+        return weapon.damage_dice.score()
+    except Exception:
+        return 0
+
+
+def _armor_score(armor) -> int:
+    try:
+        return armor.armor_class.get('base', 0)
+    except Exception:
+        return 0
+
+
+def equip_best(char: Character):
+    """
+    Equip the best weapon (damage) and armor (AC) the character is proficient with, as create_new_character does.
+    generate_random_character only matches individual weapon / armor proficiencies, and leaves what it stores unequipped.
+    """
+    weapons = char.prof_weapons or [item for item in char.inventory if isinstance(item, Weapon)]
+    armors = [a for a in char.prof_armors or [item for item in char.inventory if isinstance(item, Armor)]
+              if getattr(a.category, 'index', None) != 'shield' and a.index != 'shield']
+    best_weapon = max(weapons, key=_weapon_score, default=None)
+    best_armor = max(armors, key=_armor_score, default=None)
+    for slot, item in enumerate(char.inventory):
+        if isinstance(item, (Weapon, Armor)):
+            char.inventory[slot] = None
+    for slot, item in enumerate(filter(None, (best_weapon, best_armor))):
+        char.inventory[slot] = copy(item)
+        char.inventory[slot].equipped = True
+
+
+def build_character(class_index: str, level: int, db: dict) -> Character:
+    """Random character of class_index (main.generate_random_character), equipped and raised to level"""
+    from main import generate_random_character
+    classes = [c for c in db['classes'] if c.index == class_index]
+    if not classes:
+        raise ValueError(f'Unknown class {class_index}')
+    char = generate_random_character([], db['races'], db['subraces'], classes, db['names'], db['human_names'], db['spells'])
+    equip_best(char)
+    tome_spells = [s for s in db['spells'] if s is not None and class_index in s.allowed_classes] if char.class_type.can_cast else None
+    while char.level < level:
+        try:
+            char.gain_level(tome_spells=tome_spells)
+        except (KeyError, IndexError):
+            # Incomplete spell tables of some classes: the level and hit points are gained, not the spells
+            tome_spells = None
+    return char
+
+
+def draw_encounter(job: SimulationJob, party: List[Character], db: dict) -> List[Monster]:
+    from main import generate_encounter, generate_encounter_levels
+    encounter_level = job.encounter_level
+    if encounter_level is None:
+        party_level = round(sum(c.level for c in party) / len(party))
+        encounter_level = random.choice(generate_encounter_levels(party_level=party_level))
+    return generate_encounter(available_crs=None, encounter_table=db['encounter_table'], encounter_level=encounter_level,
+                              monsters=db['monsters'], monster_groups_count=job.monster_groups_count)
+
+
+def fight(party: List[Character], monsters: List[Monster], combat_system: CombatSystem, db: dict, max_rounds: int = MAX_ROUNDS) -> FightResult:
+    """Fight to the death (or max_rounds), as the combat loop of explore_dungeon"""
+    party_hp = sum(c.hit_points for c in party)
+    monsters_hp = sum(m.hit_points for m in monsters)
+
+    # Initiative rolls
+    attack_queue = [(c, random.randint(1, c.abilities.dex)) for c in party] + [(m, random.randint(1, m.abilities.dex)) for m in monsters]
+    attack_queue.sort(key=lambda x: x[1], reverse=True)
+    attackers = [c for c, init_roll in attack_queue]
+
+    alive_chars: List[Character] = [c for c in party if c.hit_points > 0]
+    alive_monsters: List[Monster] = [m for m in monsters if m.hit_points > 0]
+    rounds = 0
+    while alive_chars and alive_monsters and rounds < max_rounds:
+        rounds += 1
+        for attacker in attackers:
+            if attacker.hit_points <= 0 or not alive_chars or not alive_monsters:
+                continue
+            if isinstance(attacker, Monster):
+                combat_system.monster_turn(monster=attacker, alive_monsters=alive_monsters, alive_chars=alive_chars, party=party, round_num=rounds)
+            else:
+                combat_system.character_turn(character=attacker, alive_chars=alive_chars, alive_monsters=alive_monsters, party=party,
+                                             weapons=db['weapons'], armors=db['armors'], equipments=db['equipments'], potions=db['potions'])
+        alive_chars = [c for c in party if c.hit_points > 0]
+        alive_monsters = [m for m in monsters if m.hit_points > 0]
+
+    return FightResult(victory=not alive_monsters and bool(alive_chars),
+                       rounds=rounds,
+                       damage_dealt=monsters_hp - sum(max(0, m.hit_points) for m in monsters),
+                       damage_taken=party_hp - sum(max(0, c.hit_points) for c in party),
+                       deaths=len(party) - len(alive_chars),
+                       timeout=bool(alive_chars and alive_monsters))
+
+
+def run_batch(job: SimulationJob, fights: int, seed: int) -> SimulationStats:
+    """Play fights of job in this process (worker entry point), with a new party for each fight and no output"""
+    stats = SimulationStats()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        db = _load_collections()
+        random.seed(seed)
+        combat_system = CombatSystem(verbose=False)
+        for _ in range(fights):
+            try:
+                party = [build_character(class_index, level, db) for class_index, level in job.party]
+                stats.add(fight(party, draw_encounter(job, party, db), combat_system, db))
+            except Exception as e:
+                stats.errors += 1
+                stats.error = stats.error or f'{type(e).__name__}: {e}'
+    return stats
+
+
+def simulate(jobs: Iterable[SimulationJob], fights: int, workers: Optional[int] = None, seed: int = 0, batch_size: int = 50) -> Dict[SimulationJob, SimulationStats]:
+    """
+    fights fights of each job, in batches of batch_size fights spread over workers processes
+    (default: one per CPU, 1: in this process). Same seed and jobs: same statistics.
+    """
+    batches: List[Tuple[SimulationJob, int, int]] = []
+    for job in jobs:
+        for start in range(0, fights, batch_size):
+            batches.append((job, min(batch_size, fights - start), seed + len(batches)))
+    results: Dict[SimulationJob, SimulationStats] = {job: SimulationStats() for job, _, _ in batches}
+    if workers == 1:
+        for batch in batches:
+            results[batch[0]].merge(run_batch(*batch))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [(batch[0], executor.submit(run_batch, *batch)) for batch in batches]
+            for job, future in futures:
+                results[job].merge(future.result())
+    return results
+
+
+def sweep_jobs(classes: Iterable[str], levels: Iterable[int], encounter_levels: Iterable[Optional[int]], party_size: int = 1) -> List[SimulationJob]:
+    """Every class / level / encounter level combination, with parties of party_size characters of the same class"""
+    return [SimulationJob(party=((class_index, level),) * party_size, encounter_level=encounter_level)
+            for class_index, level, encounter_level in product(classes, levels, encounter_levels)]
+
+
+def report(results: Dict[SimulationJob, SimulationStats]) -> str:
+    lines = [f'{"party":<32} {"enc.":>4} {"fights":>6} {"win %":>6} {"rounds":>6} {"dealt":>6} {"taken":>6} {"deaths":>6} {"errors":>6}']
+    for job, stats in results.items():
+        lines.append(f'{job.party_label:<32} {job.encounter_level or "-":>4} {stats.fights:>6} {100 * stats.win_rate:>6.1f} {stats.mean_rounds:>6.1f}'
+                     f' {stats.mean_damage_dealt:>6.1f} {stats.mean_damage_taken:>6.1f} {stats.deaths:>6} {stats.errors:>6}')
+        if stats.error:
+            lines.append(f'    {stats.error}')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Monte Carlo combat simulations (party vs encounters)')
+    parser.add_argument('--classes', nargs='+', default=list(CLASSES), choices=CLASSES)
+    parser.add_argument('--levels', nargs='+', type=int, default=[1])
+    parser.add_argument('--encounter-levels', nargs='+', type=int, default=None, help='default: drawn from the party level')
+    parser.add_argument('--party-size', type=int, default=1)
+    parser.add_argument('--fights', type=int, default=100, help='fights per combination')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per CPU)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    jobs = sweep_jobs(args.classes, args.levels, args.encounter_levels or [None], party_size=args.party_size)
+    start = time.perf_counter()
+    results = simulate(jobs, args.fights, workers=args.workers, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(report(results))
+    total = sum(stats.fights for stats in results.values())
+    print(f'{total} fights in {elapsed:.1f} s ({total / elapsed:.0f} fights/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+"""
+Moteur de donjon sans affichage (soak tests, profilage, équilibrage)
+
+Drives the dungeon_pygame game logic (levels, move_char, handle_combat,
+monsters actions, wandering monsters, chests, fountains, stairs) with a
+scripted hero policy as fast as possible: nothing is drawn, no sound is
+played, and rounds follow a virtual clock (each hero action lasts
+turn_duration seconds of game time) instead of the wall clock.
+
+    python dungeon_headless.py --runs 100 --seed 1
+    python dungeon_headless.py --runs 5 --char Gandalf --profile
+"""
+import argparse
+import contextlib
+import cProfile
+import os
+import pstats
+import random
+import tempfile
+import time
+import traceback
+from collections import Counter, deque
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import dungeon_pygame as dp
+from algo.occupancy import WALL
+from dungeon_pygame import Game, mh_dist
+
+# ('attack', monster), ('move', pos), ('open', door_pos) or ('drink', None)
+HeroAction = Tuple[str, object]
+
+
+class ExplorerPolicy:
+    """
+    Scripted hero: drinks a healing potion when low on hit points, fights the monsters in view,
+    otherwise walks to the downstairs once seen, and to the nearest unseen cell until then.
+
+    Paths are breadth-first searches over the level map: closed doors are opened on the way,
+    upstairs are never entered. The exploration path is followed until its goal has been seen.
+    """
+
+    def __init__(self, low_hp: float = 0.3):
+        self.low_hp = low_hp
+        self.level = None
+        self.passable = bytearray()
+        self.seen = bytearray()
+        self.downstairs: List[int] = []
+        self.path: List[tuple] = []
+        self.goal = -1
+        self._visible = None
+        self.searches = 0  # instrumentation
+
+    def _enter(self, level):
+        grid = level.occupancy
+        w, h = grid.width, grid.height
+        world_map = level.world_map
+        self.level = level
+        self.passable = bytearray(not grid.cells[i] & WALL and world_map[i // w][i % w] != '<' for i in range(w * h))
+        self.seen = bytearray(w * h)
+        self.downstairs = [i for i in range(w * h) if world_map[i // w][i % w] == '>']
+        self.path, self.goal, self._visible = [], -1, None
+
+    def _update_seen(self, game):
+        level = game.level
+        if level is not self.level:
+            self._enter(level)
+        if level.visible_tiles is not self._visible:
+            w = level.occupancy.width
+            for x, y in level.visible_tiles:
+                self.seen[y * w + x] = 1
+            self._visible = level.visible_tiles
+
+    def _search(self, game, is_goal: Callable[[int], bool]) -> List[tuple]:
+        """Shortest path from the hero (excluded) to the nearest cell index matching is_goal, [] if none"""
+        self.searches += 1
+        grid = game.level.occupancy
+        w, size, passable = grid.width, grid.width * grid.height, self.passable
+        start = game.y * w + game.x
+        parents = {start: -1}
+        to_visit = deque([start])
+        while to_visit:
+            i = to_visit.popleft()
+            if i != start and is_goal(i):
+                path: List[tuple] = []
+                while i != start:
+                    path.append((i % w, i // w))
+                    i = parents[i]
+                return path[::-1]
+            x = i % w
+            for n in (i - 1 if x > 0 else -1, i - w, i + 1 if x < w - 1 else -1, i + w):
+                if 0 <= n < size and passable[n] and n not in parents:
+                    parents[n] = i
+                    to_visit.append(n)
+        return []
+
+    def _step(self, game, pos: tuple) -> HeroAction:
+        if game.level.doors.get(pos) is False:
+            return 'open', pos
+        if self.path and self.path[0] == pos:
+            self.path.pop(0)
+        return 'move', pos
+
+    def __call__(self, game) -> Optional[HeroAction]:
+        """Next hero action, None if there is nothing left to do"""
+        self._update_seen(game)
+        hero = game.hero
+        if hero.hit_points < self.low_hp * hero.max_hit_points and hero.healing_potions:
+            return 'drink', None
+
+        w = game.level.occupancy.width
+        monsters = game.monsters_in_view_range
+        if monsters:
+            adjacent = [m for m in monsters if mh_dist(m.pos, game.pos) == 1]
+            if adjacent:
+                return 'attack', min(adjacent, key=lambda m: m.hit_points)
+            targets = {m.pos[1] * w + m.pos[0] for m in monsters}
+            path = self._search(game, targets.__contains__)
+            if path:
+                # Exploration resumes from wherever the fight ends
+                self.path, self.goal = [], -1
+                return self._step(game, path[0])
+
+        if self.path and mh_dist(self.path[0], game.pos) != 1:
+            self.path = []
+        stairs = [i for i in self.downstairs if self.seen[i]]
+        if stairs:
+            if self.goal not in stairs or not self.path:
+                self.path = self._search(game, stairs.__contains__)
+        elif not self.path or self.seen[self.goal]:
+            seen = self.seen
+            self.path = self._search(game, lambda i: not seen[i])
+        if not self.path:
+            return None
+        self.goal = self.path[-1][1] * w + self.path[-1][0]
+        return self._step(game, self.path[0])
+
+
+@dataclass
+class HeadlessRun:
+    """Result of a headless descent"""
+    outcome: str = ''  # 'completed' (left the dungeon), 'dead', 'stuck', 'timeout' or 'error'
+    turns: int = 0
+    rounds: int = 0
+    dungeon_level: int = 1
+    hero_level: int = 1
+    kills: int = 0
+    xp: int = 0
+    gold: int = 0
+    hit_points: int = 0
+    searches: int = 0
+    elapsed: float = 0.0  # seconds
+    error: str = ''  # traceback of the exception that ended the run
+
+
+def act(game, action: HeroAction):
+    """Play a hero action the way the keyboard handlers of main_game_loop do"""
+    kind, target = action
+    if kind == 'drink':
+        dp.handle_healing_potion_use(game)
+    elif kind == 'open':
+        dp.open_door(game, target)
+    elif kind == 'attack':
+        dp.attack_monster(game=game, monster=target)
+    else:
+        monster = game.level.monster_at(target)
+        if monster:
+            dp.attack_monster(game=game, monster=monster)
+        else:
+            dp.handle_combat(game=game, monsters=game.monsters_in_view_range, move_position=target)
+
+
+def _play_turns(game, policy: Callable, run: HeadlessRun, max_turns: int, turn_duration: float) -> str:
+    game.finished = False
+    now = game.last_round_time = time.time()
+    game.update_visible_tiles()
+    while not game.finished:
+        if run.turns >= max_turns:
+            return 'timeout'
+        action = policy(game)
+        if action is None:
+            return 'stuck'
+        act(game, action)
+        run.turns += 1
+        if game.hero.hit_points > 0:
+            dp.pick_up_items(game)
+            dp.handle_game_conditions(game)
+            now += turn_duration
+            dp.simulate_step(game, now)
+        if game.hero.hit_points <= 0:
+            return 'dead'
+    return 'completed'
+
+
+def play(game, policy: Optional[Callable] = None, game_path: Optional[str] = None, max_turns: int = 5000,
+         turn_duration: float = 1.0, quiet: bool = True) -> HeadlessRun:
+    """
+    Play game without display until the hero dies, leaves the dungeon, has nowhere to go, max_turns or an exception
+    Saves made during the game (fountains, end of the dungeon) go to game_path (default: a temporary directory).
+    """
+    policy = policy or ExplorerPolicy()
+    run = HeadlessRun()
+    start = time.perf_counter()
+    headless, dp.headless = dp.headless, True
+    with contextlib.ExitStack() as stack:
+        # dungeon_pygame is muted for this run only
+        stack.callback(setattr, dp, 'headless', headless)
+        if game_path is None:
+            game_path = stack.enter_context(tempfile.TemporaryDirectory(prefix='dungeon_headless_'))
+        for subdir in ('characters', 'pygame'):
+            os.makedirs(f'{game_path}/{subdir}', exist_ok=True)
+        if quiet:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+        dp.setup_session(game, game_path=game_path)
+        dp.level_prefetcher.discard()
+        dp.prefetch_next_level(game)
+        try:
+            run.outcome = _play_turns(game, policy, run, max_turns, turn_duration)
+        except Exception:
+            # Soak runs keep going: the failure is reported with the run
+            run.outcome, run.error = 'error', traceback.format_exc()
+    hero = game.hero
+    run.rounds, run.dungeon_level = game.round_no, game.dungeon_level
+    run.hero_level, run.kills, run.xp, run.gold, run.hit_points = hero.level, len(hero.kills), hero.xp, hero.gold, hero.hit_points
+    run.searches = getattr(policy, 'searches', 0)
+    run.elapsed = time.perf_counter() - start
+    return run
+
+
+def soak(hero_factory: Callable, runs: int, max_turns: int = 5000, verbose: bool = True) -> List[HeadlessRun]:
+    """Play runs descents, each one with a new game for hero_factory()"""
+    results: List[HeadlessRun] = []
+    for n in range(1, runs + 1):
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            game = Game(hero=hero_factory())
+        run = play(game, max_turns=max_turns)
+        results.append(run)
+        if verbose:
+            print(f'#{n:<4} {run.outcome:<9} dungeon level {run.dungeon_level:>2} - {run.turns:>5} turns - hero level {run.hero_level:>2} - {run.kills:>3} kills - {run.elapsed:.2f} s')
+            if run.error:
+                print(run.error.rstrip().splitlines()[-1])
+    return results
+
+
+def summary(results: List[HeadlessRun]) -> str:
+    total = sum(r.elapsed for r in results) or 1e-9
+    turns = sum(r.turns for r in results)
+    outcomes = ', '.join(f'{outcome}: {count}' for outcome, count in Counter(r.outcome for r in results).most_common())
+    return (f'{len(results)} runs ({outcomes}) in {total:.1f} s - {60 * len(results) / total:.0f} runs/min, {turns / total:.0f} turns/s\n'
+            f'mean dungeon level {sum(r.dungeon_level for r in results) / len(results):.1f}'
+            f' (max {max(r.dungeon_level for r in results)}),'
+            f' mean hero level {sum(r.hero_level for r in results) / len(results):.1f},'
+            f' mean kills {sum(r.kills for r in results) / len(results):.1f}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Headless dungeon descents (no display, no sound)')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--char', help='character of the roster (default: a new random character for each run)')
+    parser.add_argument('--seed', type=int, help='random seed, for reproducible runs')
+    parser.add_argument('--max-turns', type=int, default=5000)
+    parser.add_argument('--profile', action='store_true', help='print the 25 most expensive functions')
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if args.char:
+            from persistence import load_character
+            from tools.common import get_save_game_path
+            char = load_character(args.char, f'{get_save_game_path()}/characters')
+
+            def hero_factory():
+                return deepcopy(char)
+        else:
+            from main import generate_random_character, load_character_collections
+            races, subraces, classes, alignments, equipments, proficiencies, names, human_names, spells = load_character_collections()
+
+            def hero_factory():
+                return generate_random_character([], races, subraces, classes, names, human_names, spells)
+    if args.char and char is None:
+        parser.error(f'character {args.char} not found')
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    results = soak(hero_factory, args.runs, max_turns=args.max_turns)
+    if profiler:
+        profiler.disable()
+    print(summary(results))
+    if profiler:
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,15 +4,18 @@ from __future__ import annotations
 
 import math
 import os
-import pickle
 import re
 import sys
 import time
+import weakref
+from array import array
+from bisect import bisect_left
+from concurrent.futures import Future, ThreadPoolExecutor
 from copy import copy
 from dataclasses import dataclass
 from pathlib import Path
 from random import choice, randint
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 import pygame
 from pygame import Surface
@@ -53,7 +56,11 @@ except ImportError:
 		item: object = None
 
 from algo.brehensam import in_view_range
-from algo.lee import parcours_largeur, parcours_a_star
+from algo.occupancy import OccupancyGrid
+from algo.fov import FieldOfView
+from algo.pathfinding import PathFinder
+from algo.distance_map import DistanceMap
+from algo.spatial_hash import SpatialHash
 
 # Import from persistence module
 from persistence import get_roster, save_character, load_character
@@ -76,11 +83,12 @@ print()
 load_xp_levels = lambda: XP_LEVELS
 
 from populate_rpg_functions import load_potions_collections, load_weapon_image_name, load_armor_image_name, load_potion_image_name
-from tools.cell_bits_dnd import DOORSPACE, TRAPPED, STAIR_UP, STAIR_DN
 from tools.common import generate_cave, generate_dungeon, GREEN, resource_path, get_save_game_path, read, MAX_LEVELS
-from tools.parse_json_dungeon import parse_dungeon_json
-from tools import cell_bits_dnd as cb
-from tools.parsing_json_monsters import get_monster_counts
+from tools.compile_dungeon import load_compiled_dungeon, unpack_open_space
+from tools.sound_bank import get_sound_bank, play_sound as play_bank_sound
+from tools.sprite_sheets import sheet_frames
+from tools.surface_cache import TokenImages, new_sprite_id, surface_cache
+from tools import save_format
 
 print("✅ [MIGRATION v2] dungeon_pygame.py - Using dnd-5e-core package")
 print()
@@ -118,6 +126,7 @@ ROUND_DURATION = 6  # Duration of a round in seconds
 # Global variables
 room_no = 0
 screen = None  # Will be initialized in main_game_loop
+headless = False  # Game logic only: nothing drawn, no sound (see dungeon_headless.py)
 
 
 def put_inlay(image: pygame.Surface, number: int, center=False, color=WHITE):
@@ -199,12 +208,14 @@ class Level:
 	items: List[Equipment | HealingPotion]
 	cells_count: int
 	explored_tiles: set[tuple]
-	visible_tiles: set[tuple]
+	visible_tiles: frozenset[tuple]
 	doors: dict
 	fullname: str
 	rooms: List[Room]
+	room_cells: Optional[array] = None  # donjon ROOM_ID of each cell (y * width + x), 0 outside rooms
 	start_pos: tuple
 	wandering_monsters: List[dict] = []
+	monsters_version: int = 0  # bumped whenever a monster is added, removed or moved
 
 	def __init__(self, level_no: int, name: str = ''):
 		self.level_no = level_no
@@ -215,14 +226,140 @@ class Level:
 		self.map_width = max([len(self.world_map[i]) for i in range(self.map_height)])
 		self.items = []
 		self.explored_tiles = set()
-		self.visible_tiles = set()
+		self.visible_tiles = frozenset()
 		self.treasures = []
 
+	def __getstate__(self):
+		# Derived caches are rebuilt on first access after loading a save
+		state = self.__dict__.copy()
+		state.pop('_occupancy', None)
+		state.pop('_fov', None)
+		state.pop('_pathfinder', None)
+		state.pop('_distance_map', None)
+		state.pop('_spatial', None)
+		state.pop('_rooms_by_cell', None)
+		return state
+
+	@property
+	def occupancy(self) -> OccupancyGrid:
+		"""Occupancy grid built on first access (also for levels loaded from older saves)"""
+		if getattr(self, '_occupancy', None) is None:
+			self._occupancy = OccupancyGrid(self.world_map, self.doors, occupants=[m.pos for m in self.monsters])
+		return self._occupancy
+
+	@property
+	def fov(self) -> FieldOfView:
+		"""Shadowcasting field of view over the occupancy grid, cached by (position, door state)"""
+		if getattr(self, '_fov', None) is None or self._fov.grid is not self.occupancy:
+			self._fov = FieldOfView(self.occupancy)
+		return self._fov
+
+	@property
+	def pathfinder(self) -> PathFinder:
+		"""A* pathfinder bound to the occupancy grid (buffers reused between searches)"""
+		if getattr(self, '_pathfinder', None) is None or self._pathfinder.grid is not self.occupancy:
+			self._pathfinder = PathFinder(self.occupancy)
+		return self._pathfinder
+
+	def distance_map_to(self, target: tuple) -> DistanceMap:
+		"""Distance map toward target, shared by all monsters and rebuilt only when target or doors change"""
+		if getattr(self, '_distance_map', None) is None or self._distance_map.grid is not self.occupancy:
+			self._distance_map = DistanceMap(self.occupancy)
+		self._distance_map.update(target)
+		return self._distance_map
+
+	def set_door(self, pos: tuple, is_open: bool):
+		self.doors[pos] = is_open
+		self.occupancy.set_door(pos, is_open)
+
+	def is_free(self, pos: tuple) -> bool:
+		"""True if a character can step into pos (no wall, closed door or monster)"""
+		return self.occupancy.is_free(*pos)
+
+	@property
+	def spatial(self) -> dict[str, SpatialHash]:
+		"""Cell -> entities indexes (monsters, treasures, fountains, items), built from the lists on first access"""
+		if getattr(self, '_spatial', None) is None:
+			self._spatial = {
+				'monsters': SpatialHash((m, m.pos) for m in self.monsters),
+				'treasures': SpatialHash((t, t.pos) for t in self.treasures if t),
+				'fountains': SpatialHash((f, f.pos) for f in self.fountains),
+				'items': SpatialHash((item, (item.x, item.y)) for item in self.items if item),
+			}
+		return self._spatial
+
+	# Indexes are fetched before mutating the lists so that a lazy build never counts an entity twice
+	def add_monsters(self, monsters: List[GameMonster]):
+		grid, index = self.occupancy, self.spatial['monsters']
+		for monster in monsters:
+			self.monsters.append(monster)
+			grid.add_occupant(monster.pos)
+			index.add(monster, monster.pos)
+		self.monsters_version += 1
+
+	def remove_monster(self, monster: GameMonster):
+		grid, index = self.occupancy, self.spatial['monsters']
+		self.monsters.remove(monster)
+		grid.remove_occupant(monster.pos)
+		index.remove(monster, monster.pos)
+		self.monsters_version += 1
+
+	def move_monster(self, monster: GameMonster, pos: tuple):
+		self.occupancy.move_occupant(monster.pos, pos)
+		self.spatial['monsters'].move(monster, monster.pos, pos)
+		monster.set_position(*pos)
+		self.monsters_version += 1
+
+	def add_treasure(self, treasure: Treasure):
+		index = self.spatial['treasures']
+		self.treasures.append(treasure)
+		index.add(treasure, treasure.pos)
+
+	def remove_treasure(self, treasure: Treasure):
+		index = self.spatial['treasures']
+		self.treasures.remove(treasure)
+		index.remove(treasure, treasure.pos)
+
+	def add_fountain(self, fountain: Sprite):
+		index = self.spatial['fountains']
+		self.fountains.append(fountain)
+		index.add(fountain, fountain.pos)
+
+	def add_item(self, item):
+		index = self.spatial['items']
+		self.items.append(item)
+		index.add(item, (item.x, item.y))
+
+	def remove_item(self, item):
+		# Items keep their slot in the list (set to None)
+		index = self.spatial['items']
+		self.items[self.items.index(item)] = None
+		index.remove(item, (item.x, item.y))
+
+	def monster_at(self, pos: tuple) -> Optional[GameMonster]:
+		return self.spatial['monsters'].first_at(pos)
+
+	def treasure_at(self, pos: tuple) -> Optional[Treasure]:
+		return self.spatial['treasures'].first_at(pos)
+
+	def fountain_at(self, pos: tuple) -> Optional[Sprite]:
+		return self.spatial['fountains'].first_at(pos)
+
 	def room_at(self, pos: tuple) -> Optional[Room]:
-		for room in self.rooms:
-			if room and pos in room.inner_positions:
-				return room
-		return None
+		if getattr(self, '_rooms_by_cell', None) is None:
+			rooms_by_id: dict = {room.id: room for room in self.rooms if room}
+			rooms_by_cell: dict = {}
+			if self.room_cells is not None:
+				for i, room_id in enumerate(self.room_cells):
+					if room_id in rooms_by_id:
+						rooms_by_cell[(i % self.map_width, i // self.map_width)] = rooms_by_id[room_id]
+			else:
+				# Generated maps and older saves: fall back to the room rectangles
+				for room in rooms_by_id.values():
+					for cell in room.inner_positions:
+						rooms_by_cell.setdefault(cell, room)
+			self._rooms_by_cell = rooms_by_cell
+		return self._rooms_by_cell.get(pos)
 
 	def is_stair(self, x, y):
 		return self.world_map[y][x] in ['<', '>']
@@ -263,78 +400,30 @@ class Level:
 			pattern = r' \d+\.json'
 			level_fullname = re.sub(pattern, '', json_filename)
 			# json_filename = 'dungeon.json' # generated by perl script (room+corridors without extras)
-			dungeon = parse_dungeon_json(json_filename)
-			cells = dungeon['cell'] if 'cell' in dungeon else dungeon['cells']
-			maze = [['.' if cell & cb.OPENSPACE else '#' for cell in row] for row in cells]
-			width, height = len(maze[0]), len(maze)
-			if 'door' in dungeon:
-				doors = {(door['col'], door['row']): False for door in dungeon['door']}
-			else:
-				doors = {(x, y): False for x in range(width) for y in range(height) if cells[y][x] & DOORSPACE}
-			door_traps = [(x, y) for x in range(width) for y in range(height) if cells[y][x] & TRAPPED]
-			stair_up = [(x, y) for x in range(width) for y in range(height) if cells[y][x] & STAIR_UP][0]
-			stair_down = [(x, y) for x in range(width) for y in range(height) if cells[y][x] & STAIR_DN][0]
-			# Parse corridor events
-			corridor_features = dungeon['corridor_features'] if 'corridor_features' in dungeon else {}
-			corridor_events: dict = {}
-			if corridor_features:
-				for feature_label, feature_detail in corridor_features.items():
-					for mark in feature_detail['marks']:
-						x, y = mark['col'], mark['row']
-						corridor_events[(x, y)] = feature_detail['detail']
-			# Parse wandering monsters
-			for monsters_detail in dungeon['wandering_monsters'].values():
-				monsters_dict = get_monster_counts(text=monsters_detail)
-				monsters: List[str] = []
-				for monster_name, monster_count in monsters_dict.items():
-					for _ in range(monster_count):
-						monsters.append(monster_name)
-				self.wandering_monsters += [monsters]
-			# Parse room events
-			room_traps: dict = {}
-			room_door_traps: dict = {}
+			# Compiled once per maze file and cached in maze/.compiled/ (see tools/compile_dungeon.py)
+			dungeon = load_compiled_dungeon(json_filename)
+			maze = unpack_open_space(dungeon)
+			width, height = dungeon['width'], dungeon['height']
+			self.room_cells = array('H')
+			self.room_cells.frombytes(dungeon['room_cells'])
+			doors = {pos: False for pos in dungeon['doors']}
+			door_traps: List[tuple] = list(dungeon['door_traps'])
+			stair_up, stair_down = dungeon['stair_up'], dungeon['stair_down']
+			corridor_events: dict = dict(dungeon['corridor_events'])
+			# Per level list (the class attribute used to be shared and extended by every level)
+			self.wandering_monsters = [list(monsters) for monsters in dungeon['wandering_monsters']]
 			rooms: List[Room] = []
-			for i, room in enumerate(dungeon['rooms']):
-				if room:
-					inhabited: bool = False
-					room_features: str = ''
-					monsters_in_room: dict = {}
-					if 'contents' in room:
-						# print(room)
-						if 'detail' in room['contents']:
-							details = room['contents']['detail']
-							if 'trap' in details:
-								room_traps[i] = details['trap']
-							if 'room_features' in details:
-								room_features = details['room_features']
-						if 'inhabited' in room['contents']:
-							inhabited: bool = True
-							monsters_in_room: dict = get_monster_counts(room['contents']['inhabited'])
-					if 'doors' in room:
-						for _dir, door_lst in room['doors'].items():
-							for door in door_lst:
-								if 'trap' in door:
-									x, y = door['col'], door['row']
-									room_door_traps[(x, y)] = door['trap']
-					monsters: List[Monster] = []
-					if monsters_in_room:
-						for monster_name in monsters_in_room:
-							# Load monster from dnd-5e-core
-							monster = request_monster(monster_name.lower().replace(' ', '-'))
-
-							# If not found, skip
-							if monster is None:
-								continue
-
-							# Add monster if found
-							if monster:
-								monsters.append(monster)
-							else:
-								cprint(f'unknown monster {Color.RED}{monster_name}{Color.END}!')
-
-					# Note: monsters will be wrapped with GameMonster and added to self.monsters by place_monsters()
-					room = Room(id=room['id'], inhabited=inhabited, features=room_features, monsters=monsters, x=room['col'], y=room['row'], w=room['width'], h=room['height'])
-					rooms.append(room)
+			for room in dungeon['rooms']:
+				monsters: List[Monster] = []
+				for monster_index in room['monsters']:
+					# Load monster from dnd-5e-core
+					monster = request_monster(monster_index)
+					if monster:
+						monsters.append(monster)
+					else:
+						cprint(f'unknown monster {Color.RED}{monster_index}{Color.END}!')
+				# Note: monsters will be wrapped with GameMonster and added to self.monsters by place_monsters()
+				rooms.append(Room(id=room['id'], inhabited=room['inhabited'], features=room['features'], monsters=monsters, x=room['x'], y=room['y'], w=room['w'], h=room['h']))
 			n_cells = sum([row.count('.') for row in maze])
 		if not stair_up and not stair_down:
 			cprint(f'no stair defined in dungeon!')
@@ -361,36 +450,31 @@ class Level:
 		open_positions: List[tuple] = [(x, y) for x in range(self.map_width) for y in range(self.map_height) if self.world_map[y][x] == '.' and (x, y) != pos and (x, y) not in self.doors]
 		f_x, f_y = choice(open_positions)
 		f: Sprite = Sprite(id=-1, x=f_x, y=f_y, old_x=f_x, old_y=f_y, image_name='fountain.png')
-		self.fountains.append(f)
-		open_positions.remove((f_x, f_y))
+		self.add_fountain(f)
+		open_cells: set[tuple] = set(open_positions)
+		open_cells.remove((f_x, f_y))
 
 		for room in self.rooms:
 			if room and room.inhabited:
-				room_positions = [(x, y) for x, y in room.inner_positions if (x, y) in open_positions]
+				room_positions = [(x, y) for x, y in room.inner_positions if (x, y) in open_cells]
 				self.place_treasure(room, room_positions)
 				# self.place_monsters(room, room_positions, monster_candidates)
 				self.place_monsters(room, room_positions)
-				self.treasures.append(room.treasure)
+				self.add_treasure(room.treasure)
 
 	@property
-	def walkable_tiles(self):
-		closed_doors: List[tuple] = [pos for pos, is_open in self.doors.items() if not is_open]
-		return [(x, y) for y in range(self.map_height) for x in range(self.map_width) if self.world_map[y][x] in ['.', '<', '>'] and (x, y) not in closed_doors]
+	def walkable_tiles(self) -> set[tuple]:
+		# Read-only view, kept up to date by set_door()
+		return self.occupancy.walkable
 
 	@property
-	def obstacles(self):
-		closed_doors: List[tuple] = [pos for pos, is_open in self.doors.items() if not is_open]
-		return [(x, y) for y in range(self.map_height) for x in range(self.map_width) if self.world_map[y][x] == '#' or (x, y) in closed_doors]
+	def obstacles(self) -> set[tuple]:
+		# Read-only view, kept up to date by set_door()
+		return self.occupancy.obstacles
 
 	@property
 	def carte(self) -> List[List[int]]:
-		obstacles = [*self.obstacles]  # + [(e.x, e.y) for e in enemies if e != enemy]
-		carte = [[1] * self.map_width for _ in range(self.map_height)]
-		for y in range(self.map_height):
-			for x in range(self.map_width):
-				if (x, y) in obstacles:
-					carte[y][x] = 0
-		return carte
+		return self.occupancy.carte()
 
 	def place_treasure(self, room: Room, room_positions: List[tuple]):
 		# print(f'room {room.id}: {len(room_positions)} positions - area: {room.area}')
@@ -446,7 +530,7 @@ class Level:
 		# Replace room.monsters with wrapped versions
 		room.monsters = wrapped_monsters
 		# Add to level.monsters
-		self.monsters.extend(wrapped_monsters)
+		self.add_monsters(wrapped_monsters)
 
 	def place_monsters_bad(self, room, room_positions):
 		"""Place monsters in the room and wrap them with GameEntity for positioning"""
@@ -480,6 +564,180 @@ class Level:
 					self.monsters.append(game_monster)
 
 
+class LevelPrefetcher:
+	"""
+	Builds the next dungeon level (maze, monsters, treasures, occupancy grid) on a worker thread
+	while the hero explores the current one, and hands it over when the hero takes the stairs.
+	Only the data side is built off-thread: sprites are still converted on the main thread.
+	Kept at module level (not on Game) so that it is never pickled with the game state.
+	"""
+
+	def __init__(self):
+		self._executor: Optional[ThreadPoolExecutor] = None
+		self._futures: dict[int, Future] = {}
+		self.transitions: List[dict] = []  # instrumentation, one entry per level handed over
+
+	@staticmethod
+	def build_level(level_no: int) -> tuple[Level, float]:
+		start = time.perf_counter()
+		level = Level(level_no=level_no)
+		# The hero's arrival cell is only picked by Game.update_level(), after the hand-over
+		level.load(pos=level.start_pos)
+		level.occupancy  # build the grid off the main thread too
+		return level, (time.perf_counter() - start) * 1000
+
+	def prefetch(self, level_no: int):
+		if level_no > MAX_LEVELS or level_no in self._futures:
+			return
+		if self._executor is None:
+			self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level-prefetch')
+		self._futures[level_no] = self._executor.submit(self.build_level, level_no)
+
+	def take(self, level_no: int) -> Level:
+		"""Prefetched level (waiting for the worker if it is still running), or a level built right now"""
+		start = time.perf_counter()
+		future = self._futures.pop(level_no, None)
+		level, build_ms, prefetched = None, 0.0, future is not None
+		if future:
+			try:
+				level, build_ms = future.result()
+			except Exception as e:
+				print(f'Level {level_no} prefetch failed: {e}')
+				prefetched = False
+		if level is None:
+			level, build_ms = self.build_level(level_no)
+		wait_ms = (time.perf_counter() - start) * 1000
+		self.transitions.append({'level_no': level_no, 'prefetched': prefetched, 'build_ms': build_ms, 'wait_ms': wait_ms})
+		return level
+
+	def discard(self):
+		for future in self._futures.values():
+			future.cancel()
+		self._futures.clear()
+
+
+level_prefetcher = LevelPrefetcher()
+
+
+class TileSet:
+	"""
+	Map tiles loaded once per session into a single atlas surface (converted to the display format),
+	with the darkened variants of explored but not visible cells precomputed, so draw_map() only blits.
+	"""
+	TILES = {
+		'wall': 'sprites/TilesDungeon/Wall.png',
+		'floor': 'sprites/TilesDungeon/Tile.png',
+		'downstairs': 'sprites/DownStairs.png',
+		'upstairs': 'sprites/UpStairs.png',
+		'door_closed': 'sprites/door_closed_2.png',
+		'door_open': 'sprites/door_open_2.png',
+	}
+	DARKENED = ('wall', 'floor')
+	DARK_COLOR = (128, 128, 128, 128)
+	EXPLORED_OTHER_COLOR = (50, 50, 50)  # stairs and doors out of sight
+
+	def __init__(self, path: str):
+		names = list(self.TILES) + [f'dark_{name}' for name in self.DARKENED] + ['dark_other', 'unknown']
+		# The screen is cleared to black each frame: tiles are composited onto black once and for all
+		self.atlas: Surface = pygame.Surface((TILE_SIZE * len(names), TILE_SIZE)).convert()
+		self.atlas.fill(BLACK)
+		self.areas: dict[str, pygame.Rect] = {name: pygame.Rect(i * TILE_SIZE, 0, TILE_SIZE, TILE_SIZE) for i, name in enumerate(names)}
+		for name, filename in self.TILES.items():
+			image = pygame.image.load(f'{path}/{filename}').convert_alpha()
+			self.atlas.blit(image, self.areas[name])
+			if name in self.DARKENED:
+				dark_image = image.copy()
+				dark_image.fill(self.DARK_COLOR, special_flags=pygame.BLEND_RGBA_MULT)
+				self.atlas.blit(dark_image, self.areas[f'dark_{name}'])
+		self.atlas.fill(self.EXPLORED_OTHER_COLOR, self.areas['dark_other'])
+
+
+# Tile sets by game path, created on first draw (the display mode must be set to convert surfaces)
+tile_sets: dict[str, TileSet] = {}
+
+
+def get_tile_set(path: str) -> TileSet:
+	if path not in tile_sets:
+		tile_sets[path] = TileSet(path)
+	return tile_sets[path]
+
+
+class MiniMap:
+	"""
+	Mini-map of a level kept from one frame to the next: only the cells newly explored, or that entered
+	or left the field of view since the last update are repainted. Hero and treasures are drawn on a copy.
+	"""
+	SIZE = (300, 250)
+	WALL_COLOR = (128, 128, 128)
+	STAIRS_COLOR = (0, 0, 255)
+	FOUNTAIN_COLOR = (0, 255, 0)
+	FLOOR_COLOR = (64, 64, 64)
+
+	def __init__(self, level: Level):
+		self.level = level
+		self.scale_x = self.SIZE[0] / level.map_width
+		self.scale_y = self.SIZE[1] / level.map_height
+		self.background: Surface = pygame.Surface(self.SIZE)  # black: nothing explored yet
+		self.surface: Surface = pygame.Surface(self.SIZE)
+		self.painted: set[tuple] = set()  # explored cells already painted
+		self.bright: frozenset[tuple] = frozenset()  # cells painted at full brightness (field of view of the last update)
+		self.painted_count = 0  # instrumentation
+
+	def cell_color(self, x: int, y: int) -> tuple:
+		level = self.level
+		if (x, y) not in level.explored_tiles:
+			return BLACK
+		tile = level.world_map[y][x]
+		if tile == '#':
+			color = self.WALL_COLOR
+		elif tile in ('<', '>'):
+			color = self.STAIRS_COLOR
+		elif level.fountain_at((x, y)):
+			color = self.FOUNTAIN_COLOR
+		else:
+			color = self.FLOOR_COLOR
+		# Explored but not currently visible: 50% brightness
+		return color if (x, y) in level.visible_tiles else tuple(int(c * 0.5) for c in color)
+
+	def update(self):
+		"""Repaint the cells whose color changed since the last update"""
+		level = self.level
+		visible_tiles, explored_tiles = level.visible_tiles, level.explored_tiles
+		if visible_tiles is self.bright and len(explored_tiles) == len(self.painted):
+			return
+		changed = set(visible_tiles.symmetric_difference(self.bright))
+		if len(explored_tiles) != len(self.painted):
+			new_cells = explored_tiles - self.painted
+			changed |= new_cells
+			self.painted |= new_cells
+		scale_x, scale_y = self.scale_x, self.scale_y
+		for x, y in changed:
+			pygame.draw.rect(self.background, self.cell_color(x, y), (x * scale_x, y * scale_y, scale_x, scale_y))
+		self.painted_count += len(changed)
+		self.bright = visible_tiles
+
+	def draw(self, hero_pos: tuple) -> Surface:
+		"""Up to date mini-map with the hero and the explored treasures on top"""
+		self.update()
+		scale_x, scale_y = self.scale_x, self.scale_y
+		self.surface.blit(self.background, (0, 0))
+		pygame.draw.circle(self.surface, RED, (int(hero_pos[0] * scale_x), int(hero_pos[1] * scale_y)), 5)
+		for treasure in self.level.treasures:
+			if treasure.pos in self.level.explored_tiles:
+				pygame.draw.circle(self.surface, (255, 255, 0), (int(treasure.x * scale_x), int(treasure.y * scale_y)), 3)
+		return self.surface
+
+
+# Mini-maps by level, dropped with the level (e.g. when a save is reloaded)
+mini_maps: weakref.WeakKeyDictionary[Level, MiniMap] = weakref.WeakKeyDictionary()
+
+
+def get_mini_map(level: Level) -> MiniMap:
+	if level not in mini_maps:
+		mini_maps[level] = MiniMap(level)
+	return mini_maps[level]
+
+
 class Game:
 	world_map: List[List[int]]
 	map_width: int
@@ -554,6 +812,12 @@ class Game:
 		# Load XP Levels
 		self.xp_levels = load_xp_levels()
 
+	def __getstate__(self):
+		# Memoized view range is recomputed after loading a save
+		state = self.__dict__.copy()
+		state.pop('_monsters_in_view', None)
+		return state
+
 	@property
 	def x(self) -> int:
 		"""Hero's X position (delegates to hero.x)"""
@@ -642,15 +906,9 @@ class Game:
 		seconds = int(time_elapsed)
 		return f'{days}j {hours}h {minutes}m {seconds}s'
 
-	def load_token_images(self, token_images_dir: str) -> dict:
-		token_images = {}
-		for filename in os.listdir(token_images_dir):
-			monster_name, _ = os.path.splitext(filename)
-			image_path = os.path.join(token_images_dir, filename)
-			original_image = pygame.image.load(image_path)
-			# Resize the image to 280x280 pixels
-			token_images[monster_name] = pygame.transform.scale(original_image, (105, 105))
-		return token_images
+	def load_token_images(self, token_images_dir: str) -> TokenImages:
+		# Tokens are decoded and resized (105x105 pixels) the first time a monster is seen
+		return TokenImages(token_images_dir, size=(105, 105))
 
 	# Define a method to calculate the view window
 	def calculate_view_window(self):
@@ -669,59 +927,10 @@ class Game:
 		Shows all explored tiles (no fog of war on mini-map for better navigation).
 		Currently visible tiles are shown brighter than explored-but-not-visible tiles.
 		"""
-		# Set the size of the mini-map
-		mini_map_width = 300
-		mini_map_height = 250
-
-		# Create a new surface for the mini-map
 		OFFSET_X, OFFSET_Y = SCREEN_WIDTH - STATS_WIDTH + 10, 3 * (SCREEN_HEIGHT // 4) - 80
-		mini_map_rect = pygame.Rect(OFFSET_X, OFFSET_Y, mini_map_width, mini_map_height)
-
-		# Calculate the scale factor to fit the map onto the mini-map
-		scale_x = mini_map_width / self.map_width
-		scale_y = mini_map_height / self.map_height
-
-		# Create a new surface for the mini-map
-		mini_map_surface = pygame.Surface((mini_map_width, mini_map_height))
-
-		# Draw the map tiles onto the mini-map surface
-		for y in range(self.map_height):
-			for x in range(self.map_width):
-				# Check if tile has been explored (not visible_tiles, but explored_tiles)
-				if (x, y) not in self.level.explored_tiles:
-					# Never explored - draw black
-					color = BLACK
-				else:
-					# Explored tile - determine color based on tile type
-					tile = self.world_map[y][x]
-					if tile == '#':
-						base_color = (128, 128, 128)  # Wall color
-					elif tile in ('<', '>'):
-						base_color = (0, 0, 255)  # Stairs color
-					elif any(f.pos == (x, y) for f in self.level.fountains):
-						base_color = (0, 255, 0)  # Fountain color
-					else:
-						base_color = (64, 64, 64)  # Floor color
-
-					# If currently visible, show brighter; if just explored, show dimmer
-					if (x, y) in self.level.visible_tiles:
-						color = base_color  # Full brightness
-					else:
-						# Dimmed version (50% brightness) for explored but not currently visible
-						color = tuple(int(c * 0.5) for c in base_color)
 
-				pygame.draw.rect(mini_map_surface, color, (x * scale_x, y * scale_y, scale_x, scale_y))
-
-		# Draw the player's position on the mini-map
-		player_x, player_y = self.hero.x, self.hero.y
-		pygame.draw.circle(mini_map_surface, RED, (int(player_x * scale_x), int(player_y * scale_y)), 5)
-
-		# Draw the treasure positions on the mini-map
-		for treasure in self.level.treasures:
-			if treasure.pos not in self.level.explored_tiles:
-				continue
-			treasure_x, treasure_y = treasure.x, treasure.y
-			pygame.draw.circle(mini_map_surface, (255, 255, 0), (int(treasure_x * scale_x), int(treasure_y * scale_y)), 3)
+		# The mini-map of the level is updated from the cells explored / seen since the last frame
+		mini_map_surface = get_mini_map(self.level).draw((self.hero.x, self.hero.y))
 
 		# Blit the mini-map onto the main game screen
 		screen.blit(mini_map_surface, (OFFSET_X, OFFSET_Y))
@@ -729,13 +938,9 @@ class Game:
 		return mini_map_surface
 
 	def draw_map(self, path, screen):
-		# Load tile sprites
-		photo_wall = pygame.image.load(f"{path}/sprites/TilesDungeon/Wall.png")
-		photo_floor = pygame.image.load(f"{path}/sprites/TilesDungeon/Tile.png")
-		photo_downstairs = pygame.image.load(f"{path}/sprites/DownStairs.png")
-		photo_upstairs = pygame.image.load(f"{path}/sprites/UpStairs.png")
-		photo_door_closed = pygame.image.load(f"{path}/sprites/door_closed_2.png")
-		photo_door_open = pygame.image.load(f"{path}/sprites/door_open_2.png")
+		# Tile sprites (loaded once per session, darkened variants included)
+		tile_set = get_tile_set(path)
+		atlas, areas = tile_set.atlas, tile_set.areas
 
 		# Calculate the view window
 		view_x, view_y, view_width, view_height = self.calculate_view_window()
@@ -745,46 +950,45 @@ class Game:
 		explored_count = 0
 		unknown_count = 0
 
-		# Draw only the portion of the map that falls within the view window
+		# Draw only the portion of the map that falls within the view window, in a single blits() call
+		blits: List[tuple] = []
 		for y in range(view_y, view_y + view_height):
 			for x in range(view_x, view_x + view_width):
 				tile_x, tile_y = (x - view_x) * TILE_SIZE, (y - view_y) * TILE_SIZE
+				tile = self.world_map[y][x]
 				if (x, y) in self.level.visible_tiles:
 					visible_count += 1
 					# Currently visible tiles - full brightness
-					if self.world_map[y][x] == '#':
-						screen.blit(photo_wall, (tile_x, tile_y))
-					elif self.world_map[y][x] == '<':
-						screen.blit(photo_upstairs, (tile_x, tile_y))
-					elif self.world_map[y][x] == '>':
-						screen.blit(photo_downstairs, (tile_x, tile_y))
+					if tile == '#':
+						area = areas['wall']
+					elif tile == '<':
+						area = areas['upstairs']
+					elif tile == '>':
+						area = areas['downstairs']
 					elif (x, y) in self.level.doors:
 						# Draw a door tile
-						photo_door = photo_door_open if self.level.doors[(x, y)] else photo_door_closed
-						screen.blit(photo_door, (tile_x, tile_y))
-					elif self.world_map[y][x] == '.':
+						area = areas['door_open'] if self.level.doors[(x, y)] else areas['door_closed']
+					elif tile == '.':
 						# Draw floor tile for walkable areas
-						screen.blit(photo_floor, (tile_x, tile_y))
+						area = areas['floor']
+					else:
+						continue
 				elif (x, y) in self.level.explored_tiles:
 					explored_count += 1
-					# Already explored but not currently visible - draw darker version
-					if self.world_map[y][x] == '#':
-						# Draw wall darker
-						dark_wall = photo_wall.copy()
-						dark_wall.fill((128, 128, 128, 128), special_flags=pygame.BLEND_RGBA_MULT)
-						screen.blit(dark_wall, (tile_x, tile_y))
-					elif self.world_map[y][x] == '.':
-						# Draw floor darker
-						dark_floor = photo_floor.copy()
-						dark_floor.fill((128, 128, 128, 128), special_flags=pygame.BLEND_RGBA_MULT)
-						screen.blit(dark_floor, (tile_x, tile_y))
+					# Already explored but not currently visible - darker version
+					if tile == '#':
+						area = areas['dark_wall']
+					elif tile == '.':
+						area = areas['dark_floor']
 					else:
 						# For other tiles (stairs, doors), just draw darker gray
-						screen.fill((50, 50, 50), (tile_x, tile_y, TILE_SIZE, TILE_SIZE))
+						area = areas['dark_other']
 				else:
 					unknown_count += 1
 					# Draw a black square for unexplored tiles
-					screen.fill(BLACK, (tile_x, tile_y, TILE_SIZE, TILE_SIZE))
+					area = areas['unknown']
+				blits.append((atlas, (tile_x, tile_y), area))
+		screen.blits(blits, doreturn=False)
 
 		# Debug only once per second to avoid spam
 		# import time
@@ -799,11 +1003,8 @@ class Game:
 		return height_meters, height_centimeters
 
 	# Fonction pour dessiner la feuille de stats du personnage
-	def draw_character_stats(self, screen):
-		stats_rect = pygame.Rect(self.view_port_width, 0, STATS_WIDTH, self.view_port_height)
-		pygame.draw.rect(screen, GRAY, stats_rect)
-		font = pygame.font.Font(None, 20)
-		pygame.display.set_caption(f"Time: {self.gregorian_calendar} - Dungeon Level: {self.dungeon_level} ({self.level.fullname})")
+	def character_stats_texts(self) -> tuple[List[str], List[str], List[str]]:
+		"""Lines of the stats sheet: (stats, abilities, spells)"""
 		height_feet, height_inches = map(int, self.hero.height.split("'"))
 		height_meters, height_centimeters = map(round, self.feet_inches_to_m_cm(height_feet, height_inches))
 		weapon: Weapon = None
@@ -844,6 +1045,14 @@ class Game:
 		if self.hero.is_spell_caster:
 			slots: str = '/'.join(map(str, self.hero.sc.spell_slots))
 			spells_texts.append(f"Spell slots: {self.hero.sc.spell_slots[0] if self.hero.class_type.index == 'warlock' else slots}")  # known_spells: int = len(self.hero.sc.learned_spells)  # learned_spells: List[Spell] = [s for s in self.hero.sc.learned_spells]  # learned_spells.sort(key=lambda s: s.level)  # for s in learned_spells:  #     spells_texts.append(f"L{s.level}: {str(s)}")
+		return stat_texts, abilities_texts, spells_texts
+
+	def draw_character_stats(self, screen, texts: Optional[tuple] = None):
+		stats_rect = pygame.Rect(self.view_port_width, 0, STATS_WIDTH, self.view_port_height)
+		pygame.draw.rect(screen, GRAY, stats_rect)
+		font = pygame.font.Font(None, 20)
+		pygame.display.set_caption(f"Time: {self.gregorian_calendar} - Dungeon Level: {self.dungeon_level} ({self.level.fullname})")
+		stat_texts, abilities_texts, spells_texts = texts or self.character_stats_texts()
 		for i, text in enumerate(stat_texts):
 			text_surface = font.render(text, True, (0, 0, 0))
 			text_rect = text_surface.get_rect()
@@ -920,11 +1129,11 @@ class Game:
 					# Check if item has an id and if it's in sprites dictionary
 					if not hasattr(item, 'id') or item.id is None:
 						# Item doesn't have an ID - assign one and create sprite
-						item.id = max(sprites.keys()) + 1 if sprites else 1
+						item.id = new_sprite_id()
 						# Create a fallback sprite for this item
 						item_image_name = get_item_image_name(item)
 						try:
-							sprites[item.id] = pygame.image.load(f"{item_sprites_dir}/{item_image_name}").convert_alpha()
+							sprites[item.id] = surface_cache.get(f"{item_sprites_dir}/{item_image_name}")
 						except:
 							# Ultimate fallback - colored square based on item type
 							fallback_surface = pygame.Surface((ICON_SIZE, ICON_SIZE))
@@ -1008,9 +1217,7 @@ class Game:
 
 	def can_move(self, dir: tuple) -> bool:
 		dx, dy = dir
-		x, y = self.hero.x + dx, self.hero.y + dy
-		monster_pos: List[tuple] = [m.pos for m in self.level.monsters]
-		return 0 <= x < self.map_width and 0 <= y < self.map_height and (x, y) not in self.level.obstacles + monster_pos
+		return self.level.is_free((self.hero.x + dx, self.hero.y + dy))
 
 	def update_level(self, dir: int):
 		# Chargement de la carte
@@ -1032,15 +1239,14 @@ class Game:
 			print(f'Unable to drop item {item.name} here. Please move away')
 			return False
 		item.x, item.y = min(possible_drop_locations, key=lambda p: mh_dist(p, self.hero.pos))
-		item.id = max(level_sprites) + 1 if level_sprites else 0
+		item.id = new_sprite_id()
 		level_sprites[item.id] = image
-		self.level.items.append(item)
+		self.level.add_item(item)
 		print(f'{item.name} dropped to ({item.x}, {item.y})!')
 		return True
 
 	def remove_from_level(self, item, level_sprites):
-		p_idx: int = self.level.items.index(item)
-		self.level.items[p_idx] = None
+		self.level.remove_item(item)
 		del level_sprites[item.id]
 
 	def remove_from_inv(self, item, sprites):
@@ -1053,21 +1259,17 @@ class Game:
 		free_slots: List[int] = [i for i, item in enumerate(self.hero.inventory) if not item]
 		next_slot: int = min(free_slots)
 		item.x, item.y = -1, -1
-		item.id = max(sprites) + 1 if sprites else 0
+		item.id = new_sprite_id()
 		self.hero.inventory[next_slot] = item
 		sprites[item.id] = image
 
 	def open_chest(self, sprites, level_sprites, potions: List[HealingPotion], item_sprites_dir):
 		sound_file: str = f'{sound_effects_dir}/Chest Open 1.wav'
-		# Load and play the sound effect if provided
-		try:
-			sound = pygame.mixer.Sound(sound_file)
-			sound.play()
-		except Exception as e:
-			print(f"Error playing sound: {e}")
+		# Play the preloaded sound effect
+		play_sound(sound_file)
 		print(f'Hero gained a treasure!')
-		t: Treasure = [t for t in self.level.treasures if t.pos == self.hero.pos][0]
-		self.level.treasures.remove(t)
+		t: Treasure = self.level.treasure_at(self.hero.pos)
+		self.level.remove_treasure(t)
 		del level_sprites[t.id]
 		room: Optional[Room] = self.level.room_at(t.pos)
 		if room and t == room.treasure:
@@ -1091,7 +1293,7 @@ class Game:
 			print(f'Hero found a {item.name}!')
 			# Get image name from mapping function (doesn't modify business object)
 			image_name = get_item_image_name(item)
-			image: Surface = pygame.image.load(f"{item_sprites_dir}/{image_name}")
+			image: Surface = surface_cache.get(f"{item_sprites_dir}/{image_name}")
 			free_slots: List[int] = [i for i, item in enumerate(self.hero.inventory) if not item]
 			if free_slots:
 				# Add item to inventory
@@ -1127,48 +1329,29 @@ class Game:
 
 	@property
 	def monsters_in_view_range(self, vision_range: int = 10) -> List[Monster]:
-		return [m for m in self.level.monsters if mh_dist(self.hero.pos, m.pos) <= vision_range and in_view_range(*self.hero.pos, *m.pos, obstacles=self.level.obstacles)]
+		"""
+		Monsters standing on cells seen by the hero (field of view, cached per position and door state),
+		memoized until the hero moves, a monster is added / removed / moved or a door changes (shared list: do not mutate)
+		"""
+		level = self.level
+		visible_tiles = level.fov.visible_from(self.hero.pos, vision_range)
+		key = (level, self.hero.pos, visible_tiles, level.monsters_version)
+		cached = getattr(self, '_monsters_in_view', None)
+		if cached is None or cached[0] != key:
+			cached = self._monsters_in_view = key, [m for m in level.monsters if m.pos in visible_tiles and mh_dist(self.hero.pos, m.pos) <= vision_range]
+		return cached[1]
 
 	@property
 	def cells_in_view_range_from_hero(self, vision_range: int = 10) -> List[tuple]:
-		return [(x, y) for x in range(self.level.map_width) for y in range(self.level.map_height) if mh_dist(self.hero.pos, (x, y)) <= vision_range and (x, y) not in self.level.obstacles and in_view_range(*self.hero.pos, x, y, obstacles=self.level.obstacles)]
+		obstacles = self.level.obstacles
+		return [pos for pos in self.level.fov.visible_from(self.pos, vision_range) if mh_dist(self.hero.pos, pos) <= vision_range and pos not in obstacles]
 
 	def update_visible_tiles(self, vision_range: int = 10):
 		"""
 		Update the set of currently visible tiles based on hero's position.
-		This is recalculated each time the hero moves.
+		This is recalculated each time the hero moves (shadowcasting, cached per position and door state).
 		"""
-		# Reset visible tiles - we recalculate what's currently visible
-		self.level.visible_tiles = set()
-
-		view_x, view_y, view_width, view_height = self.calculate_view_window()
-		# print(f"[DEBUG] Hero pos: {self.pos}, view window: ({view_x}, {view_y}, {view_width}, {view_height})")
-
-		tiles_checked = 0
-		tiles_in_range = 0
-		tiles_visible = 0
-
-		for x in range(view_x, view_x + view_width):
-			for y in range(view_y, view_y + view_height):
-				tiles_checked += 1
-				# Skip if too far away
-				distance = dist((x, y), self.pos)
-				if distance > vision_range:
-					continue
-				tiles_in_range += 1
-
-				# Check if tile is in line of sight
-				if in_view_range(*self.pos, x, y, obstacles=self.level.obstacles):
-					self.level.visible_tiles.add((x, y))
-					tiles_visible += 1
-
-		# Debug: print detailed statistics
-		# print(f"[DEBUG] Tiles checked: {tiles_checked}, in range: {tiles_in_range}, visible: {tiles_visible}")
-		# print(f"[DEBUG] visible_tiles size: {len(self.level.visible_tiles)}")
-		# if len(self.level.visible_tiles) > 0:
-		# 	# Show first few visible tiles
-		# 	sample = list(self.level.visible_tiles)[:5]
-		# 	print(f"[DEBUG] Sample visible tiles: {sample}")
+		self.level.visible_tiles = self.level.fov.visible_from(self.pos, vision_range)
 
 
 def mh_dist(p1: tuple, p2: tuple):
@@ -1179,18 +1362,9 @@ def dist(p1, p2) -> float:
 	return ((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2) ** 0.5
 
 
-def find_path(start: tuple, end: tuple, carte: List, obstacles: List[tuple]) -> Optional[List[tuple]]:
-	dist, pred = parcours_a_star(carte, *start, *end, obstacles)
-
-	path: List[tuple] = []
-
-	if dist != float('inf'):
-		path.append(end)
-		while end != start:
-			end = pred[end]
-			path.append(end)
-
-	return path[::-1]
+def find_path(level: Level, start: tuple, end: tuple, max_steps: Optional[int] = None) -> List[tuple]:
+	"""Shortest path from start to end (both included) avoiding walls, closed doors and monsters"""
+	return level.pathfinder.find_path(start, end, avoid_occupied=True, max_steps=max_steps)
 
 
 def load_game_assets():
@@ -1243,9 +1417,8 @@ def save_character_gamestate(game: Game, _dir: str):
 
 	# Save the complete Game instance
 	gamestate_file = f'{_dir}/{char_name}_gamestate.dmp'
-	with open(resource_path(gamestate_file), 'wb') as f1:
-		print(f'Saving {char_name} gamestate...')
-		pickle.dump(game, f1)
+	print(f'Saving {char_name} gamestate...')
+	save_format.dump(game, resource_path(gamestate_file))
 
 	# Also save the Character entity separately for console version compatibility
 	characters_dir = os.path.join(os.path.dirname(_dir), 'characters')
@@ -1272,9 +1445,8 @@ def load_character_gamestate(char_name: str, _dir: str) -> Optional[Game]:
 	if not os.path.exists(resource_path(gs_filename)):
 		return None
 
-	with open(resource_path(gs_filename), 'rb') as f1:
-		print(f'Loading {char_name} gamestate...')
-		game: Game = pickle.load(f1)
+	print(f'Loading {char_name} gamestate...')
+	game: Game = save_format.load(resource_path(gs_filename))
 
 	# Migration: Ensure game.hero is GameCharacter
 	# Use hasattr instead of isinstance because GameCharacter is a parameterized generic
@@ -1367,25 +1539,110 @@ def draw_sprite_at_pos(screen, image, x: int, y: int, tile_size: int, vp_x: int,
 	screen.blit(image, (screen_x, screen_y))
 
 
-def update_display(game, token_images, screen):
-	# Get the resource path for sprites
-	path = resource_path('.')
+class DungeonRenderer:
+	"""
+	Layered rendering of the dungeon screen:
+	- the map background (tiles of the view window) is cached, and only rebuilt when the view window,
+	  the visible / explored cells or a door change
+	- the viewport (background + entities) and the side panel (stats, inventory, spell book, mini-map,
+	  monster tokens) are only redrawn when their own state signature changes
+	- only the redrawn regions are pushed to the display with pygame.display.update(dirty_rects)
+	Anything drawing directly on the screen must call invalidate() so the next frame repaints it.
+	"""
 
-	# Rendu
-	screen.fill(BLACK)
+	def __init__(self):
+		self.map_layer: Optional[Surface] = None
+		self.map_key = self.viewport_key = self.panel_key = None
+		self.frames = self.idle_frames = 0  # instrumentation
+
+	def invalidate(self):
+		self.map_key = self.viewport_key = self.panel_key = None
+
+	def render(self, game, token_images, screen) -> bool:
+		"""Redraws what changed since the last frame, returns False if the frame was left untouched"""
+		path = resource_path('.')
+		self.frames += 1
+		level = game.level
+		visible_tiles = level.visible_tiles
+		view_port_tuple = game.calculate_view_window()
+		viewport_rect = pygame.Rect(0, 0, game.view_port_width, game.view_port_height)
+		panel_rect = pygame.Rect(game.view_port_width, 0, STATS_WIDTH, game.view_port_height)
+		mouse_pos = pygame.mouse.get_pos()
+		dirty_rects: List[pygame.Rect] = []
+
+		# Objects (not ids) are kept in the keys: identical objects compare in O(1), and are never recycled
+		map_key = (level, view_port_tuple, visible_tiles, len(level.explored_tiles), level.occupancy.door_version)
+		if map_key != self.map_key or self.map_layer is None or self.map_layer.get_size() != viewport_rect.size:
+			if self.map_layer is None or self.map_layer.get_size() != viewport_rect.size:
+				self.map_layer = pygame.Surface(viewport_rect.size).convert()
+			self.map_layer.fill(BLACK)
+			pygame.draw.rect(self.map_layer, WHITE, (0, 0, game.map_width * TILE_SIZE, game.map_height * TILE_SIZE))
+			game.draw_map(path, self.map_layer)
+			self.map_key = map_key
+
+		spatial = level.spatial
+		entities = tuple((e, e.x, e.y) for kind in ('fountains', 'monsters', 'treasures', 'items') for e in spatial[kind].within(visible_tiles))
+		hovered_tile = (mouse_pos[0] // TILE_SIZE, mouse_pos[1] // TILE_SIZE) if viewport_rect.collidepoint(mouse_pos) else None
+		viewport_key = (map_key, entities, game.hero.x, game.hero.y, sprites[game.id], hovered_tile)
+		if viewport_key != self.viewport_key:
+			screen.set_clip(viewport_rect)
+			screen.blit(self.map_layer, viewport_rect)
+			draw_viewport_entities(game, screen, view_port_tuple)
+			screen.set_clip(None)
+			self.viewport_key = viewport_key
+			dirty_rects.append(viewport_rect)
+
+		hero = game.hero
+		monsters_in_view = game.monsters_in_view_range
+		stats_texts = game.character_stats_texts()
+		panel_key = (tuple(map(tuple, stats_texts)), game.round_no, level,
+		             tuple((item, id(item), getattr(item, 'equipped', None)) for item in hero.inventory),
+		             (game.ready_spell, tuple(hero.sc.spell_slots), len(hero.sc.learned_spells)) if hero.sc else None,
+		             mouse_pos if panel_rect.collidepoint(mouse_pos) else None,
+		             hero.x, hero.y, visible_tiles, len(level.explored_tiles), len(level.treasures),
+		             tuple((m, m.hit_points) for m in monsters_in_view))
+		if panel_key != self.panel_key:
+			screen.set_clip(panel_rect)
+			draw_side_panel(game, token_images, screen, stats_texts, monsters_in_view)
+			screen.set_clip(None)
+			self.panel_key = panel_key
+			dirty_rects.append(panel_rect)
+
+		if not dirty_rects:
+			self.idle_frames += 1
+			return False
+		pygame.display.update(dirty_rects)
+		return True
 
-	# III-0 Dessiner la carte
-	map_rect = pygame.Rect(0, 0, game.map_width * TILE_SIZE, game.map_height * TILE_SIZE)
-	pygame.draw.rect(screen, WHITE, map_rect)
-	game.draw_map(path, screen)
 
-	view_port_tuple = game.calculate_view_window()
+renderer = DungeonRenderer()
+
+
+def pick_up_items(game):
+	"""Items left on the ground are picked up when the hero walks on them (if a slot is free)"""
+	for item in list(game.level.spatial['items'].at(game.pos)):
+		try:
+			free_slots: List[int] = [i for i, item in enumerate(game.hero.inventory) if not item]
+			if free_slots:
+				image: Surface = level_sprites[item.id]
+				# Grab item
+				game.remove_from_level(item, level_sprites)
+				# Add item to inventory
+				game.add_to_inv(item, image, sprites)
+				print(f'Hero gained an item! ({item.name}) #{item.id}')  # else:  #     print(f'Cannot take item {item.name}. Inventory is full!')
+		except AttributeError:
+			pass
+
+
+def draw_viewport_entities(game, screen, view_port_tuple):
 	vp_x, vp_y, vp_width, vp_height = view_port_tuple
 
+	# Only entities standing on visible cells are visited (spatial index lookup)
+	visible_tiles = game.level.visible_tiles
+	spatial = game.level.spatial
+
 	# III-1 Afficher les fontaines de mémorisation de sorts
-	for t in game.level.fountains:
-		if t.pos not in game.level.visible_tiles:
-			continue
+	for t in spatial['fountains'].within(visible_tiles):
 		image: Surface = level_sprites[t.id]
 		# Fountains are simple objects without GameEntity wrapper
 		draw_sprite_at_pos(screen, image, t.x, t.y, TILE_SIZE, vp_x, vp_y)
@@ -1394,9 +1651,7 @@ def update_display(game, token_images, screen):
 	image: Surface = sprites[game.id]
 	game.hero.draw(screen, image, TILE_SIZE, *view_port_tuple)
 
-	for monster in game.level.monsters:
-		if monster.pos not in game.level.visible_tiles:
-			continue
+	for monster in spatial['monsters'].within(visible_tiles):
 		image: Surface = level_sprites[monster.id]
 		# big_image: Surface = pygame.transform.scale(image, (TILE_SIZE * 2, TILE_SIZE * 2))
 		monster.draw(screen, image, TILE_SIZE, *view_port_tuple)
@@ -1410,40 +1665,25 @@ def update_display(game, token_images, screen):
 			draw_tooltip(monster.name, screen, *monster_rect.bottomright)
 
 	# III-3 Afficher les trésors
-	for t in game.level.treasures:
-		if t.pos not in game.level.visible_tiles:
-			continue
+	for t in spatial['treasures'].within(visible_tiles):
 		image: Surface = level_sprites[t.id]
 		# Treasures are simple objects without GameEntity wrapper
 		draw_sprite_at_pos(screen, image, t.x, t.y, TILE_SIZE, vp_x, vp_y)
 
-	# III-4 Afficher ou Ramasser des items laissés au sol
-	for item in game.level.items:
+	# III-4 Afficher les items laissés au sol (ramassés par pick_up_items)
+	for item in spatial['items'].within(visible_tiles):
 		try:
-			# Items don't have pos attribute, use (x, y) tuple
-			item_pos = (item.x, item.y)
-			if item_pos not in game.level.visible_tiles:
-				continue
 			image: Surface = level_sprites[item.id]
-			item_taken: bool = False
-			if item_pos == game.pos:
-				free_slots: List[int] = [i for i, item in enumerate(game.hero.inventory) if not item]
-				if free_slots:
-					# Grab item
-					game.remove_from_level(item, level_sprites)
-					# Add item to inventory
-					game.add_to_inv(item, image, sprites)
-					print(f'Hero gained an item! ({item.name}) #{item.id}')
-					item_taken = True  # else:  #     print(f'Cannot take item {item.name}. Inventory is full!')
-			if not item_taken:
-				image.set_colorkey(PINK)  # Set the pink color as transparent
-				# Items are simple objects without GameEntity wrapper
-				draw_sprite_at_pos(screen, image, item.x, item.y, TILE_SIZE, vp_x, vp_y)
+			image.set_colorkey(PINK)  # Set the pink color as transparent
+			# Items are simple objects without GameEntity wrapper
+			draw_sprite_at_pos(screen, image, item.x, item.y, TILE_SIZE, vp_x, vp_y)
 		except AttributeError:
 			pass
 
+
+def draw_side_panel(game, token_images, screen, stats_texts: tuple, monsters_in_view: list):
 	# III-5 Dessiner la feuille de stats du personnage
-	game.draw_character_stats(screen)
+	game.draw_character_stats(screen, stats_texts)
 
 	# III-6 Dessiner la feuille d'inventaire du personnage
 	game.draw_inventory(screen, sprites)
@@ -1459,11 +1699,14 @@ def update_display(game, token_images, screen):
 	# game.draw_combat_message(screen)
 
 	# III-10 Afficher les tokens de monstres visibles
-	if game.monsters_in_view_range:
+	if monsters_in_view:
 		draw_monster_tokens(screen, game, token_images)
 
-	# Mise à jour de l'affichage
-	pygame.display.flip()
+
+def update_display(game, token_images, screen) -> bool:
+	"""Returns False when nothing had to be redrawn"""
+	pick_up_items(game)
+	return renderer.render(game, token_images, screen)
 
 
 def display_game_over(game, screen, token_images) -> bool:
@@ -1477,9 +1720,10 @@ def display_game_over(game, screen, token_images) -> bool:
 		False if user wants to quit (closed window)
 	"""
 	# Change the sprite's image to the "rip" image
-	sprites[game.id] = pygame.image.load(f"{sprites_dir}/rip.png").convert_alpha()
+	sprites[game.id] = surface_cache.get(f"{sprites_dir}/rip.png")
 
 	# Redraw the entire game screen with the RIP sprite
+	renderer.invalidate()
 	update_display(game, token_images, screen)
 
 	# Draw the game over text overlay
@@ -1494,6 +1738,7 @@ def display_game_over(game, screen, token_images) -> bool:
 	screen.blit(overlay, (0, 0))
 	screen.blit(text, text_rect)
 	pygame.display.flip()
+	renderer.invalidate()
 
 	# Pause the game until the user presses SPACE or closes window
 	paused = True
@@ -1548,34 +1793,146 @@ def create_wandering_monsters(game) -> List[Monster]:
 	return wrapped_monsters
 
 
-def main_game_loop(game, screen_param) -> bool:
+class FrameScheduler:
 	"""
-	Main game loop for dungeon exploration.
+	Pacing of main_game_loop, with a single clock for the whole session:
+	- rendering is limited to FPS, and throttled to IDLE_FPS when nothing was redrawn and no input came for IDLE_DELAY
+	- the simulation (rounds, potion timers, wandering monsters) advances by fixed SIMULATION_STEP steps,
+	  whatever the frame rate; game time is in epoch seconds, like the timers saved with the game
+	- frame times are collected in a histogram, shown with the frame rate in an overlay (F3)
+	"""
+	SIMULATION_STEP = 0.1  # seconds
+	MAX_STEPS_PER_FRAME = 5  # after a long blocking animation, the remaining lag is absorbed by the last step
+	IDLE_FPS = 20
+	IDLE_DELAY = 0.5  # seconds
+	HISTOGRAM_BOUNDS = (5, 10, 17, 25, 33, 50, 100)  # frame time buckets upper bounds (ms)
+	STATS_REFRESH = 0.5  # seconds between two refreshes of the overlay text
+
+	def __init__(self, fps: int = FPS):
+		self.fps = fps
+		self.clock = pygame.time.Clock()
+		self.show_stats = False
+		self.reset()
+
+	def reset(self):
+		"""Start a new game loop: game time restarts from the wall clock"""
+		self.sim_time = time.time()
+		self.lag = 0.0
+		self.idle_time = 0.0
+		self.frames = self.idle_frames = 0
+		self.histogram = [0] * (len(self.HISTOGRAM_BOUNDS) + 1)
+		self.stats_text, self.stats_time = '', 0.0
+		self.clock.tick()
+
+	@property
+	def now(self) -> float:
+		"""Current game time"""
+		return self.sim_time + self.lag
+
+	def simulation_steps(self) -> Iterator[float]:
+		"""Game time of each fixed simulation step due since the last frame"""
+		steps = int(self.lag / self.SIMULATION_STEP)
+		if steps > self.MAX_STEPS_PER_FRAME:
+			steps = self.MAX_STEPS_PER_FRAME
+			self.sim_time += self.lag - steps * self.SIMULATION_STEP
+			self.lag = steps * self.SIMULATION_STEP
+		for _ in range(steps):
+			self.sim_time += self.SIMULATION_STEP
+			self.lag -= self.SIMULATION_STEP
+			yield self.sim_time
+
+	def tick(self, busy: bool) -> int:
+		"""End of frame: waits for the next one, returns the frame time (ms)"""
+		idle = not busy and self.idle_time >= self.IDLE_DELAY
+		frame_ms = self.clock.tick(self.IDLE_FPS if idle else self.fps)
+		self.idle_time = 0.0 if busy else self.idle_time + frame_ms / 1000
+		self.lag += frame_ms / 1000
+		self.frames += 1
+		self.idle_frames += idle
+		self.histogram[bisect_left(self.HISTOGRAM_BOUNDS, frame_ms)] += 1
+		return frame_ms
+
+	def toggle_stats(self):
+		self.show_stats = not self.show_stats
+		self.stats_text = ''
+		# Erase the overlay
+		renderer.invalidate()
+
+	def draw_stats(self, screen):
+		"""Frame rate overlay, in the top left corner of the viewport"""
+		if time.time() - self.stats_time >= self.STATS_REFRESH or not self.stats_text:
+			self.stats_text = f'{self.clock.get_fps():.0f} FPS - {self.clock.get_rawtime()} ms' + (' (idle)' if self.idle_time >= self.IDLE_DELAY else '')
+			self.stats_time = time.time()
+		text = pygame.font.Font(None, 20).render(self.stats_text, True, WHITE, BLACK)
+		pygame.display.update(screen.blit(text, (5, 5)))
+
+	def report(self) -> str:
+		"""Frame time histogram"""
+		lines = [f'{self.frames} frames ({self.idle_frames} idle), {self.clock.get_fps():.0f} FPS']
+		lower = 0
+		for upper, count in zip(self.HISTOGRAM_BOUNDS + (None,), self.histogram):
+			label = f'{lower:>3}-{upper:<3} ms' if upper else f'  >{lower:<4} ms'
+			lines.append(f'{label} {count:>6} {"#" * round(40 * count / max(1, self.frames))}')
+			lower = upper
+		return '\n'.join(lines)
+
+
+frame_scheduler = FrameScheduler()
+
+
+def simulate_step(game, now: float):
+	"""One fixed simulation step: potion effects timeout, new round (monsters actions, wandering monsters)"""
+	# Cancel haste effect after 60 seconds
+	if hasattr(game.hero, 'hasted') and game.hero.hasted and now - game.hero.haste_timer > 60:
+		messages, = game.hero.cancel_haste_effect(verbose=True)
+
+	# Cancel strength effect after 3600 seconds (1 hour)
+	if hasattr(game.hero, 'str_effect_modifier') and game.hero.str_effect_modifier > 0 and now - game.hero.str_effect_timer > 3600:
+		messages, = game.hero.cancel_strength_effect(verbose=True)
+	if now - game.last_round_time >= ROUND_DURATION:
+		game.round_no += 1
+		game.timer = 0
+		pygame.display.set_caption(f"Time: {game.gregorian_calendar} - Dungeon Level: {game.dungeon_level} ({game.level.fullname})")
+		# print(f'Round #{round_no}')
+		game.last_round_time = now
+		# Check if there are monster in range
+		monsters_in_range = game.monsters_in_view_range
+		if monsters_in_range:
+			# Reset attack mode for monster not in view range
+			for monster in game.level.monsters:
+				if not hasattr(monster, 'speed'):
+					monster.speed = 30
+				if any(m.id == monster.id for m in monsters_in_range):
+					monster.attack_round = 0
+			handle_combat(game=game, monsters=monsters_in_range)
+		else:
+			# Gestion des rencontres aléatoires
+			if game.round_no > game.last_combat_round + 10:
+				roll_dice = randint(1, 20)
+				if roll_dice >= 18:
+					new_monsters = create_wandering_monsters(game)
+					game.level.add_monsters(new_monsters)
+					print(f'{len(new_monsters)} new monsters appears! Enjoy :-)')
+					update_level_sprites(monsters=new_monsters, sprites=level_sprites, sprites_dir=sprites_dir, char_sprites_dir=char_sprites_dir)  # else:  #     print(f'no wandering monsters detected this time (roll: {roll_dice})...')
+		game.target_pos = None
+
+
+def setup_session(game, game_path: Optional[str] = None):
+	"""
+	Session globals used by the game logic: save directories, sprites directories,
+	potions collection and sprites dictionaries of the hero and of the current level.
 
 	Args:
 		game: Game instance
-		screen_param: Pygame screen surface
-
-	Returns:
-		True if user wants to reload last save (after death)
-		False if user wants to quit normally
+		game_path: Save games directory (default: get_save_game_path())
 	"""
-	global level_sprites, sprites, screen
+	global level_sprites, sprites
 	global effects_images_dir, sound_effects_dir, characters_dir, gamestate_dir
 	global sprites_dir, char_sprites_dir, item_sprites_dir, spell_sprites_dir
 	global potions
-	running = True
-	return_to_main = False
-	game.last_round_time = time.time()
-
-	# Assign screen to global variable
-	screen = screen_param
 
 	# Define directories (matching dungeon_pygame_old.py logic)
-	from tools.common import get_save_game_path
-	import os
-
-	game_path = get_save_game_path()
+	game_path = game_path or get_save_game_path()
 	characters_dir = f'{game_path}/characters'
 	gamestate_dir = f'{game_path}/pygame'
 
@@ -1589,6 +1946,40 @@ def main_game_loop(game, screen_param) -> bool:
 	effects_images_dir = resource_path('sprites/effects')
 	sound_effects_dir = resource_path('sounds')
 
+	# Load potions collection
+	potions = load_potions_collections()
+
+	# Create sprites dictionaries (matching dungeon_pygame_old.py logic)
+	# These functions need access to sprites_dir and char_sprites_dir
+	level_sprites = create_level_sprites(game.level, sprites_dir, char_sprites_dir)
+	sprites = create_sprites(hero=game.hero, char_sprites_dir=char_sprites_dir, item_sprites_dir=item_sprites_dir, spell_sprites_dir=spell_sprites_dir)
+
+
+def main_game_loop(game, screen_param) -> bool:
+	"""
+	Main game loop for dungeon exploration.
+
+	Args:
+		game: Game instance
+		screen_param: Pygame screen surface
+
+	Returns:
+		True if user wants to reload last save (after death)
+		False if user wants to quit normally
+	"""
+	global screen
+	running = True
+	return_to_main = False
+	frame_scheduler.reset()
+	game.last_round_time = frame_scheduler.now
+
+	# Assign screen to global variable
+	screen = screen_param
+
+	setup_session(game)
+	# Decode all sound effects once for the session
+	get_sound_bank(sound_effects_dir)
+
 	# Define token images directory (in dnd-5e-core)
 	_parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 	_dnd_5e_core_path = os.path.join(_parent_dir, 'dnd-5e-core')
@@ -1600,33 +1991,31 @@ def main_game_loop(game, screen_param) -> bool:
 
 	token_images = game.load_token_images(token_images_dir)
 
-	# Load potions collection
-	from populate_rpg_functions import load_potions_collections
-	potions = load_potions_collections()
-
-	# Create sprites dictionaries (matching dungeon_pygame_old.py logic)
-	# These functions need access to sprites_dir and char_sprites_dir
-	level_sprites = create_level_sprites(game.level, sprites_dir, char_sprites_dir)
-	sprites = create_sprites(hero=game.hero, char_sprites_dir=char_sprites_dir, item_sprites_dir=item_sprites_dir, spell_sprites_dir=spell_sprites_dir)
-
 	# Key repeat settings for continuous movement
 	last_move_time = 0
-	move_delay = 100  # milliseconds between moves when key is held (~10 movements/sec)
+	move_delay = 0.1  # seconds between moves when key is held (~10 movements/sec)
+
+	# Start building the next level in the background (a reloaded save may be on another level)
+	level_prefetcher.discard()
+	prefetch_next_level(game)
+
+	# New screen / game: nothing drawn yet
+	renderer.invalidate()
 
 	round_no: int = 1
 	if not hasattr(game, 'exit'):
 		game.finished = False
 	while running and not return_to_main and not game.finished:
-		# Calculate the time since the last frame
-		current_time = time.time()
-		current_ticks = pygame.time.get_ticks()
+		# Game time of this frame (one clock for input repeat, rounds and effects)
+		current_time = frame_scheduler.now
 
 		# I - Gestion des actions utilisateur (évènements clavier/souris)
+		had_input = pygame.event.peek()
 		return_to_main = handle_events(game)
 
 		# Handle continuous key presses for movement
-		if current_ticks - last_move_time > move_delay:
-			keys = pygame.key.get_pressed()
+		keys = pygame.key.get_pressed()
+		if current_time - last_move_time > move_delay:
 			move_position = None
 
 			if keys[pygame.K_UP] or keys[pygame.K_z]:
@@ -1639,59 +2028,24 @@ def main_game_loop(game, screen_param) -> bool:
 				move_position = (game.hero.x + 1, game.hero.y)
 
 			if move_position:
-				monsters = [m for m in game.level.monsters if m.pos == move_position]
-				if monsters:
-					attack_monster(game=game, monster=monsters[0])
-					last_move_time = current_ticks
+				monster = game.level.monster_at(move_position)
+				if monster:
+					attack_monster(game=game, monster=monster)
+					last_move_time = current_time
 				elif move_position in game.level.walkable_tiles:
 					handle_combat(game=game, monsters=game.monsters_in_view_range, move_position=move_position)
-					last_move_time = current_ticks
+					last_move_time = current_time
 
 		# II - Gestion des conditions de jeu
 		handle_game_conditions(game)
 
-		# III - Réactualisation de l'affichage
-		update_display(game, token_images, screen)
-
-		# Limit frame rate
-		pygame.time.Clock().tick(FPS)
-
-		# Check if a new round has started
-		if game.hero.hit_points > 0:
-			# Cancel haste effect after 60 seconds
-			if hasattr(game.hero, 'hasted') and game.hero.hasted and current_time - game.hero.haste_timer > 60:
-				messages, = game.hero.cancel_haste_effect(verbose=True)
-
-			# Cancel strength effect after 3600 seconds (1 hour)
-			if hasattr(game.hero, 'str_effect_modifier') and game.hero.str_effect_modifier > 0 and current_time - game.hero.str_effect_timer > 3600:
-				messages, = game.hero.cancel_strength_effect(verbose=True)
-			if current_time - game.last_round_time >= ROUND_DURATION:
-				game.round_no += 1
-				game.timer = 0
-				pygame.display.set_caption(f"Time: {game.gregorian_calendar} - Dungeon Level: {game.dungeon_level} ({game.level.fullname})")
-				# print(f'Round #{round_no}')
-				game.last_round_time = current_time
-				# Check if there are monster in range
-				monsters_in_range = game.monsters_in_view_range
-				if monsters_in_range:
-					# Reset attack mode for monster not in view range
-					for monster in game.level.monsters:
-						if not hasattr(monster, 'speed'):
-							monster.speed = 30
-						if any(m.id == monster.id for m in monsters_in_range):
-							monster.attack_round = 0
-					handle_combat(game=game, monsters=monsters_in_range)
-				else:
-					# Gestion des rencontres aléatoires
-					if game.round_no > game.last_combat_round + 10:
-						roll_dice = randint(1, 20)
-						if roll_dice >= 18:
-							new_monsters = create_wandering_monsters(game)
-							game.level.monsters += new_monsters
-							print(f'{len(new_monsters)} new monsters appears! Enjoy :-)')
-							update_level_sprites(monsters=new_monsters, sprites=level_sprites, sprites_dir=sprites_dir, char_sprites_dir=char_sprites_dir)  # else:  #     print(f'no wandering monsters detected this time (roll: {roll_dice})...')
-				game.target_pos = None
-		else:
+		# Fixed rate simulation: rounds, effects timers, wandering monsters
+		for now in frame_scheduler.simulation_steps():
+			if game.hero.hit_points <= 0:
+				break
+			simulate_step(game, now)
+
+		if game.hero.hit_points <= 0:
 			# Hero is dead - display game over screen with RIP sprite
 			cprint(f'{game.hero.name} has been defeated!')
 
@@ -1704,6 +2058,17 @@ def main_game_loop(game, screen_param) -> bool:
 			# Return the reload status
 			return reload_save
 
+		# III - Réactualisation de l'affichage
+		redrawn = update_display(game, token_images, screen)
+		if frame_scheduler.show_stats:
+			frame_scheduler.draw_stats(screen)
+
+		# Limit frame rate (throttled down while idle)
+		frame_scheduler.tick(busy=redrawn or had_input or any(keys))
+
+	if frame_scheduler.show_stats:
+		print(frame_scheduler.report())
+
 	# Normal exit (user quit or returned to main menu)
 	return False
 
@@ -1808,6 +2173,7 @@ def draw_spell_animation_old(game, monster_pos, screen, duration=2.5, color=(255
 		screen.blit(effect_surface, effect_pos)
 
 		pygame.display.flip()  # game.clock.tick(60)
+	renderer.invalidate()
 
 
 def draw_spell_animation(game, monster_pos, screen, duration=0.5, color=(255, 255, 0)):
@@ -1830,6 +2196,7 @@ def draw_spell_animation(game, monster_pos, screen, duration=0.5, color=(255, 25
 		screen.blit(effect_surface, effect_pos)
 
 		pygame.display.flip()  # game.clock.tick(60)
+	renderer.invalidate()
 
 	# Ensure the final game state is drawn after the animation  # game.draw()  # pygame.display.flip()
 
@@ -1885,7 +2252,7 @@ def handle_right_click_spell_attack(game):
 				# cprint(f'{monster.name} at pos {monster.pos} is *KILLED*')
 				victory_msg, xp, gold = game.hero.victory(monster=monster, solo_mode=True, verbose=True)
 				game.hero.kills.append(monster)
-				game.level.monsters.remove(monster)
+				game.level.remove_monster(monster)
 				room: Optional[Room] = game.level.room_at(monster.pos)
 				if room and monster in room.monsters:
 					# remove monster from room's property
@@ -1920,7 +2287,7 @@ def attack_monsters(game, monsters):
 				game.hero.kills.append(monster)
 				if not hasattr(monster, 'speed'):
 					monster.speed = 15
-				game.level.monsters.remove(monster)
+				game.level.remove_monster(monster)
 				rooms: List[Room] = [r for r in game.level.rooms if monster in r.monsters]
 				if rooms:
 					# remove monster from room's property
@@ -1936,13 +2303,12 @@ def attack_monster(game, monster):
 		sound_file: str = f'{sound_effects_dir}/Sword Impact Hit 1.wav'
 	else:
 		sound_file: str = f'{sound_effects_dir}/Sword Parry 1.wav'
-	sound = pygame.mixer.Sound(sound_file)
-	sound.play()
+	play_sound(sound_file)
 	if monster.hit_points <= 0:
 		# cprint(f'{monster.name} at pos {monster.pos} is *KILLED*')
 		victory_msg, xp, gold = game.hero.victory(monster=monster, solo_mode=True, verbose=True)
 		game.hero.kills.append(monster)
-		game.level.monsters.remove(monster)
+		game.level.remove_monster(monster)
 		rooms: List[Room] = [r for r in game.level.rooms if monster in r.monsters]
 		if rooms:
 			# remove monster from room's property
@@ -1978,32 +2344,33 @@ def move_char(game: Game, char: Monster | Character, pos: tuple):
 	move_position = game.pos
 
 	if pos in game.level.walkable_tiles:
-		if mh_dist(game.pos, pos) <= 1:
+		if is_player_character and mh_dist(game.pos, pos) <= 1:
 			# Direct move - properties will automatically update hero.x/y
 			game.x, game.y = pos
 			room_no = display_room_info(game, game.pos, room_no)
-		else:
-			if is_player_character:
-				obstacles = [m.pos for m in game.level.monsters]
-			else:
-				obstacles = [m.pos for m in game.level.monsters if m != char]
-			path = find_path(start=game.pos, end=pos, carte=game.level.carte, obstacles=obstacles)
-
-			if path:
-				if is_player_character:
-					# Properties will automatically update hero.x/y
-					game.x, game.y = path[1]
-					sound_file: str = f'{sound_effects_dir}/Dirt Chain Walk 1.wav'
-					sound = pygame.mixer.Sound(sound_file)
-					sound.play()
-				else:
-					speed_ratio: int = round(char.speed / game.hero.speed)
-					dist = min(speed_ratio, len(path) - 1)
-					print(f'{char.name} moves to {game.hero.name} at speed {char.speed}"')
-					game.x, game.y = path[dist] if len(path) > 3 else path[1]
+		elif is_player_character:
+			path = find_path(game.level, start=game.pos, end=pos, max_steps=1)
+			if len(path) > 1:
+				# Properties will automatically update hero.x/y
+				game.x, game.y = path[1]
 				room_no = display_room_info(game, game.pos, room_no)
 			else:
 				cprint(f'No path found for {char.name}!')
+		else:
+			# Monsters only walk speed_ratio cells per round
+			speed_ratio: int = max(1, round(char.speed / game.hero.speed))
+			# All monsters chasing the same target descend one shared distance map
+			steps = game.level.distance_map_to(pos).descend(char.pos, speed_ratio)
+			if not steps:
+				# Blocked by other monsters: search a way around them
+				path = find_path(game.level, start=char.pos, end=pos, max_steps=speed_ratio)
+				# Never step onto the target cell (the hero stands there)
+				steps = [p for p in path[1:] if p != pos]
+			if steps:
+				print(f'{char.name} moves to {game.hero.name} at speed {char.speed}"')
+				game.level.move_monster(char, steps[-1])
+			else:
+				cprint(f'No path found for {char.name}!')
 
 		if is_player_character:
 			game.level.explored_tiles.add(game.pos)
@@ -2015,14 +2382,13 @@ def move_char(game: Game, char: Monster | Character, pos: tuple):
 
 	if is_player_character and move_position != game.pos:
 		sound_file: str = f'{sound_effects_dir}/Dirt Chain Walk 1.wav'
-		sound = pygame.mixer.Sound(sound_file)
-		sound.play()
+		play_sound(sound_file)
 
 
 def display_available_commands(game):
 	# Print available commands in the console
 	print("\nAvailable Commands:")
-	commands = [f"{Color.GREEN}DIRECTIONAL ARROWS{Color.END} = Move up/left/down/right", f"{Color.GREEN}LEFT CLICK{Color.END} = Attack monster - Equip/Unequip item - Ready spell", f"{Color.GREEN}RIGHT CLICK{Color.END} = Cast spell - Drop Item from inventory", f"{Color.GREEN}P{Color.END} = Drink Healing Potion", f"{Color.GREEN}S{Color.END} = Drink Speed Potion", f"{Color.GREEN}[O|C]{Color.END} = Open/Close Door", f"{Color.GREEN}I{Color.END} - Gather position/status of hero", f"{Color.GREEN}CMD-S (Apple) - Windows-S (PC) {Color.END} = Save game", f"{Color.GREEN}ESC{Color.END} - Leave game (without saving)", f"{Color.GREEN}H{Color.END} - Show this help"]
+	commands = [f"{Color.GREEN}DIRECTIONAL ARROWS{Color.END} = Move up/left/down/right", f"{Color.GREEN}LEFT CLICK{Color.END} = Attack monster - Equip/Unequip item - Ready spell", f"{Color.GREEN}RIGHT CLICK{Color.END} = Cast spell - Drop Item from inventory", f"{Color.GREEN}P{Color.END} = Drink Healing Potion", f"{Color.GREEN}S{Color.END} = Drink Speed Potion", f"{Color.GREEN}[O|C]{Color.END} = Open/Close Door", f"{Color.GREEN}I{Color.END} - Gather position/status of hero", f"{Color.GREEN}CMD-S (Apple) - Windows-S (PC) {Color.END} = Save game", f"{Color.GREEN}ESC{Color.END} - Leave game (without saving)", f"{Color.GREEN}H{Color.END} - Show this help", f"{Color.GREEN}F3{Color.END} - Show/hide frame rate (histogram printed on exit)"]
 
 	for command in commands:
 		print(command)
@@ -2045,36 +2411,39 @@ def handle_keyboard_events(game, event):
 	elif event.key == pygame.K_h:
 		# print available commands
 		display_available_commands(game)
+	elif event.key == pygame.K_F3:
+		# F3 - Show/hide frame rate overlay
+		frame_scheduler.toggle_stats()
 	elif event.key in (pygame.K_UP, pygame.K_z):
 		# UP or Z - Move up
 		move_position = (game.hero.x, game.hero.y - 1)
-		monsters = [m for m in game.level.monsters if m.pos == move_position]
-		if monsters:
-			attack_monster(game=game, monster=monsters[0])
+		monster = game.level.monster_at(move_position)
+		if monster:
+			attack_monster(game=game, monster=monster)
 		elif game.can_move(dir=UP):
 			handle_combat(game=game, monsters=game.monsters_in_view_range, move_position=(game.hero.x, game.hero.y - 1))
 	elif event.key in (pygame.K_DOWN, pygame.K_s) and not (event.mod & pygame.KMOD_SHIFT):
 		# DOWN or S (without Shift) - Move down
 		move_position = (game.hero.x, game.hero.y + 1)
-		monsters = [m for m in game.level.monsters if m.pos == move_position]
-		if monsters:
-			attack_monster(game=game, monster=monsters[0])
+		monster = game.level.monster_at(move_position)
+		if monster:
+			attack_monster(game=game, monster=monster)
 		elif game.can_move(dir=DOWN):
 			handle_combat(game=game, monsters=game.monsters_in_view_range, move_position=move_position)
 	elif event.key in (pygame.K_LEFT, pygame.K_q):
 		# LEFT or Q - Move left
 		move_position = (game.hero.x - 1, game.hero.y)
-		monsters = [m for m in game.level.monsters if m.pos == move_position]
-		if monsters:
-			attack_monster(game=game, monster=monsters[0])
+		monster = game.level.monster_at(move_position)
+		if monster:
+			attack_monster(game=game, monster=monster)
 		elif game.can_move(dir=LEFT):
 			handle_combat(game=game, monsters=game.monsters_in_view_range, move_position=move_position)
 	elif event.key in (pygame.K_RIGHT, pygame.K_d):
 		# RIGHT or D - Move right
 		move_position = (game.hero.x + 1, game.hero.y)
-		monsters = [m for m in game.level.monsters if m.pos == move_position]
-		if monsters:
-			attack_monster(game=game, monster=monsters[0])
+		monster = game.level.monster_at(move_position)
+		if monster:
+			attack_monster(game=game, monster=monster)
 		elif game.can_move(dir=RIGHT):
 			handle_combat(game=game, monsters=game.monsters_in_view_range, move_position=move_position)
 	elif event.key == pygame.K_p:
@@ -2084,33 +2453,40 @@ def handle_keyboard_events(game, event):
 		# Shift+S - Use speed potion
 		handle_speed_potion_use(game)
 	elif event.key == pygame.K_o:
-		closed_doors = [door_pos for door_pos, door_open in game.level.doors.items() if mh_dist(door_pos, game.pos) == 1 and not door_open]
-		if closed_doors:
-			door_pos = closed_doors[0]
-			game.level.doors[door_pos] = True
-			sound_file: str = f'{sound_effects_dir}/Door Open 1.wav'
-			sound = pygame.mixer.Sound(sound_file)
-			sound.play()
-		else:
-			cprint('No closed door found!')
+		open_door(game)
 	elif event.key == pygame.K_c:
 		open_doors = [door_pos for door_pos, door_open in game.level.doors.items() if mh_dist(door_pos, game.pos) <= 1 and door_open]
 		if open_doors:
 			door_pos = open_doors[0]
-			if any(door_pos == m.pos for m in game.level.monsters):
+			if game.level.occupancy.is_occupied(*door_pos):
 				cprint('Cannot close door with a monster in it!')
 			elif door_pos == game.pos:
 				cprint('Cannot close door with the hero in it!')
 			else:
-				game.level.doors[door_pos] = False
+				game.level.set_door(door_pos, False)
+				game.update_visible_tiles()
 				sound_file: str = f'{sound_effects_dir}/Door Close 1.wav'
-				sound = pygame.mixer.Sound(sound_file)
-				sound.play()
+				play_sound(sound_file)
 		else:
 			cprint('No open door found!')
 	return return_to_main_menu
 
 
+def open_door(game, door_pos: Optional[tuple] = None) -> bool:
+	"""Open door_pos, or the first closed door next to the hero"""
+	closed_doors = [pos for pos, door_open in game.level.doors.items() if mh_dist(pos, game.pos) == 1 and not door_open]
+	if door_pos is not None:
+		closed_doors = [pos for pos in closed_doors if pos == door_pos]
+	if not closed_doors:
+		cprint('No closed door found!')
+		return False
+	game.level.set_door(closed_doors[0], True)
+	game.update_visible_tiles()
+	sound_file: str = f'{sound_effects_dir}/Door Open 1.wav'
+	play_sound(sound_file)
+	return True
+
+
 def handle_healing_potion_use(game):
 	global screen
 	if game.hero.healing_potions:
@@ -2194,6 +2570,9 @@ def draw_spell_effect(entity, screen, effect_sprites: List[Surface], tile_size:
 		sound_file: Path to sound effect file (optional)
 		reduce_ratio: Animation speed reduction ratio (1 = normal, 2 = half speed, etc.)
 	"""
+	if headless:
+		return
+
 	# Get entity position
 	if hasattr(entity, 'x') and hasattr(entity, 'y'):
 		entity_x, entity_y = entity.x, entity.y
@@ -2206,22 +2585,21 @@ def draw_spell_effect(entity, screen, effect_sprites: List[Surface], tile_size:
 	screen_y = (entity_y - vp_y) * tile_size
 
 	# Play sound effect
-	if sound_file and os.path.exists(sound_file):
-		try:
-			sound = pygame.mixer.Sound(sound_file)
-			sound.play()
-		except:
-			pass
+	if sound_file:
+		play_sound(sound_file)
 
 	# Animate the effect (simplified - just blit the last frame for now)
 	# A full implementation would animate through all sprites
 	if effect_sprites:
 		screen.blit(effect_sprites[-1], (screen_x, screen_y))
 		pygame.display.flip()
+		renderer.invalidate()
 
 
 def draw_attack_effect(game: Game, char: [Character | Monster], damage: int):
 	global screen
+	if headless:
+		return
 	if damage > 0:
 		sound_file: str = f'{sound_effects_dir}/Sword Impact Hit 1.wav'  # char_image: Surface = level_sprites[game.id]  # put_inlay(image=char_image, number=damage, center=False, color=RED)
 	else:
@@ -2252,7 +2630,7 @@ def handle_combat(game: Game, monsters: List[Monster], attack_spell: Spell = Non
 			if char.hit_points > 0:
 				# Handle party member's action
 				if move_position:
-					if move_position not in game.level.obstacles + game.level.monsters:
+					if game.level.is_free(move_position):
 						move_char(game=game, char=game.hero, pos=move_position)
 					else:
 						cprint(f'Path is blocked!')
@@ -2343,19 +2721,18 @@ def handle_monster_actions(game: Game, monster: Monster) -> Optional[int]:
 
 
 def handle_treasure_chests(game):
-	if any(t.pos == game.pos for t in game.level.treasures):
+	if game.level.treasure_at(game.pos):
 		game.open_chest(sprites, level_sprites, potions=potions, item_sprites_dir=item_sprites_dir)
 
 
 def handle_fountains(game):
-	if any(f.pos == game.pos for f in game.level.fountains):
+	if game.level.fountain_at(game.pos):
 		# Extract Character entity from GameCharacter
 		# Use hasattr instead of isinstance because GameCharacter is a parameterized generic
 		char = game.hero.entity if hasattr(game.hero, 'entity') else game.hero
 
 		sound_file: str = f'{sound_effects_dir}/magic_words.mp3'
-		sound = pygame.mixer.Sound(sound_file)
-		sound.play()
+		play_sound(sound_file)
 
 		# Restore spell slots if spellcaster
 		if char.class_type.can_cast:
@@ -2381,9 +2758,8 @@ def handle_fountains(game):
 			if new_spells:
 				for spell in new_spells:
 					try:
-						image = pygame.image.load(f"{spell_sprites_dir}/{spell.school}.png")
-						spell.id = max(sprites) + 1 if sprites else 1
-						sprites[spell.id] = pygame.transform.scale(image, (ICON_SIZE, ICON_SIZE))
+						spell.id = new_sprite_id()
+						sprites[spell.id] = surface_cache.get(f"{spell_sprites_dir}/{spell.school}.png", (ICON_SIZE, ICON_SIZE))
 					except Exception as e:
 						print(f"Warning: Could not load sprite for {spell.name}: {e}")
 
@@ -2391,14 +2767,20 @@ def handle_fountains(game):
 		save_character(char, _dir=characters_dir)
 
 
+def prefetch_next_level(game):
+	if game.dungeon_level == len(game.levels):
+		level_prefetcher.prefetch(game.dungeon_level + 1)
+
+
 def handle_level_changes(game):
 	global level_sprites
 	global sprites_dir, char_sprites_dir
+	transition_start = time.perf_counter()
 	match game.world_map[game.y][game.x]:
 		case '>':
 			if game.level.level_no == MAX_LEVELS:
 				print('You have reached the end of the dungeon!')
-				response: str = read(['y', 'Y', 'n', 'N'], 'Do you want to return to the Castle? (y/n)')
+				response: str = 'y' if headless else read(['y', 'Y', 'n', 'N'], 'Do you want to return to the Castle? (y/n)')
 				moves: List[tuple] = [p for p in game.level.walkable_tiles if mh_dist(p, game.pos) == 1 and p not in game.level.obstacles]
 				move_char(game, game.hero, choice(moves))
 				if response in ['y', 'Y']:
@@ -2417,50 +2799,44 @@ def handle_level_changes(game):
 				#     game.levels[game.dungeon_level - 1] = game.level
 				#     game.level.load(hero=game.hero)
 			if game.dungeon_level > len(game.levels):
-				game.level = Level(level_no=game.dungeon_level)
+				# Built in the background since the hero entered the previous level
+				game.level = level_prefetcher.take(game.dungeon_level)
 				game.levels.append(game.level)
-				game.level.load(pos=game.hero.pos)
 			else:
 				game.level = game.levels[game.dungeon_level - 1]
 			game.update_level(dir=1)
 			level_sprites = create_level_sprites(game.level, sprites_dir, char_sprites_dir)
+			prefetch_next_level(game)
+			log_level_transition(game, transition_start)
 		case '<':
 			print(f'Hero found upstairs!')
 			game.dungeon_level -= 1
 			game.level = game.levels[game.dungeon_level - 1]  # if game.dungeon_level in game.levels else Level(level_no=game.dungeon_level - 1)
 			game.update_level(dir=-1)
 			level_sprites = create_level_sprites(game.level, sprites_dir, char_sprites_dir)
+			log_level_transition(game, transition_start)
 
 
-def extract_sprites(spritesheet_path, columns, rows) -> List[Surface]:
-	# Load the spritesheet
-	spritesheet = pygame.image.load(spritesheet_path).convert_alpha()
-
-	# Calculate the size of each sprite
-	sheet_width, sheet_height = spritesheet.get_size()
-	sprite_width = sheet_width // columns
-	sprite_height = sheet_height // rows
-
-	sprites: List[Surface] = []
-	num_sprites: int = columns * rows
-
-	for i in range(num_sprites):
-		# Calculate the position of the sprite in the sheet
-		row = i // columns
-		col = i % columns
-
-		# Create a new surface for the sprite
-		sprite_surface = pygame.Surface((sprite_width, sprite_height), pygame.SRCALPHA)
+def log_level_transition(game, transition_start: float):
+	"""Print how long the game loop was frozen by the level change"""
+	total_ms = (time.perf_counter() - transition_start) * 1000
+	transition = level_prefetcher.transitions[-1] if level_prefetcher.transitions else None
+	if transition and transition['level_no'] == game.dungeon_level and 'total_ms' not in transition:
+		transition['total_ms'] = total_ms
+		origin = 'prefetched' if transition['prefetched'] else 'built on the spot'
+		print(f"[level] Level {game.dungeon_level} ready in {total_ms:.1f} ms ({origin}: build {transition['build_ms']:.1f} ms, waited {transition['wait_ms']:.1f} ms)")
+	else:
+		print(f'[level] Level {game.dungeon_level} ready in {total_ms:.1f} ms')
 
-		# offset_x = col * sprite_width + (sprite_width - sprite_size) // 2
-		# offset_y = row * sprite_height + (sprite_height - sprite_size) // 2
 
-		# Copy the sprite from the sheet to the new surface
-		sprite_surface.blit(spritesheet, (0, 0), (col * sprite_width, row * sprite_height, sprite_width, sprite_height))
+def play_sound(sound_file: str):
+	if not headless:
+		play_bank_sound(sound_file)
 
-		sprites.append(sprite_surface)
 
-	return sprites
+def extract_sprites(spritesheet_path, columns, rows) -> List[Surface]:
+	# Frames are subsurfaces of the spritesheet, loaded once per session (see tools.sprite_sheets)
+	return sheet_frames(spritesheet_path, columns, rows)
 
 
 def get_item_image_name(item) -> str:
@@ -2546,7 +2922,7 @@ def create_sprites(hero: GameCharacter, char_sprites_dir: str, item_sprites_dir:
 
 	# Load hero sprite
 	try:
-		s: dict[int, pygame.Surface] = {hero.id: pygame.image.load(f"{char_sprites_dir}/{hero_image_name}").convert_alpha()}
+		s: dict[int, pygame.Surface] = {hero.id: surface_cache.get(f"{char_sprites_dir}/{hero_image_name}")}
 	except FileNotFoundError:
 		# Create a simple colored square as ultimate fallback
 		fallback_surface = pygame.Surface((32, 32))
@@ -2557,14 +2933,13 @@ def create_sprites(hero: GameCharacter, char_sprites_dir: str, item_sprites_dir:
 	if hero.is_spell_caster:
 		# Afficher grimoire
 		for spell in hero.sc.learned_spells:
-			image = pygame.image.load(f"{spell_sprites_dir}/{spell.school}.png")
-			spell.id = max(s) + 1 if s else 1
-			s[spell.id] = pygame.transform.scale(image, (ICON_SIZE, ICON_SIZE))  # Resize the image  # print(spell.name, spell.id, id(s[spell.id]))
+			spell.id = new_sprite_id()
+			s[spell.id] = surface_cache.get(f"{spell_sprites_dir}/{spell.school}.png", (ICON_SIZE, ICON_SIZE))  # Resize the image  # print(spell.name, spell.id, id(s[spell.id]))
 
 	# Load inventory items sprites
 	for i, item in enumerate(hero.inventory):
 		if item:
-			item.id = max(s) + 1 if s else 1
+			item.id = new_sprite_id()
 
 			# Get item image name using helper function
 			item_image_name = get_item_image_name(item)
@@ -2574,7 +2949,7 @@ def create_sprites(hero: GameCharacter, char_sprites_dir: str, item_sprites_dir:
 
 			# Try 1: Original name
 			try:
-				s[item.id] = pygame.image.load(f"{item_sprites_dir}/{item_image_name}").convert_alpha()
+				s[item.id] = surface_cache.get(f"{item_sprites_dir}/{item_image_name}")
 				loaded = True
 			except FileNotFoundError:
 				pass
@@ -2583,7 +2958,7 @@ def create_sprites(hero: GameCharacter, char_sprites_dir: str, item_sprites_dir:
 			if not loaded:
 				try:
 					base_name = item_image_name.replace('.png', '')
-					s[item.id] = pygame.image.load(f"{item_sprites_dir}/{base_name}.png").convert_alpha()
+					s[item.id] = surface_cache.get(f"{item_sprites_dir}/{base_name}.png")
 					loaded = True
 				except FileNotFoundError:
 					pass
@@ -2592,7 +2967,7 @@ def create_sprites(hero: GameCharacter, char_sprites_dir: str, item_sprites_dir:
 			if not loaded:
 				try:
 					alt_name = item_image_name.replace('-', '_')
-					s[item.id] = pygame.image.load(f"{item_sprites_dir}/{alt_name}").convert_alpha()
+					s[item.id] = surface_cache.get(f"{item_sprites_dir}/{alt_name}")
 					loaded = True
 				except FileNotFoundError:
 					pass
@@ -2600,7 +2975,7 @@ def create_sprites(hero: GameCharacter, char_sprites_dir: str, item_sprites_dir:
 			# Try 4: Generic potion icon if it's a potion
 			if not loaded and 'Potion' in item.__class__.__name__:
 				try:
-					s[item.id] = pygame.image.load(f"{item_sprites_dir}/potion.png").convert_alpha()
+					s[item.id] = surface_cache.get(f"{item_sprites_dir}/potion.png")
 					loaded = True
 				except FileNotFoundError:
 					pass
@@ -2621,28 +2996,30 @@ def create_sprites(hero: GameCharacter, char_sprites_dir: str, item_sprites_dir:
 	return s
 
 
-def update_level_sprites(monsters: List[Monster], sprites: dict[int, pygame.Surface], sprites_dir: str, char_sprites_dir: str):
-	for m in monsters:
-		m.id = max(sprites) + 1 if sprites else 1
+def monster_sprite(monster: Monster, sprites_dir: str, char_sprites_dir: str) -> Surface:
+	"""32x32 sprite of a monster (decoded once per monster kind, see surface_cache)"""
+	# Get image name from monster or use default based on monster name
+	if hasattr(monster, 'image_name') and monster.image_name:
+		image_name = monster.image_name
+	else:
+		# Generate default image name from monster name (e.g., "goblin" -> "monster_goblin.png")
+		monster_slug = monster.index if hasattr(monster, 'index') else monster.name.lower().replace(' ', '_')
+		image_name = f"monster_{monster_slug}.png"
 
-		# Get image name from monster or use default
-		if hasattr(m, 'image_name') and m.image_name:
-			image_name = m.image_name
-		else:
-			# Generate default image name from monster name
-			monster_slug = m.index if hasattr(m, 'index') else m.name.lower().replace(' ', '_')
-			image_name = f"monster_{monster_slug}.png"
+	try:
+		# Monster image, or the generic enemy sprite
+		return surface_cache.get_first([f"{char_sprites_dir}/{image_name}", f"{sprites_dir}/enemy.png"], (32, 32))
+	except FileNotFoundError:
+		# Ultimate fallback: create a simple colored square
+		image = pygame.Surface((32, 32))
+		image.fill((255, 0, 0))  # Red square
+		return image
 
-		try:
-			original_image = pygame.image.load(f"{char_sprites_dir}/{image_name}").convert_alpha()
-		except FileNotFoundError:
-			try:
-				original_image = pygame.image.load(f"{sprites_dir}/enemy.png").convert_alpha()
-			except FileNotFoundError:
-				# Ultimate fallback
-				original_image = pygame.Surface((32, 32))
-				original_image.fill((255, 0, 0))  # Red square
-		sprites[m.id] = pygame.transform.scale(original_image, (32, 32))
+
+def update_level_sprites(monsters: List[Monster], sprites: dict[int, pygame.Surface], sprites_dir: str, char_sprites_dir: str):
+	for m in monsters:
+		m.id = new_sprite_id()
+		sprites[m.id] = monster_sprite(m, sprites_dir, char_sprites_dir)
 
 
 def create_level_sprites(level: Level, sprites_dir: str, char_sprites_dir: str) -> dict[int, pygame.Surface]:
@@ -2652,37 +3029,19 @@ def create_level_sprites(level: Level, sprites_dir: str, char_sprites_dir: str)
 		f = level.fountains[0]
 		f.id = 1
 		fountain_image = getattr(f, 'image_name', 'fountain.png')
-		s[f.id] = pygame.image.load(f"{sprites_dir}/{fountain_image}").convert_alpha()
+		s[f.id] = surface_cache.get(f"{sprites_dir}/{fountain_image}")
 
 	# Chargement des sprites de monstres
 	for m in level.monsters:
-		m.id = max(s) + 1 if s else 1
-		# Get image name from monster or use default based on monster name
-		if hasattr(m, 'image_name') and m.image_name:
-			image_name = m.image_name
-		else:
-			# Generate default image name from monster name (e.g., "goblin" -> "monster_goblin.png")
-			monster_slug = m.index if hasattr(m, 'index') else m.name.lower().replace(' ', '_')
-			image_name = f"monster_{monster_slug}.png"
-
-		try:
-			original_image = pygame.image.load(f"{char_sprites_dir}/{image_name}").convert_alpha()
-		except FileNotFoundError:
-			# Fallback to generic enemy sprite
-			try:
-				original_image = pygame.image.load(f"{sprites_dir}/enemy.png").convert_alpha()
-			except FileNotFoundError:
-				# Ultimate fallback: create a simple colored square
-				original_image = pygame.Surface((32, 32))
-				original_image.fill((255, 0, 0))  # Red square
-		s[m.id] = pygame.transform.scale(original_image, (32, 32))
+		m.id = new_sprite_id()
+		s[m.id] = monster_sprite(m, sprites_dir, char_sprites_dir)
 
 	# Chargement des sprites de trésors
 	for t in level.treasures:
-		t.id = max(s) + 1 if s else 1
+		t.id = new_sprite_id()
 		treasure_image = getattr(t, 'image_name', 'treasure.png')
 		try:
-			s[t.id] = pygame.image.load(f"{sprites_dir}/{treasure_image}").convert_alpha()
+			s[t.id] = surface_cache.get(f"{sprites_dir}/{treasure_image}")
 		except FileNotFoundError:
 			# Fallback to a simple treasure icon
 			treasure_surface = pygame.Surface((32, 32))
@@ -2690,11 +3049,11 @@ def create_level_sprites(level: Level, sprites_dir: str, char_sprites_dir: str)
 			s[t.id] = treasure_surface
 	for item in level.items:
 		if item:
-			item.id = max(s) + 1 if s else 1
+			item.id = new_sprite_id()
 			# Get image name from mapping function (doesn't modify business object)
 			item_image_name = get_item_image_name(item)
 			try:
-				s[item.id] = pygame.image.load(f"{item_sprites_dir}/{item_image_name}").convert_alpha()
+				s[item.id] = surface_cache.get(f"{item_sprites_dir}/{item_image_name}")
 			except FileNotFoundError:
 				# Fallback to a generic item icon
 				item_surface = pygame.Surface((32, 32))
@@ -2,27 +2,34 @@
 Démo Flask complète utilisant dnd-5e-core
 Gestion de création de personnages, constitution de groupes et système de combats
 """
+import json
 import os
-import pickle
+import sys
+import threading
+import time
+import uuid
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, g, Response
 from werkzeug.exceptions import BadRequest
 
 # Import dnd-5e-core
 from dnd_5e_core.data.loaders import simple_character_generator
 from dnd_5e_core import load_monster
-from dnd_5e_core.combat import CombatSystem
 from dnd_5e_core.data.loader import list_monsters, list_races, list_classes
+from dnd_5e_core.mechanics import ENCOUNTER_TABLE
+
+from combat_sessions import CombatSession, CombatSessionRegistry, latest_combat_state
+from storage import open_storage
+from catalogs import Catalog, item_price, monsters_catalog, shop_catalog
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 
 # Configuration
-SAVE_DIR = Path(__file__).parent / 'data' / 'saves'
-SAVE_DIR.mkdir(parents=True, exist_ok=True)
+DATA_DIR = Path(__file__).parent / 'data'
 
-ROSTER_DIR = Path(__file__).parent / 'data' / 'roster'
-ROSTER_DIR.mkdir(parents=True, exist_ok=True)
+# Sessions et roster : 'sqlite' (data/flask_demo.db, partagé par les workers) ou 'pickle' (data/saves, data/roster)
+STORAGE = open_storage(os.environ.get('FLASK_DEMO_STORAGE', 'sqlite'), DATA_DIR)
 
 # Cache pour les listes
 RACES_CACHE = None
@@ -56,9 +63,10 @@ def get_monsters():
             sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
             from main_ncurses import load_dungeon_collections
 
-            monsters, _, _, _, _, _ = load_dungeon_collections()
-            MONSTERS_CACHE = list(filter(lambda m: m, monsters))
-            print(f"✅ Loaded {len(MONSTERS_CACHE)} monsters via load_dungeon_collections")
+            # Lazy collection (None values left out), built in the background from now on
+            monsters, _, _, _, _, _ = load_dungeon_collections(background_warm_up=True)
+            MONSTERS_CACHE = monsters
+            print(f"✅ Indexed {len(monsters.names)} monsters via load_dungeon_collections")
         except Exception as e:
             # Fallback: utiliser list_monsters
             print(f"⚠️ Could not load via load_dungeon_collections: {e}")
@@ -70,28 +78,192 @@ def get_monsters():
     return MONSTERS_CACHE
 
 
+# Catalogues précalculés (JSON encodé et compressé une fois pour toutes)
+CATALOGS = {}
+
+
+def get_catalog(name):
+    """Catalogue 'monsters', 'races', 'classes' ou 'shop', construit à la première demande."""
+    catalog = CATALOGS.get(name)
+    if catalog is None:
+        if name == 'monsters':
+            catalog = monsters_catalog(get_monsters())
+        elif name == 'races':
+            catalog = Catalog('races', get_races())
+        elif name == 'classes':
+            catalog = Catalog('classes', get_classes())
+        else:
+            root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            if root_dir not in sys.path:
+                sys.path.insert(0, root_dir)
+            catalog = shop_catalog()
+        CATALOGS[name] = catalog
+    return catalog
+
+
+# Le magasin du processus est partagé par les threads : stock relu, vérifié et débité sous ce verrou
+SHOP_LOCK = threading.Lock()
+
+
+def get_shop():
+    """Magasin Boltac du processus, son stock relu du disque (partagé avec les autres workers et les jeux)."""
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root_dir not in sys.path:
+        sys.path.insert(0, root_dir)
+    from boltac_shop import get_boltac_shop
+
+    shop = get_boltac_shop()
+    shop.load()
+    return shop
+
+
+def catalog_response(catalog):
+    """Réponse d'un catalogue (filtres et pagination de la requête) : 304 si le client l'a déjà, gzip s'il l'accepte."""
+    try:
+        page = catalog.query(request.args)
+    except (ValueError, ZeroDivisionError) as e:
+        return jsonify({'success': False, 'error': f"Paramètre invalide: {e}"}), 400
+
+    if request.if_none_match.contains_weak(page.etag):
+        response = Response(status=304)
+    elif 'gzip' in request.accept_encodings:
+        response = Response(page.gzipped, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(page.body, mimetype='application/json')
+    response.set_etag(page.etag, weak=True)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'public, no-cache'
+    return response
+
+
+def get_encounter_index():
+    """Index des monstres par CR (construit une seule fois pour le bestiaire)."""
+    import sys
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root_dir not in sys.path:
+        sys.path.insert(0, root_dir)
+    from tools.encounter_index import encounter_index
+
+    return encounter_index(get_monsters())
+
+
+def snapshot_combat_session(combat_session):
+    """Sauvegarde l'état d'un combat évincé de la mémoire."""
+    STORAGE.save_combat_state(combat_session.session_id, combat_session.combat_state)
+
+
+# Combats en cours (personnages, monstres et CombatSystem vivants) par session_id, propres à ce processus
+COMBAT_SESSIONS = CombatSessionRegistry(
+    max_sessions=int(os.environ.get('COMBAT_SESSIONS_MAX', 256)),
+    ttl=float(os.environ.get('COMBAT_SESSIONS_TTL', 1800)),
+    on_evict=snapshot_combat_session
+)
+
+
+# Derniers messages gardés dans combat_state (tout le journal récent est dans les événements du combat)
+COMBAT_STATE_MESSAGES = 50
+# Commentaire envoyé aux flux d'événements sans activité (secondes), pour garder la connexion ouverte
+EVENT_STREAM_KEEPALIVE = 15
+
+
+def start_combat_session(characters, monsters, combat_state):
+    """Garde en mémoire les objets du combat qui commence."""
+    combat_state['id'] = uuid.uuid4().hex
+    if 'session_id' in session:
+        combat_session = COMBAT_SESSIONS.put(CombatSession(session['session_id'], characters, monsters,
+                                                           round_no=combat_state['round'], combat_state=combat_state))
+        for message in combat_state['messages']:
+            combat_session.events.append(message, combat_session.round)
+        combat_state['event_id'] = combat_session.events.last_id
+
+
+def get_combat_session(combat_state):
+    """Combat en cours de la session, reconstruit depuis combat_state s'il n'est plus en mémoire."""
+    session_id = session.get('session_id')
+    combat_session = COMBAT_SESSIONS.get(session_id) if session_id else None
+    # Un combat joué entre-temps par un autre processus : l'état reçu fait foi
+    if combat_session is None or combat_session.combat_state.get('id') != combat_state.get('id') \
+            or combat_session.round != combat_state['round']:
+        combat_session = CombatSession.from_state(session_id, combat_state)
+        if session_id:
+            COMBAT_SESSIONS.put(combat_session)
+    return combat_session
+
+
+def sync_combat_messages(combat_session, combat_state):
+    """Reporte dans combat_state les messages publiés depuis le tour, en ne gardant que les derniers."""
+    messages = combat_session.take_messages()
+    combat_state['messages'] = (combat_state['messages'] + messages)[-COMBAT_STATE_MESSAGES:]
+    combat_state['event_id'] = combat_session.events.last_id
+    return messages
+
+
+def end_combat_session():
+    """Oublie le combat en mémoire de la session."""
+    if 'session_id' in session:
+        COMBAT_SESSIONS.discard(session['session_id'])
+
+
 def save_session_data():
-    """Sauvegarde les données de session sur le disque."""
+    """Sauvegarde les données de session (écrites une seule fois, en fin de requête)."""
+    if 'session_id' in session:
+        g.save_session = True
+
+
+def save_combat_state_data():
+    """Sauvegarde l'état du combat en cours (seulement lui, en fin de requête) après un tour."""
     if 'session_id' in session:
-        save_path = SAVE_DIR / f"{session['session_id']}.pkl"
-        with open(save_path, 'wb') as f:
-            pickle.dump({
-                'party': session.get('party', []),
-                'combat_state': session.get('combat_state', None),
-                'party_gold': session.get('party_gold', 0),
-            }, f)
+        g.save_combat_state = True
 
 
 def load_session_data():
-    """Charge les données de session depuis le disque."""
+    """Charge les données de session depuis le stockage."""
     if 'session_id' in session:
-        save_path = SAVE_DIR / f"{session['session_id']}.pkl"
-        if save_path.exists():
-            with open(save_path, 'rb') as f:
-                data = pickle.load(f)
-                session['party'] = data.get('party', [])
-                session['combat_state'] = data.get('combat_state', None)
-                session['party_gold'] = data.get('party_gold', 0)
+        cookie_state = session.get('combat_state')
+        data = STORAGE.load_session(session['session_id'])
+        if data is not None:
+            session['party'] = data.get('party', [])
+            session['combat_state'] = data.get('combat_state', None)
+            session['party_gold'] = data.get('party_gold', 0)
+        # Du même combat, le cookie ou le combat en mémoire peuvent être en avance sur la sauvegarde
+        combat_session = COMBAT_SESSIONS.peek(session['session_id'])
+        session['combat_state'] = latest_combat_state(session.get('combat_state'), cookie_state,
+                                                      combat_session.combat_state if combat_session else None)
+
+
+def commit_storage():
+    """
+    Écrit tout de suite les sauvegardes demandées jusque-là (roster, puis session).
+    Retourne False si l'écriture a échoué (l'erreur est journalisée) : à appeler avant de
+    répondre quand la réponse annonce une sauvegarde dont dépend la suite (personnage retiré du groupe...).
+    """
+    try:
+        flush_roster()
+        save_combat_state = g.pop('save_combat_state', False)
+        if g.pop('save_session', False) and 'session_id' in session:
+            STORAGE.save_session(session['session_id'], session.get('party', []),
+                                 session.get('combat_state', None), session.get('party_gold', 0))
+        elif save_combat_state and 'session_id' in session:
+            STORAGE.save_combat_state(session['session_id'], session.get('combat_state', None))
+        return True
+    except Exception:
+        app.logger.exception("Échec de l'écriture du stockage")
+        return False
+
+
+@app.after_request
+def flush_storage(response):
+    """Écrit en une fois les sauvegardes demandées pendant la requête (une erreur 500 si elle échoue)."""
+    if commit_storage():
+        return response
+    error = "Les données n'ont pas pu être sauvegardées, réessayez."
+    if response.is_json:
+        failed = jsonify({'success': False, 'error': error})
+    else:
+        failed = app.response_class(error, mimetype='text/plain')
+    failed.status_code = 500
+    return failed
 
 
 def serialize_character(char):
@@ -165,55 +337,62 @@ def serialize_monster(monster):
 
 # ==================== ROSTER MANAGEMENT ====================
 
-def save_to_roster(character_data):
-    """Sauvegarde un personnage dans le roster."""
-    try:
-        char_file = ROSTER_DIR / f"{character_data['name']}.pkl"
-        with open(char_file, 'wb') as f:
-            pickle.dump(character_data, f)
-        return True
-    except Exception as e:
-        print(f"Erreur save_to_roster: {e}")
+def save_to_roster(character_data, flush=False):
+    """
+    Sauvegarde un personnage dans le roster : écrit en fin de requête, dans son dernier état,
+    ou tout de suite avec flush. Retourne False si le personnage n'a pas pu être sauvegardé.
+    """
+    if not character_data.get('name'):
         return False
+    if 'roster_writes' not in g:
+        g.roster_writes = {}
+    g.roster_writes[character_data['name']] = character_data
+    if flush:
+        try:
+            flush_roster()
+        except Exception:
+            app.logger.exception("Échec de la sauvegarde de %s dans le roster", character_data['name'])
+            # L'appelant signale l'échec : pas de nouvelle tentative en fin de requête
+            g.roster_writes.pop(character_data['name'], None)
+            return False
+    return True
+
 
+def flush_roster():
+    """Écrit les personnages du roster sauvegardés pendant la requête (restent en attente si l'écriture échoue)."""
+    characters = g.get('roster_writes')
+    if characters:
+        STORAGE.save_characters(characters.values())
+    g.pop('roster_writes', None)
 
-def load_roster():
-    """Charge tous les personnages du roster."""
-    roster = []
+
+def load_roster(status=None):
+    """Charge les personnages du roster (tous, ou ceux d'un statut), triés par nom."""
     try:
-        for char_file in ROSTER_DIR.glob("*.pkl"):
-            try:
-                with open(char_file, 'rb') as f:
-                    char_data = pickle.load(f)
-                    roster.append(char_data)
-            except Exception as e:
-                print(f"Erreur loading {char_file}: {e}")
-    except Exception as e:
-        print(f"Erreur load_roster: {e}")
-    return roster
+        flush_roster()
+        return STORAGE.roster(status=status)
+    except Exception:
+        app.logger.exception("Erreur load_roster")
+    return []
 
 
 def get_roster_character(name):
     """Récupère un personnage du roster par nom."""
     try:
-        char_file = ROSTER_DIR / f"{name}.pkl"
-        if char_file.exists():
-            with open(char_file, 'rb') as f:
-                return pickle.load(f)
-    except Exception as e:
-        print(f"Erreur get_roster_character: {e}")
+        flush_roster()
+        return STORAGE.get_character(name)
+    except Exception:
+        app.logger.exception("Erreur get_roster_character")
     return None
 
 
 def delete_from_roster(name):
     """Supprime un personnage du roster."""
     try:
-        char_file = ROSTER_DIR / f"{name}.pkl"
-        if char_file.exists():
-            char_file.unlink()
-            return True
-    except Exception as e:
-        print(f"Erreur delete_from_roster: {e}")
+        flush_roster()
+        return STORAGE.delete_character(name)
+    except Exception:
+        app.logger.exception("Erreur delete_from_roster")
     return False
 
 
@@ -223,7 +402,6 @@ def delete_from_roster(name):
 def index():
     """Page d'accueil."""
     if 'session_id' not in session:
-        import uuid
         session['session_id'] = str(uuid.uuid4())
         session['party'] = []
         session['combat_state'] = None
@@ -258,7 +436,8 @@ def character_create():
             char_data = serialize_character(char)
 
             # Sauvegarder SEULEMENT dans le roster (pas dans le groupe)
-            save_to_roster(char_data)
+            if not save_to_roster(char_data, flush=True):
+                raise RuntimeError("Le personnage n'a pas pu être sauvegardé dans le roster")
 
             # Rediriger avec le personnage créé
             return render_template('character_create.html',
@@ -298,7 +477,8 @@ def api_character_create():
         char_data = serialize_character(char)
 
         # Sauvegarder SEULEMENT dans le roster (pas dans le groupe)
-        save_to_roster(char_data)
+        if not save_to_roster(char_data, flush=True):
+            return jsonify({'success': False, 'error': "Le personnage n'a pas pu être sauvegardé dans le roster"}), 500
 
         return jsonify({
             'success': True,
@@ -391,9 +571,6 @@ def combat_auto():
         # Calculer le niveau moyen du groupe
         party_level = sum(c.level for c in characters) // len(characters)
 
-        # Charger les monstres disponibles
-        available_monsters = get_monsters()
-
         # Déterminer le niveau de rencontre selon la difficulté
         if encounter_type == 'easy':
             # Facile: niveau inférieur au groupe
@@ -414,13 +591,10 @@ def combat_auto():
             encounter_levels = generate_encounter_distribution(party_level=party_level)
             encounter_level = choice(encounter_levels)
 
-        # Charger les monstres via le système de rencontres
-        from dnd_5e_core.mechanics.encounter_builder import select_monsters_by_encounter_table
-
-        # Sélectionner les monstres
-        monsters_result, actual_encounter_type = select_monsters_by_encounter_table(
+        # Sélectionner les monstres (table de rencontres, servie par l'index des CR)
+        monsters_result, actual_encounter_type = get_encounter_index().select_by_encounter_table(
+            ENCOUNTER_TABLE,
             encounter_level=encounter_level,
-            available_monsters=available_monsters,
             spell_casters_only=False,
             allow_pairs=True
         )
@@ -447,6 +621,7 @@ def combat_auto():
             'messages': combat_messages,
             'encounter_type': actual_encounter_type
         }
+        start_combat_session(characters, monsters, session['combat_state'])
         session.modified = True
         save_session_data()
 
@@ -490,12 +665,6 @@ def api_combat_start():
         # Peut être spécifié ou aléatoire
         encounter_type = data.get('encounter_type', None)
 
-        # Charger les monstres disponibles
-        available_monsters = get_monsters()
-
-        # Charger les monstres via le système de rencontres
-        from dnd_5e_core.mechanics.encounter_builder import select_monsters_by_encounter_table
-
         try:
             # Déterminer le niveau de rencontre selon la difficulté
             if encounter_type == 'easy':
@@ -513,10 +682,10 @@ def api_combat_start():
                 encounter_levels = generate_encounter_distribution(party_level=party_level)
                 encounter_level = choice(encounter_levels)
 
-            # Sélectionner les monstres
-            monsters_result, actual_encounter_type = select_monsters_by_encounter_table(
+            # Sélectionner les monstres (table de rencontres, servie par l'index des CR)
+            monsters_result, actual_encounter_type = get_encounter_index().select_by_encounter_table(
+                ENCOUNTER_TABLE,
                 encounter_level=encounter_level,
-                available_monsters=available_monsters,
                 spell_casters_only=False,
                 allow_pairs=True
             )
@@ -560,6 +729,7 @@ def api_combat_start():
             'messages': combat_messages,
             'encounter_type': actual_encounter_type if 'actual_encounter_type' in locals() else 'custom'
         }
+        start_combat_session(characters, monsters, session['combat_state'])
         session.modified = True
         save_session_data()
 
@@ -604,56 +774,20 @@ def combat_turn():
         if not combat_state or not combat_state.get('active'):
             return redirect(url_for('combat_view'))
 
-        # Recréer les personnages et monstres
-        characters = []
-        for p in combat_state['party']:
-            char = simple_character_generator(
-                level=p['level'],
-                race_name=p['race'],
-                class_name=p['class'],
-                name=p['name']
-            )
-            char.hit_points = p['hp']
-            char.xp = p.get('xp', 0)
-            char.gold = p.get('gold', 0)
-            characters.append(char)
-
-        monsters = []
-        for m in combat_state['monsters']:
-            monster = load_monster(m['name'])
-            if monster:
-                monster.hit_points = m['hp']
-                monsters.append(monster)
-
-        # Exécuter le tour
-        combat_messages = []
-
-        def message_callback(msg):
-            combat_messages.append(msg)
-
-        combat = CombatSystem(verbose=False, message_callback=message_callback)
-
-        alive_chars = [c for c in characters if c.hit_points > 0]
-        alive_monsters = [m for m in monsters if m.hit_points > 0]
-
-        if alive_chars and alive_monsters:
-            # Tour des personnages
-            for char in alive_chars:
-                if alive_monsters:  # Vérifier qu'il reste des monstres
-                    combat.character_turn(char, alive_chars, alive_monsters, characters)
-                    alive_monsters = [m for m in monsters if m.hit_points > 0]
-
-            # Tour des monstres
-            for monster in alive_monsters[:]:
-                if alive_chars and monster.hit_points > 0:
-                    combat.monster_turn(monster, alive_monsters, alive_chars, characters, combat_state['round'])
-                    alive_chars = [c for c in characters if c.hit_points > 0]
-
-        # Mettre à jour l'état
-        combat_state['party'] = [serialize_character(c) for c in characters]
-        combat_state['monsters'] = [serialize_monster(m) for m in monsters]
-        combat_state['round'] += 1
-        combat_state['messages'].extend(combat_messages)
+        start = time.perf_counter()
+        # Personnages et monstres vivants du combat (reconstruits seulement s'ils ne sont plus en mémoire)
+        combat_session = get_combat_session(combat_state)
+        with combat_session.lock:
+            combat_messages = combat_session.play_round()
+            characters, monsters = combat_session.characters, combat_session.monsters
+
+            # Mettre à jour l'état
+            combat_state['party'] = [serialize_character(c) for c in characters]
+            combat_state['monsters'] = [serialize_monster(m) for m in monsters]
+            combat_state['round'] = combat_session.round
+            combat_state['messages'].extend(combat_messages)
+            combat_session.combat_state = combat_state
+        COMBAT_SESSIONS.record_turn(time.perf_counter() - start)
 
         # Vérifier fin du combat
         alive_party = [c for c in characters if c.hit_points > 0]
@@ -679,8 +813,8 @@ def combat_turn():
             session['party'] = party
 
             if not alive_party:
-                combat_state['messages'].append("💀 Défaite ! Le groupe a été vaincu...")
-                combat_state['messages'].append("⚠️ Les personnages morts doivent être ressuscités au Temple de Cant")
+                combat_session.publish("💀 Défaite ! Le groupe a été vaincu...")
+                combat_session.publish("⚠️ Les personnages morts doivent être ressuscités au Temple de Cant")
             else:
                 # Calcul XP et or
                 total_xp = sum(getattr(m, 'xp', 0) for m in monsters)
@@ -696,12 +830,19 @@ def combat_turn():
                     char.gold += gold_per_char
 
                 combat_state['party'] = [serialize_character(c) for c in characters]
-                combat_state['messages'].append(f"🏆 Victoire ! Tous les monstres sont vaincus !")
-                combat_state['messages'].append(f"✨ Chaque personnage gagne {xp_per_char} XP et {gold_per_char} PO !")
+                combat_session.publish(f"🏆 Victoire ! Tous les monstres sont vaincus !")
+                combat_session.publish(f"✨ Chaque personnage gagne {xp_per_char} XP et {gold_per_char} PO !")
 
+        sync_combat_messages(combat_session, combat_state)
         session['combat_state'] = combat_state
         session.modified = True
-        save_session_data()
+        if not combat_state['active']:
+            # Fin du combat : le résultat est écrit sur le disque et le combat quitte la mémoire
+            end_combat_session()
+            save_session_data()
+        else:
+            # Un autre processus, ou celui-ci redémarré, reprend le combat à ce tour
+            save_combat_state_data()
 
         return redirect(url_for('combat_active'))
 
@@ -715,6 +856,7 @@ def combat_turn():
 @app.route('/combat/end', methods=['POST'])
 def combat_end():
     """Termine le combat en cours."""
+    end_combat_session()
     session['combat_state'] = None
     session.modified = True
     save_session_data()
@@ -1038,11 +1180,13 @@ def party_disband():
         if not party:
             return jsonify({'success': False, 'error': 'Aucun groupe à dissoudre'}), 400
 
-        # Sauvegarder tous les personnages dans le roster
-        count = 0
+        # Sauvegarder tous les personnages dans le roster, avant de vider le groupe
         for char in party:
-            if save_to_roster(char):
-                count += 1
+            if not save_to_roster(char):
+                return jsonify({'success': False, 'error': 'Personnage sans nom dans le groupe'}), 400
+        if not commit_storage():
+            return jsonify({'success': False, 'error': "Les personnages n'ont pas pu être sauvegardés, le groupe est conservé"}), 500
+        count = len(party)
 
         # Vider le groupe
         session['party'] = []
@@ -1071,16 +1215,16 @@ def castle_view():
     # Nettoyer automatiquement les personnages morts du groupe
     dead_chars = [c for c in party if c.get('status') == 'DEAD']
     if dead_chars:
-        # Sauvegarder les morts dans le roster
-        for char in dead_chars:
-            save_to_roster(char)
+        # Sauvegarder les morts dans le roster ; ceux qui n'ont pas pu l'être restent dans le groupe
+        saved = {id(char) for char in dead_chars if save_to_roster(char, flush=True)}
 
-        # Retirer du groupe
-        party = [c for c in party if c.get('status') != 'DEAD']
-        session['party'] = party
-        session['info_message'] = f"{len(dead_chars)} personnage(s) mort(s) ont été retirés du groupe et sauvegardés. Ressuscitez-les au Temple avant de les réintégrer."
-        session.modified = True
-        save_session_data()
+        if saved:
+            # Retirer du groupe
+            party = [c for c in party if id(c) not in saved]
+            session['party'] = party
+            session['info_message'] = f"{len(saved)} personnage(s) mort(s) ont été retirés du groupe et sauvegardés. Ressuscitez-les au Temple avant de les réintégrer."
+            session.modified = True
+            save_session_data()
 
     return render_template('castle.html', party=party)
 
@@ -1174,8 +1318,7 @@ def temple_view():
     party = session.get('party', [])
 
     # Charger le roster et filtrer les personnages morts
-    roster = load_roster()
-    dead_chars = [c for c in roster if c.get('status') == 'DEAD']
+    dead_chars = load_roster(status='DEAD')
 
     return render_template('temple.html', party=party, dead_chars=dead_chars)
 
@@ -1444,59 +1587,24 @@ def api_combat_turn():
         if not combat_state or not combat_state.get('active'):
             raise BadRequest("Aucun combat actif")
 
-        # Recréer les personnages et monstres
-        characters = []
-        for p in combat_state['party']:
-            char = simple_character_generator(
-                level=p['level'],
-                race_name=p['race'],
-                class_name=p['class'],
-                name=p['name']
-            )
-            char.hit_points = p['hp']
-            characters.append(char)
-
-        monsters = []
-        for m in combat_state['monsters']:
-            monster = load_monster(m['name'])
-            monster.hit_points = m['hp']
-            monsters.append(monster)
-
-        # Exécuter le tour
-        combat_messages = []
-
-        def message_callback(msg):
-            combat_messages.append(msg)
-
-        combat = CombatSystem(verbose=False, message_callback=message_callback)
-
         char_index = data.get('character_index', 0)
         target_index = data.get('target_index', 0)
         action_type = data.get('action_type', 'melee')
 
-        if char_index < len(characters) and target_index < len(monsters):
-            # Tour du personnage
-            alive_chars = [c for c in characters if c.hit_points > 0]
-            alive_monsters = [m for m in monsters if m.hit_points > 0]
-
-            if alive_chars and alive_monsters:
-                combat.character_turn(
-                    characters[char_index],
-                    alive_chars,
-                    alive_monsters,
-                    characters
-                )
-
-                # Tour des monstres
-                for monster in alive_monsters[:]:
-                    if monster.hit_points > 0:
-                        combat.monster_turn(monster, alive_monsters, alive_chars, characters, combat_state['round'])
-
-        # Mettre à jour l'état
-        combat_state['party'] = [serialize_character(c) for c in characters]
-        combat_state['monsters'] = [serialize_monster(m) for m in monsters]
-        combat_state['round'] += 1
-        combat_state['messages'].extend(combat_messages)
+        start = time.perf_counter()
+        # Personnages et monstres vivants du combat (reconstruits seulement s'ils ne sont plus en mémoire)
+        combat_session = get_combat_session(combat_state)
+        with combat_session.lock:
+            combat_messages = combat_session.play_character_turn(char_index, target_index)
+            characters, monsters = combat_session.characters, combat_session.monsters
+
+            # Mettre à jour l'état
+            combat_state['party'] = [serialize_character(c) for c in characters]
+            combat_state['monsters'] = [serialize_monster(m) for m in monsters]
+            combat_state['round'] = combat_session.round
+            combat_state['messages'].extend(combat_messages)
+            combat_session.combat_state = combat_state
+        COMBAT_SESSIONS.record_turn(time.perf_counter() - start)
 
         # Vérifier fin du combat
         alive_party = [c for c in characters if c.hit_points > 0]
@@ -1505,18 +1613,24 @@ def api_combat_turn():
         if not alive_party or not alive_monsters:
             combat_state['active'] = False
             if not alive_party:
-                combat_messages.append("💀 Défaite ! Le groupe a été vaincu...")
+                combat_session.publish("💀 Défaite ! Le groupe a été vaincu...")
             else:
-                combat_messages.append("🏆 Victoire ! Tous les monstres sont vaincus !")
+                combat_session.publish("🏆 Victoire ! Tous les monstres sont vaincus !")
 
+        combat_messages += sync_combat_messages(combat_session, combat_state)
         session['combat_state'] = combat_state
         session.modified = True
-        save_session_data()
+        if not combat_state['active']:
+            end_combat_session()
+            save_session_data()
+        else:
+            save_combat_state_data()
 
         return jsonify({
             'success': True,
             'combat_state': combat_state,
-            'messages': combat_messages
+            'messages': combat_messages,
+            'last_event_id': combat_state['event_id']
         })
 
     except Exception as e:
@@ -1526,31 +1640,79 @@ def api_combat_turn():
 @app.route('/api/combat/end', methods=['POST'])
 def api_combat_end():
     """Termine le combat en cours."""
+    end_combat_session()
     session['combat_state'] = None
     session.modified = True
     save_session_data()
     return jsonify({'success': True})
 
 
+@app.route('/api/combat/events')
+def api_combat_events():
+    """Événements du combat en cours postérieurs à ?after=<id> (lecture incrémentale du journal)."""
+    after = request.args.get('after', 0, type=int)
+    combat_session = COMBAT_SESSIONS.peek(session.get('session_id', ''))
+    if combat_session is None:
+        return jsonify({'success': True, 'events': [], 'last_id': after, 'truncated': False, 'active': False})
+
+    events, truncated = combat_session.events.since(after)
+    return jsonify({
+        'success': True,
+        'events': [event.to_dict() for event in events],
+        'last_id': combat_session.events.last_id,
+        'truncated': truncated,  # des événements après `after` sont sortis du journal
+        'active': not combat_session.events.closed
+    })
+
+
+@app.route('/api/combat/stream')
+def api_combat_stream():
+    """Flux Server-Sent Events des événements du combat en cours, publiés au fil des actions."""
+    combat_session = COMBAT_SESSIONS.peek(session.get('session_id', ''))
+    if combat_session is None:
+        return jsonify({'success': False, 'error': 'Aucun combat actif'}), 404
+    # Reprise après une déconnexion : le navigateur renvoie le dernier id reçu
+    after = request.headers.get('Last-Event-ID', type=int) or request.args.get('after', 0, type=int)
+    events_log = combat_session.events
+
+    def stream(last_id):
+        while True:
+            events = events_log.wait(last_id, timeout=EVENT_STREAM_KEEPALIVE)
+            for event in events:
+                yield f"id: {event.id}\nevent: combat\ndata: {json.dumps(event.to_dict(), ensure_ascii=False)}\n\n"
+                last_id = event.id
+            if not events:
+                if events_log.closed:
+                    yield "event: end\ndata: {}\n\n"
+                    return
+                yield ": keep-alive\n\n"
+
+    return Response(stream(after), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/api/combat/metrics')
+def api_combat_metrics():
+    """Combats en mémoire et durée des tours (p50/p95) de ce processus."""
+    return jsonify(COMBAT_SESSIONS.stats())
+
+
 @app.route('/api/info/races')
 def api_info_races():
     """Liste toutes les races disponibles."""
-    races = get_races()
-    return jsonify({'races': races})
+    return catalog_response(get_catalog('races'))
 
 
 @app.route('/api/info/classes')
 def api_info_classes():
     """Liste toutes les classes disponibles."""
-    classes = get_classes()
-    return jsonify({'classes': classes})
+    return catalog_response(get_catalog('classes'))
 
 
 @app.route('/api/info/monsters')
 def api_info_monsters():
-    """Liste tous les monstres disponibles."""
-    monsters = get_monsters()
-    return jsonify({'monsters': monsters})
+    """Liste les monstres (filtres: type, cr, cr_min, cr_max ; pagination: page, per_page)."""
+    return catalog_response(get_catalog('monsters'))
 
 
 # ==================== CHEAT MODE ====================
@@ -1640,29 +1802,22 @@ def shop_view():
     load_session_data()
     party = session.get('party', [])
 
-    # Importer le magasin Boltac
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-
     try:
-        from boltac_shop import BoltacShop
-        shop = BoltacShop()
+        with SHOP_LOCK:
+            shop = get_shop()
+            magic_stock, shop_gold = dict(shop.magic_stock), shop.shop_gold
+        catalog = get_catalog('shop')
 
-        # Récupérer le catalogue (méthodes correctes)
-        weapons = shop.get_all_weapons()
-        armors = shop.get_all_armors()
-        magic_items_with_stock = shop.get_magic_items_in_stock()
-
-        # Convertir magic_items en liste simple
-        magic_items = [item for item, stock in magic_items_with_stock]
+        # Objets magiques en stock (le stock vient du magasin, les fiches du catalogue)
+        magic_items = [catalog.entry('magic', index) for index, stock in magic_stock.items()
+                       if stock > 0 and catalog.entry('magic', index)]
 
         return render_template('shop.html',
                              party=party,
-                             weapons=weapons,
-                             armors=armors,
+                             weapons=catalog.category('weapon'),
+                             armors=catalog.category('armor'),
                              magic_items=magic_items,
-                             shop_gold=shop.shop_gold)
+                             shop_gold=shop_gold)
     except Exception as e:
         import traceback
         error_detail = f"{str(e)}\n{traceback.format_exc()}"
@@ -1671,14 +1826,16 @@ def shop_view():
                              error=error_detail)
 
 
+@app.route('/api/shop/catalog')
+def shop_catalog_view():
+    """Catalogue de la boutique (filtres: category, price, price_min, price_max ; pagination: page, per_page)."""
+    return catalog_response(get_catalog('shop'))
+
+
 @app.route('/api/shop/buy', methods=['POST'])
 def shop_buy():
     """Acheter un item au magasin Boltac."""
     try:
-        import sys
-        import os
-        sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-        from boltac_shop import BoltacShop
         from dnd_5e_core.data.loader import load_weapon, load_armor, load_equipment
         from dnd_5e_core.equipment import get_magic_item, get_special_weapon, get_special_armor
 
@@ -1695,50 +1852,29 @@ def shop_buy():
 
         character = party[char_index]
 
-        # Charger l'item
-        item = None
-        if item_type == 'magic':
-            item = get_magic_item(item_index)
-            if not item:
-                item = get_special_weapon(item_index)
-            if not item:
-                item = get_special_armor(item_index)
-        elif item_type == 'weapon':
-            item = load_weapon(item_index)
-        elif item_type == 'armor':
-            item = load_armor(item_index)
-        else:
-            item = load_equipment(item_index)
-
-        if not item:
-            raise BadRequest(f"Item '{item_index}' introuvable")
-
-        # Obtenir le prix (gérer l'objet Cost correctement)
-        price_cp = 0
-        if hasattr(item, 'cost') and item.cost:
-            if hasattr(item.cost, 'value'):
-                # Cost object avec propriété value (en copper pieces)
-                price_cp = item.cost.value
-            elif isinstance(item.cost, int):
-                # Simple entier (déjà en CP probablement)
-                price_cp = item.cost
-            else:
-                # Fallback
-                price_cp = 0
-
-        # Convertir en PO
-        price_gp = price_cp / 100 if price_cp > 0 else 0
-
-        # Si le prix est à 0, utiliser un prix par défaut basé sur le type
-        if price_gp == 0:
+        # Charger l'item (ceux de la boutique sont déjà chargés par son catalogue)
+        catalog = get_catalog('shop')
+        item = catalog.item(item_type, item_index)
+        if item is None:
             if item_type == 'magic':
-                price_gp = 500  # Prix par défaut pour items magiques
+                item = get_magic_item(item_index)
+                if not item:
+                    item = get_special_weapon(item_index)
+                if not item:
+                    item = get_special_armor(item_index)
             elif item_type == 'weapon':
-                price_gp = 10
+                item = load_weapon(item_index)
             elif item_type == 'armor':
-                price_gp = 50
+                item = load_armor(item_index)
             else:
-                price_gp = 5
+                item = load_equipment(item_index)
+
+        if not item:
+            raise BadRequest(f"Item '{item_index}' introuvable")
+
+        # Prix affiché par le catalogue (calculé de la même façon pour les items hors catalogue)
+        entry = catalog.entry(item_type, item_index)
+        price_gp = entry['price'] if entry else item_price(item, item_type)
 
         # Vérifier l'or du personnage
         char_gold = character.get('gold', 0)
@@ -1748,16 +1884,17 @@ def shop_buy():
                 'error': f"Pas assez d'or ! Nécessaire: {price_gp} PO, disponible: {char_gold} PO"
             }), 400
 
-        # Vérifier le stock
-        shop = BoltacShop()
-        stock = shop.get_item_stock(item)
+        with SHOP_LOCK:
+            # Vérifier le stock
+            shop = get_shop()
+            stock = shop.get_item_stock(item)
 
-        if stock == 0:
-            return jsonify({'success': False, 'error': "Item en rupture de stock !"}), 400
+            if stock == 0:
+                return jsonify({'success': False, 'error': "Item en rupture de stock !"}), 400
 
-        # Acheter l'item
-        if not shop.buy_item(item, 1):
-            return jsonify({'success': False, 'error': "Erreur lors de l'achat"}), 400
+            # Acheter l'item
+            if not shop.buy_item(item, 1):
+                return jsonify({'success': False, 'error': "Erreur lors de l'achat"}), 400
 
         # Déduire l'or
         character['gold'] = char_gold - price_gp
@@ -1859,4 +1996,6 @@ def shop_sell():
 
 
 if __name__ == '__main__':
+    for name in ('races', 'classes', 'shop', 'monsters'):
+        get_catalog(name)  # catalogs built before the first request
     app.run(debug=True, host='0.0.0.0', port=5000)
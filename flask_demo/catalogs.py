@@ -0,0 +1,209 @@
+"""
+Catalogues précalculés de la démo Flask (bestiaire, races, classes, boutique)
+
+The catalogs only change when the application is deployed again. Each one is
+built once: an immutable tuple of JSON-ready entries, the JSON response of the
+whole catalog already encoded and gzipped, and its ETag. Filtered or paginated
+queries (?type=dragon&cr_min=5&page=2) are cached the same way, by query, in
+an LRU cache.
+
+Catalog entries are plain dicts: building them never needs Flask, and the shop
+keeps the loaded item of each entry to resolve purchases without reloading it.
+"""
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+
+# Price (gp) of the items without a cost, by shop category (the prices of the shop before the catalogs)
+DEFAULT_PRICES = {'weapon': 10, 'armor': 50, 'magic': 500}
+
+# Filter: (parse the query value, does the entry match the parsed value)
+Filter = Tuple[Callable[[str], Any], Callable[[dict, Any], bool]]
+
+
+@dataclass(frozen=True)
+class CatalogPage:
+    """JSON response body, gzipped, and its ETag (to be sent weak: the same for both encodings)"""
+    body: bytes
+    gzipped: bytes
+    etag: str
+
+    @classmethod
+    def build(cls, payload: dict) -> 'CatalogPage':
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode()
+        return cls(body=body, gzipped=gzip.compress(body, compresslevel=6, mtime=0),
+                   etag=hashlib.sha1(body).hexdigest()[:20])
+
+
+class Catalog:
+    """Immutable catalog: entries, with the responses of the whole catalog and of its queries"""
+
+    def __init__(self, key: str, entries: Iterable, filters: Optional[Dict[str, Filter]] = None):
+        self.key = key
+        self.entries = tuple(entries)
+        self.filters = filters or {}
+        self.full = CatalogPage.build({key: list(self.entries), 'total': len(self.entries)})
+        self._query = lru_cache(maxsize=256)(self._build_query)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def query(self, args: Mapping[str, str]) -> CatalogPage:
+        """
+        Response for the query string args: filters of the catalog, page (from 1) and per_page.
+        Unknown arguments are ignored, invalid values raise ValueError.
+        """
+        params = tuple(sorted((name, args[name]) for name in args if name in self.filters or name in ('page', 'per_page')))
+        return self._query(params) if params else self.full
+
+    def _build_query(self, params: Tuple[Tuple[str, str], ...]) -> CatalogPage:
+        entries = self.entries
+        page, per_page = None, DEFAULT_PER_PAGE
+        for name, value in params:
+            if name == 'page':
+                page = int(value)
+            elif name == 'per_page':
+                per_page = int(value)
+                page = page or 1
+            else:
+                parse, match = self.filters[name]
+                parsed = parse(value)
+                entries = [entry for entry in entries if match(entry, parsed)]
+        payload = {self.key: list(entries), 'total': len(entries)}
+        if page is not None:
+            if page < 1 or not 1 <= per_page <= MAX_PER_PAGE:
+                raise ValueError(f"page >= 1 and 1 <= per_page <= {MAX_PER_PAGE}")
+            start = (page - 1) * per_page
+            payload.update({self.key: list(entries[start:start + per_page]), 'page': page, 'per_page': per_page})
+        return CatalogPage.build(payload)
+
+
+def parse_number(value: str) -> float:
+    """'5', '0.5' or '1/4' (challenge ratings)"""
+    return float(Fraction(value))
+
+
+def _value(entry: dict, field: str) -> float:
+    return entry[field] if entry[field] is not None else 0
+
+
+def range_filters(field: str) -> Dict[str, Filter]:
+    """<field> (equal), <field>_min and <field>_max"""
+    return {
+        field: (parse_number, lambda e, v: _value(e, field) == v),
+        f'{field}_min': (parse_number, lambda e, v: _value(e, field) >= v),
+        f'{field}_max': (parse_number, lambda e, v: _value(e, field) <= v),
+    }
+
+
+def text_filter(field: str) -> Filter:
+    """Case insensitive equality"""
+    return str.lower, lambda e, v: str(e[field]).lower() == v
+
+
+def monster_type(monster) -> str:
+    """Creature type of the monster, read from its JSON data when the loader did not set it"""
+    creature_type = getattr(monster, 'creature_type', None)
+    if not creature_type:
+        from dnd_5e_core.data.loader import load_json_file
+        # Same lookup order as load_monster (official, extended, then the old monsters/ directory)
+        data = next(filter(None, (load_json_file(category, monster.index) for category in ('monsters/official', 'monsters/extended', 'monsters'))), {})
+        creature_type = data.get('type')
+        if isinstance(creature_type, dict):  # extended format: {'type': ..., 'tags': [...]}
+            creature_type = creature_type.get('type')
+    return str(creature_type) if creature_type else 'Unknown'
+
+
+def monster_entry(monster) -> dict:
+    return {
+        'index': monster.index,
+        'name': monster.name,
+        'type': monster_type(monster),
+        'cr': float(monster.challenge_rating),
+        'xp': getattr(monster, 'xp', 0),
+        'hp': monster.max_hit_points,
+        'ac': monster.armor_class,
+    }
+
+
+def monsters_catalog(monsters: Iterable) -> Catalog:
+    """Monsters (or monster indexes, as list_monsters returns them), sorted by CR"""
+    from dnd_5e_core import load_monster
+    monsters = (load_monster(m) if isinstance(m, str) else m for m in monsters)
+    entries = sorted((monster_entry(m) for m in monsters if m is not None), key=lambda e: (e['cr'], e['name']))
+    return Catalog('monsters', entries, filters={**range_filters('cr'), 'type': text_filter('type')})
+
+
+def item_price(item, category: str) -> float:
+    """Price in gp (cost in cp / 100), the default price of the category if the item has no cost"""
+    cost = getattr(item, 'cost', None)
+    price_cp = cost.value if hasattr(cost, 'value') else cost if isinstance(cost, int) else 0
+    return price_cp / 100 if price_cp and price_cp > 0 else DEFAULT_PRICES.get(category, 5)
+
+
+def shop_entry(item, category: str, index: str) -> dict:
+    entry = {
+        'index': index,
+        'name': item.name,
+        'category': category,
+        'type': type(item).__name__,
+        'price': item_price(item, category),
+    }
+    if category == 'weapon' or hasattr(item, 'damage_dice'):
+        entry['damage_dice'] = str(item.damage_dice) if getattr(item, 'damage_dice', None) else None
+        entry['damage_type'] = str(item.damage_type) if getattr(item, 'damage_type', None) else None
+    if category == 'armor' or hasattr(item, 'armor_class'):
+        armor_class = getattr(item, 'armor_class', None)
+        entry['armor_class'] = armor_class.get('base') if isinstance(armor_class, dict) else armor_class
+        entry['armor_category'] = str(item.category) if getattr(item, 'category', None) else None
+    desc = getattr(item, 'desc', None)
+    entry['description'] = ' '.join(desc) if isinstance(desc, list) else desc
+    return entry
+
+
+class ShopCatalog(Catalog):
+    """Items of Boltac's shop, by category ('weapon', 'armor', 'magic'), with their loaded items"""
+
+    def __init__(self, items: Iterable[Tuple[str, str, Any]]):
+        items = list(items)
+        self._items = {(category, index): item for category, index, item in items}
+        super().__init__('items', (shop_entry(item, category, index) for category, index, item in items),
+                         filters={'category': text_filter('category'), **range_filters('price')})
+        self._entries = {(entry['category'], entry['index']): entry for entry in self.entries}
+        self._by_category: Dict[str, list] = {}
+        for entry in self.entries:
+            self._by_category.setdefault(entry['category'], []).append(entry)
+
+    def category(self, category: str) -> list:
+        return self._by_category.get(category, [])
+
+    def entry(self, category: str, index: str) -> Optional[dict]:
+        return self._entries.get((category, index))
+
+    def item(self, category: str, index: str):
+        """Loaded item of the catalog, None if it is not sold by the shop"""
+        return self._items.get((category, index))
+
+
+def shop_catalog() -> ShopCatalog:
+    """Weapons and armors of the loader (sorted by name), then the magic items of the registries"""
+    from dnd_5e_core.data.loader import list_armors, list_weapons, load_armor, load_weapon
+    from dnd_5e_core.equipment import MAGIC_ITEMS_REGISTRY, SPECIAL_ARMORS, SPECIAL_WEAPONS, get_magic_item, get_special_armor, get_special_weapon
+
+    items = []
+    for category, indexes, load in (('weapon', list_weapons(), load_weapon), ('armor', list_armors(), load_armor)):
+        loaded = [item for item in map(load, indexes) if item]
+        items += [(category, item.index, item) for item in sorted(loaded, key=lambda i: getattr(i, 'name', ''))]
+    for index in dict.fromkeys([*MAGIC_ITEMS_REGISTRY, *(SPECIAL_WEAPONS or {}), *(SPECIAL_ARMORS or {})]):
+        # Resolved like BoltacShop.get_magic_items_in_stock
+        item = get_magic_item(index) or get_special_weapon(index) or get_special_armor(index)
+        if item:
+            items.append(('magic', index, item))
+    return ShopCatalog(items)
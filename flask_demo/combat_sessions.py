@@ -0,0 +1,280 @@
+"""
+Sessions de combat en mémoire (côté serveur)
+
+Every combat turn used to rebuild the whole party with simple_character_generator
+and every monster with load_monster from the serialized combat_state, to play a
+single round. A CombatSession keeps the live Character / Monster / CombatSystem
+objects of a fight between turns, in a CombatSessionRegistry keyed by the Flask
+session_id:
+
+- sessions idle for more than ttl seconds, and the least recently used ones
+  beyond max_sessions, are evicted; on_evict(session) is called first so that
+  the application can save a snapshot of the fight
+- a missing session (evicted, server restarted, request served by another
+  worker process) is rebuilt from the saved combat_state with
+  CombatSession.from_state(); the application saves combat_state after
+  every turn, and latest_combat_state() picks the most advanced copy of it
+- turn durations are recorded to report the p95 latency
+
+Combat messages are published, as CombatSystem produces them, to the
+CombatEventLog of the session: a bounded ring buffer of numbered events that
+clients read incrementally (events after the last id they got), or wait for
+(Server-Sent Events stream).
+"""
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dnd_5e_core import load_monster
+from dnd_5e_core.combat import CombatSystem
+from dnd_5e_core.data.loaders import simple_character_generator
+
+
+@dataclass(frozen=True)
+class CombatEvent:
+    id: int
+    round: int
+    message: str
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class CombatEventLog:
+    """Last maxlen combat events, numbered from last_id + 1 (thread safe)"""
+
+    def __init__(self, maxlen: int = 500, last_id: int = 0):
+        self._events = deque(maxlen=maxlen)
+        self._changed = threading.Condition()
+        self.last_id = last_id
+        self.closed = False
+
+    def append(self, message: str, round_no: int) -> CombatEvent:
+        with self._changed:
+            self.last_id += 1
+            event = CombatEvent(self.last_id, round_no, message)
+            self._events.append(event)
+            self._changed.notify_all()
+        return event
+
+    def close(self):
+        """End of the fight: waiting readers are woken up"""
+        with self._changed:
+            self.closed = True
+            self._changed.notify_all()
+
+    def _since(self, after_id: int) -> Tuple[List[CombatEvent], bool]:
+        if not self._events or after_id >= self.last_id:
+            return [], False
+        first_id = self._events[0].id
+        # Ids are consecutive: the first event after after_id is found by its position
+        start = max(0, after_id + 1 - first_id)
+        return list(islice(self._events, start, None)), after_id < first_id - 1
+
+    def since(self, after_id: int = 0) -> Tuple[List[CombatEvent], bool]:
+        """(events after after_id, True if some of them are no longer in the buffer)"""
+        with self._changed:
+            return self._since(after_id)
+
+    def wait(self, after_id: int, timeout: float) -> List[CombatEvent]:
+        """Events after after_id, waiting up to timeout seconds for some if there are none and the log is open"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.last_id > after_id or self.closed, timeout)
+            return self._since(after_id)[0]
+
+
+def latest_combat_state(stored: Optional[dict], *others: Optional[dict]) -> Optional[dict]:
+    """
+    The saved combat_state, or the most advanced of the other copies of the same fight (same id, round
+    not behind): a cookie or a live session can be ahead of a save written before their last turn.
+    """
+    latest = stored
+    for state in others:
+        if state and latest and state.get('id') == latest.get('id') and state.get('round', 0) >= latest.get('round', 0):
+            latest = state
+    return latest
+
+
+class CombatSession:
+    """Live objects of a fight. Turns of a session are played under its lock."""
+
+    def __init__(self, session_id: str, characters: List, monsters: List, round_no: int = 1, combat_state: Optional[dict] = None,
+                 last_event_id: int = 0, events_kept: int = 500):
+        self.session_id = session_id
+        self.characters = characters
+        self.monsters = monsters
+        self.round = round_no
+        # Last serialized state (see the application), saved if the session is evicted
+        self.combat_state = combat_state
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.events = CombatEventLog(maxlen=events_kept, last_id=last_event_id)
+        self._messages: List[str] = []
+        self.combat = CombatSystem(verbose=False, message_callback=self.publish)
+
+    def publish(self, message: str) -> CombatEvent:
+        """Add message to the messages of the turn being played and to the event log"""
+        self._messages.append(message)
+        return self.events.append(message, self.round)
+
+    @classmethod
+    def from_state(cls, session_id: str, combat_state: dict) -> 'CombatSession':
+        """Rebuild the fight from a serialized combat_state (the slow path: full regeneration)"""
+        characters = []
+        for p in combat_state['party']:
+            char = simple_character_generator(level=p['level'], race_name=p['race'], class_name=p['class'], name=p['name'])
+            char.hit_points = p['hp']
+            char.xp = p.get('xp', 0)
+            char.gold = p.get('gold', 0)
+            characters.append(char)
+        monsters = []
+        for m in combat_state['monsters']:
+            monster = load_monster(m['name'])
+            if monster:
+                monster.hit_points = m['hp']
+                monsters.append(monster)
+        return cls(session_id, characters, monsters, round_no=combat_state['round'], combat_state=combat_state,
+                   last_event_id=combat_state.get('event_id', 0))
+
+    @property
+    def alive_characters(self) -> List:
+        return [c for c in self.characters if c.hit_points > 0]
+
+    @property
+    def alive_monsters(self) -> List:
+        return [m for m in self.monsters if m.hit_points > 0]
+
+    def take_messages(self) -> List[str]:
+        """Messages published since the previous call"""
+        messages = self._messages[:]
+        self._messages.clear()
+        return messages
+
+    def play_round(self) -> List[str]:
+        """Every character, then every monster, acts once. Returns the combat messages."""
+        characters = self.characters
+        alive_chars, alive_monsters = self.alive_characters, self.alive_monsters
+        if alive_chars and alive_monsters:
+            for char in alive_chars:
+                if alive_monsters:
+                    self.combat.character_turn(char, alive_chars, alive_monsters, characters)
+                    alive_monsters = self.alive_monsters
+            for monster in alive_monsters[:]:
+                if alive_chars and monster.hit_points > 0:
+                    self.combat.monster_turn(monster, alive_monsters, alive_chars, characters, self.round)
+                    alive_chars = self.alive_characters
+        self.round += 1
+        return self.take_messages()
+
+    def play_character_turn(self, char_index: int, target_index: int = 0) -> List[str]:
+        """One character acts, then every monster. Returns the combat messages."""
+        characters = self.characters
+        if char_index < len(characters) and target_index < len(self.monsters):
+            alive_chars, alive_monsters = self.alive_characters, self.alive_monsters
+            if alive_chars and alive_monsters:
+                self.combat.character_turn(characters[char_index], alive_chars, alive_monsters, characters)
+                for monster in alive_monsters[:]:
+                    if monster.hit_points > 0:
+                        self.combat.monster_turn(monster, alive_monsters, alive_chars, characters, self.round)
+        self.round += 1
+        return self.take_messages()
+
+
+class CombatSessionRegistry:
+    """CombatSession by session_id, with TTL and LRU eviction (thread safe)"""
+
+    def __init__(self, max_sessions: int = 256, ttl: float = 1800, on_evict: Optional[Callable[[CombatSession], None]] = None,
+                 latency_samples: int = 1000):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._sessions: Dict[str, CombatSession] = OrderedDict()
+        self._lock = threading.Lock()
+        self.turn_times = deque(maxlen=latency_samples)  # seconds, most recent turns
+        self.hits = self.misses = self.evictions = 0  # instrumentation
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _expired(self, now: float) -> List[CombatSession]:
+        """Pop expired and surplus sessions, the least recently used first (registry lock held)"""
+        evicted = []
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_used <= self.ttl and len(self._sessions) <= self.max_sessions:
+                break
+            evicted.append(self._sessions.pop(session.session_id))
+        return evicted
+
+    def _evict(self, sessions: List[CombatSession]):
+        # Snapshots are written outside of the registry lock
+        for session in sessions:
+            self.evictions += 1
+            if self.on_evict:
+                with session.lock:
+                    self.on_evict(session)
+            session.events.close()
+
+    def get(self, session_id: str) -> Optional[CombatSession]:
+        now = time.monotonic()
+        with self._lock:
+            evicted = self._expired(now)
+            session = self._sessions.get(session_id)
+            if session:
+                self._sessions.move_to_end(session_id)
+                session.last_used = now
+                self.hits += 1
+            else:
+                self.misses += 1
+        self._evict(evicted)
+        return session
+
+    def peek(self, session_id: str) -> Optional[CombatSession]:
+        """Session of session_id if registered, without refreshing it nor counting a hit/miss"""
+        return self._sessions.get(session_id)
+
+    def put(self, session: CombatSession) -> CombatSession:
+        """Register session (replacing the one of the same session_id)"""
+        session.last_used = time.monotonic()
+        with self._lock:
+            replaced = self._sessions.pop(session.session_id, None)
+            self._sessions[session.session_id] = session
+            evicted = self._expired(session.last_used)
+        if replaced is not None and replaced is not session:
+            replaced.events.close()
+        self._evict(evicted)
+        return session
+
+    def discard(self, session_id: str) -> Optional[CombatSession]:
+        """Forget a finished fight (no snapshot)"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is not None:
+            session.events.close()
+        return session
+
+    def record_turn(self, duration: float):
+        self.turn_times.append(duration)
+
+    def latency_percentile(self, percentile: float = 95) -> Optional[float]:
+        """Turn duration (seconds) below which percentile % of the recorded turns fall"""
+        times = sorted(self.turn_times)
+        if not times:
+            return None
+        return times[min(len(times) - 1, max(0, math.ceil(percentile / 100 * len(times)) - 1))]
+
+    def stats(self) -> dict:
+        p50, p95 = self.latency_percentile(50), self.latency_percentile(95)
+        return {
+            'sessions': len(self._sessions),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'turns': len(self.turn_times),
+            'p50_ms': round(p50 * 1000, 2) if p50 is not None else None,
+            'p95_ms': round(p95 * 1000, 2) if p95 is not None else None,
+        }
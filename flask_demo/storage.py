@@ -0,0 +1,276 @@
+"""
+Stockage des sessions et du roster de la démo Flask
+
+Two backends with the same methods:
+
+- PickleStorage: the historical files, one pickle per session in data/saves and
+  one per character in data/roster, rewritten as a whole on every save
+- SQLiteStorage: one database in WAL mode (readers never wait for the writer),
+  shared by the worker processes of a WSGI server. A session is a row plus one
+  row per party member, the roster one row per character, indexed on status and
+  class. Hit points, XP, gold and status are columns of their own: a save that
+  only changes them updates those columns, a save that changes nothing writes
+  nothing.
+
+The application batches its saves (see flask_demo/app.py): a request marks the
+session and the roster characters to save, and they are written once, in one
+transaction, when the request ends.
+"""
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Character fields stored in columns (updated without rewriting the rest of the character)
+HOT_FIELDS = ('hp', 'xp', 'gold', 'status')
+
+
+class PickleStorage:
+    """Sessions and roster as pickle files (historical layout)"""
+
+    def __init__(self, save_dir: Path, roster_dir: Path):
+        self.save_dir = Path(save_dir)
+        self.roster_dir = Path(roster_dir)
+        self.save_dir.mkdir(parents=True, exist_ok=True)
+        self.roster_dir.mkdir(parents=True, exist_ok=True)
+
+    def session_ids(self) -> List[str]:
+        return [path.stem for path in self.save_dir.glob('*.pkl')]
+
+    def load_session(self, session_id: str) -> Optional[dict]:
+        save_path = self.save_dir / f"{session_id}.pkl"
+        if not save_path.exists():
+            return None
+        with open(save_path, 'rb') as f:
+            return pickle.load(f)
+
+    def save_session(self, session_id: str, party: List[dict], combat_state: Optional[dict], party_gold: int):
+        with open(self.save_dir / f"{session_id}.pkl", 'wb') as f:
+            pickle.dump({'party': party, 'combat_state': combat_state, 'party_gold': party_gold}, f)
+
+    def save_combat_state(self, session_id: str, combat_state: Optional[dict]):
+        data = self.load_session(session_id) or {}
+        self.save_session(session_id, data.get('party', []), combat_state, data.get('party_gold', 0))
+
+    def roster(self, status: Optional[str] = None) -> List[dict]:
+        characters = []
+        for char_file in self.roster_dir.glob("*.pkl"):
+            try:
+                with open(char_file, 'rb') as f:
+                    characters.append(pickle.load(f))
+            except Exception as e:
+                print(f"Erreur loading {char_file}: {e}")
+        if status is not None:
+            characters = [c for c in characters if c.get('status') == status]
+        return sorted(characters, key=lambda c: c['name'])
+
+    def get_character(self, name: str) -> Optional[dict]:
+        char_file = self.roster_dir / f"{name}.pkl"
+        if not char_file.exists():
+            return None
+        with open(char_file, 'rb') as f:
+            return pickle.load(f)
+
+    def save_characters(self, characters: Iterable[dict]):
+        for character in characters:
+            with open(self.roster_dir / f"{character['name']}.pkl", 'wb') as f:
+                pickle.dump(character, f)
+
+    def delete_character(self, name: str) -> bool:
+        char_file = self.roster_dir / f"{name}.pkl"
+        if not char_file.exists():
+            return False
+        char_file.unlink()
+        return True
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    party_gold INTEGER NOT NULL DEFAULT 0,
+    combat_state TEXT,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS party_members (
+    session_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    hp INTEGER,
+    xp INTEGER,
+    gold INTEGER,
+    status TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS roster (
+    name TEXT PRIMARY KEY,
+    class TEXT,
+    level INTEGER,
+    hp INTEGER,
+    xp INTEGER,
+    gold INTEGER,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS roster_status ON roster (status, name);
+CREATE INDEX IF NOT EXISTS roster_class ON roster (class, level);
+"""
+
+
+def _split(character: dict) -> Tuple[tuple, str]:
+    """(hot fields, JSON of the other fields) of a character"""
+    hot = tuple(character.get(field) for field in HOT_FIELDS)
+    data = json.dumps({k: v for k, v in character.items() if k not in HOT_FIELDS}, ensure_ascii=False, separators=(',', ':'))
+    return hot, data
+
+
+def _join(data: str, hot: tuple) -> dict:
+    character = json.loads(data)
+    character.update((field, value) for field, value in zip(HOT_FIELDS, hot) if value is not None)
+    return character
+
+
+class SQLiteStorage:
+    """Sessions and roster in a SQLite database (WAL), one connection per thread and process"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self.rows_written = 0  # instrumentation: rows inserted or updated, hot field updates included
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            # Autocommit: transactions are opened explicitly by _transaction
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        db = self._connection()
+        # Write lock taken at once: no deadlock between two workers upgrading a read transaction
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            yield db
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        db.execute('COMMIT')
+
+    def is_empty(self) -> bool:
+        db = self._connection()
+        return not db.execute('SELECT 1 FROM sessions').fetchone() and not db.execute('SELECT 1 FROM roster').fetchone()
+
+    def import_storage(self, other: PickleStorage):
+        """Copy the sessions and the roster of the pickle files"""
+        for session_id in other.session_ids():
+            data = other.load_session(session_id)
+            if data:
+                self.save_session(session_id, data.get('party', []), data.get('combat_state'), data.get('party_gold', 0))
+        self.save_characters(other.roster())
+
+    def load_session(self, session_id: str) -> Optional[dict]:
+        db = self._connection()
+        row = db.execute('SELECT party_gold, combat_state FROM sessions WHERE session_id = ?', (session_id,)).fetchone()
+        if row is None:
+            return None
+        party = [_join(data, hot) for *hot, data in
+                 db.execute('SELECT hp, xp, gold, status, data FROM party_members WHERE session_id = ? ORDER BY position', (session_id,))]
+        return {'party': party, 'combat_state': json.loads(row[1]) if row[1] else None, 'party_gold': row[0]}
+
+    def save_session(self, session_id: str, party: List[dict], combat_state: Optional[dict], party_gold: int):
+        """Write what changed since the last save of the session"""
+        state = json.dumps(combat_state, ensure_ascii=False, separators=(',', ':')) if combat_state is not None else None
+        with self._transaction() as db:
+            row = db.execute('SELECT party_gold, combat_state FROM sessions WHERE session_id = ?', (session_id,)).fetchone()
+            if row != (party_gold, state):
+                db.execute('INSERT INTO sessions (session_id, party_gold, combat_state, updated) VALUES (?, ?, ?, ?)'
+                           ' ON CONFLICT (session_id) DO UPDATE SET party_gold = excluded.party_gold,'
+                           ' combat_state = excluded.combat_state, updated = excluded.updated',
+                           (session_id, party_gold, state, time.time()))
+                self.rows_written += 1
+            stored: Dict[int, tuple] = {position: (name, tuple(hot), data) for position, name, *hot, data in db.execute(
+                'SELECT position, name, hp, xp, gold, status, data FROM party_members WHERE session_id = ?', (session_id,))}
+            for position, member in enumerate(party):
+                hot, data = _split(member)
+                old = stored.get(position)
+                if old is None or old[0] != member['name'] or old[2] != data:
+                    db.execute('INSERT OR REPLACE INTO party_members (session_id, position, name, hp, xp, gold, status, data)'
+                               ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (session_id, position, member['name'], *hot, data))
+                elif old[1] != hot:
+                    db.execute('UPDATE party_members SET hp = ?, xp = ?, gold = ?, status = ? WHERE session_id = ? AND position = ?',
+                               (*hot, session_id, position))
+                else:
+                    continue
+                self.rows_written += 1
+            if len(stored) > len(party):
+                db.execute('DELETE FROM party_members WHERE session_id = ? AND position >= ?', (session_id, len(party)))
+
+    def save_combat_state(self, session_id: str, combat_state: Optional[dict]):
+        state = json.dumps(combat_state, ensure_ascii=False, separators=(',', ':')) if combat_state is not None else None
+        with self._transaction() as db:
+            db.execute('INSERT INTO sessions (session_id, combat_state, updated) VALUES (?, ?, ?)'
+                       ' ON CONFLICT (session_id) DO UPDATE SET combat_state = excluded.combat_state, updated = excluded.updated',
+                       (session_id, state, time.time()))
+            self.rows_written += 1
+
+    def roster(self, status: Optional[str] = None) -> List[dict]:
+        query = 'SELECT hp, xp, gold, status, data FROM roster'
+        if status is not None:
+            rows = self._connection().execute(f'{query} WHERE status = ? ORDER BY name', (status,))
+        else:
+            rows = self._connection().execute(f'{query} ORDER BY name')
+        return [_join(data, hot) for *hot, data in rows]
+
+    def get_character(self, name: str) -> Optional[dict]:
+        row = self._connection().execute('SELECT hp, xp, gold, status, data FROM roster WHERE name = ?', (name,)).fetchone()
+        return _join(row[-1], row[:-1]) if row else None
+
+    def save_characters(self, characters: Iterable[dict]):
+        """Write the characters that changed, hot fields only when the rest did not"""
+        characters = list(characters)
+        if not characters:
+            return
+        with self._transaction() as db:
+            for character in characters:
+                hot, data = _split(character)
+                old = db.execute('SELECT hp, xp, gold, status, data FROM roster WHERE name = ?', (character['name'],)).fetchone()
+                if old is None or old[-1] != data:
+                    db.execute('INSERT OR REPLACE INTO roster (name, class, level, hp, xp, gold, status, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                               (character['name'], character.get('class'), character.get('level'), *hot, data))
+                elif old[:-1] != hot:
+                    db.execute('UPDATE roster SET hp = ?, xp = ?, gold = ?, status = ? WHERE name = ?', (*hot, character['name']))
+                else:
+                    continue
+                self.rows_written += 1
+
+    def delete_character(self, name: str) -> bool:
+        with self._transaction() as db:
+            return db.execute('DELETE FROM roster WHERE name = ?', (name,)).rowcount > 0
+
+
+def open_storage(kind: str, data_dir: Path):
+    """
+    'pickle': the files of data_dir/saves and data_dir/roster
+    'sqlite': data_dir/flask_demo.db, created with the content of those files
+    """
+    data_dir = Path(data_dir)
+    legacy = PickleStorage(data_dir / 'saves', data_dir / 'roster')
+    if kind == 'pickle':
+        return legacy
+    if kind != 'sqlite':
+        raise ValueError(f"Unknown storage {kind!r} (pickle or sqlite)")
+    storage = SQLiteStorage(data_dir / 'flask_demo.db')
+    if storage.is_empty():
+        storage.import_storage(legacy)
+    return storage
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import pickle
 import sys
 from copy import copy
 from fractions import Fraction
+from functools import lru_cache
 
 from numpy import array
 
@@ -72,6 +72,9 @@ else:
 
 from tools.ability_scores_roll import ability_rolls
 from tools.common import exit_message, get_key, get_save_game_path
+from tools.encounter_index import encounter_index
+from tools.lazy_collection import LazyCollection, warm_up
+from tools import save_format
 
 print("✅ [MIGRATION v2] main.py - Using dnd-5e-core package")
 print()
@@ -123,7 +126,7 @@ def read_name(race: str, gender: str, names: dict(), reserved_names):
         names_list = names[ethnic][gender]
         if len(names[ethnic]) > 2:
             other_key = [key for key in names[ethnic] if key not in ["male", "female"]][0]
-            names_list += names[ethnic][other_key]
+            names_list = names_list + names[ethnic][other_key]
         names: List[str] = [name for name in names_list if name not in reserved_names]
         name = read_choice(names, "Choose name:")
         return name, ethnic
@@ -135,7 +138,7 @@ def read_name(race: str, gender: str, names: dict(), reserved_names):
             exit(0)
         if len(names[race]) > 2:
             other_key = [key for key in names[race] if key not in ["male", "female"]][0]
-            names_list += names[race][other_key]
+            names_list = names_list + names[race][other_key]
         names: List[str] = [name for name in names_list if name not in reserved_names]
         name = read_choice(names, "Choose name:")
         return name
@@ -440,43 +443,52 @@ def create_new_character_start(races: List[Race], subraces: List[SubRace], class
     return (race, subrace, class_type, char_proficiencies, abilities, ability_modifiers, name, gender, ethnic, height, weight, starting_equipment,)
 
 
-def load_character_collections() -> Tuple:
-    """Character creation database"""
+def load_character_collections(background_warm_up: bool = False) -> Tuple:
+    """
+    Character creation database
+    Collections are LazyCollection objects: entries are only built on first access (or in the background with background_warm_up)
+    """
     races_names: List[str] = populate(collection_name="races", key_name="results")
-    races: List[Race] = [request_race(name) for name in races_names]
+    races: List[Race] = LazyCollection(races_names, request_race)
     subraces_names: List[str] = populate(collection_name="subraces", key_name="results")
-    subraces: List[Race] = [request_subrace(name) for name in subraces_names]
+    subraces: List[Race] = LazyCollection(subraces_names, request_subrace)
     names = dict()
     for race in races:
         if race.index not in ["human", "half-elf"]:
             names[race.index] = populate_names(race)
     human_names: dict() = populate_human_names()
     classes: List[str] = populate(collection_name="classes", key_name="results")
-    classes = [request_class(name) for name in classes]
+    classes = LazyCollection(classes, request_class)
     alignments: List[str] = populate(collection_name="alignments", key_name="results")
     equipment_names: List[str] = populate(collection_name="equipment", key_name="results")
-    equipments = [request_equipment(name) for name in equipment_names]
+    equipments = LazyCollection(equipment_names, request_equipment)
     proficiencies_names: List[str] = populate(collection_name="proficiencies", key_name="results")
-    proficiencies = [request_proficiency(name) for name in proficiencies_names]
+    proficiencies = LazyCollection(proficiencies_names, request_proficiency)
     spell_names: List[str] = populate(collection_name="spells", key_name="results")
-    spells: List[Spell] = [request_spell(name) for name in spell_names]
-    spells = [s for s in spells if s is not None]
+    spells: List[Spell] = LazyCollection(spell_names, request_spell, skip_missing=True)
+    if background_warm_up:
+        warm_up(spells, proficiencies, equipments, classes, subraces)
     return (races, subraces, classes, alignments, equipments, proficiencies, names, human_names, spells,)
 
 
-def load_dungeon_collections() -> Tuple:
-    """Monster, Armor and Weapon databases"""
+def load_dungeon_collections(background_warm_up: bool = False) -> Tuple:
+    """
+    Monster, Armor and Weapon databases
+    Collections are LazyCollection objects: entries are only built on first access (or in the background with background_warm_up)
+    """
     monster_names: List[str] = populate(collection_name="monsters", key_name="results")
-    monsters: List[Monster] = [request_monster(name) for name in monster_names]
+    monsters: List[Monster] = LazyCollection(monster_names, request_monster, skip_missing=True)
     armor_names: List[str] = populate(collection_name="armors", key_name="equipment")
-    armors: List[Armor] = [request_armor(name) for name in armor_names]
+    armors: List[Armor] = LazyCollection(armor_names, request_armor, skip_missing=True)
     weapon_names: List[str] = populate(collection_name="weapons", key_name="equipment")
-    weapons: List[Weapon] = [request_weapon(name) for name in weapon_names]
+    weapons: List[Weapon] = LazyCollection(weapon_names, request_weapon, skip_missing=True)
     equipment_names: List[str] = populate(collection_name="equipment", key_name="results")
-    equipments: List[Equipment] = [request_equipment(name) for name in equipment_names]
+    equipments: List[Equipment] = LazyCollection(equipment_names, request_equipment)
     equipment_category_names: List[str] = populate(collection_name="equipment-categories", key_name="results")
-    equipment_categories: List[EquipmentCategory] = [request_equipment_category(name) for name in equipment_category_names]
+    equipment_categories: List[EquipmentCategory] = LazyCollection(equipment_category_names, request_equipment_category)
     healing_potions: List[HealingPotion] = load_potions_collections()
+    if background_warm_up:
+        warm_up(monsters, weapons, armors, equipments, equipment_categories)
     return monsters, armors, weapons, equipments, equipment_categories, healing_potions
 
 
@@ -598,7 +610,7 @@ def generate_random_name(race: str, gender: str, names: dict(), reserved_names):
         names_list = names[ethnic][gender]
         if len(names[ethnic]) > 2:
             other_key = [key for key in names[ethnic] if key not in ["male", "female"]][0]
-            names_list += names[ethnic][other_key]
+            names_list = names_list + names[ethnic][other_key]
         names: List[str] = [name for name in names_list if name not in reserved_names]
         name = choice(names)
         return name, ethnic
@@ -606,19 +618,24 @@ def generate_random_name(race: str, gender: str, names: dict(), reserved_names):
         names_list = names[race][gender]
         if len(names[race]) > 2:
             other_key = [key for key in names[race] if key not in ["male", "female"]][0]
-            names_list += names[race][other_key]
+            names_list = names_list + names[race][other_key]
         names: List[str] = [name for name in names_list if name not in reserved_names]
         name = choice(names)
         return name
 
 
+@lru_cache(maxsize=None)
+def load_starting_equipment() -> Tuple[List[Weapon], List[Armor]]:
+    """Non magic weapons and armors, read once (characters get copies)"""
+    from dnd_5e_core.data.collections import load_all_weapons, load_all_armors
+    return [w for w in load_all_weapons() if not getattr(w, 'is_magic', False)], [a for a in load_all_armors() if not getattr(a, 'is_magic', False)]
+
+
 def generate_random_character(roster: List[Character], races: List[Race], subraces: List[SubRace], classes: List[ClassType], names: dict[str, List[str]], human_names, spells: list[Spell]) -> Character:
     """
     Génère un personnage aléatoire avec l'équipement de départ optimal (meilleure arme et armure non magique).
     Ajoute une vérification explicite si aucun équipement n'est trouvé.
     """
-    from dnd_5e_core.data.collections import load_all_weapons, load_all_armors
-
     # Phase 1: character selection
 
     char_proficiencies: List[Proficiency] = []
@@ -657,8 +674,7 @@ def generate_random_character(roster: List[Character], races: List[Race], subrac
 
     # Phase 3: Equipement de départ optimal
     # Charger toutes les armes et armures non magiques
-    all_weapons = [w for w in load_all_weapons() if not getattr(w, 'is_magic', False)]
-    all_armors = [a for a in load_all_armors() if not getattr(a, 'is_magic', False)]
+    all_weapons, all_armors = load_starting_equipment()
     if not all_weapons:
         print("[ERREUR] Aucun équipement d'arme chargé (load_all_weapons vide)")
     if not all_armors:
@@ -696,9 +712,9 @@ def generate_random_character(roster: List[Character], races: List[Race], subrac
     # Préparer l'inventaire
     inventory = [None] * 20
     if best_weapon:
-        inventory[0] = best_weapon
+        inventory[0] = copy(best_weapon)
     if best_armor:
-        inventory[1] = best_armor
+        inventory[1] = copy(best_armor)
 
     return Character(
         race=race,
@@ -796,38 +812,32 @@ def create_new_character(roster: List[Character]) -> Character:
 
 
 def save_char_to_party(char_to_party: List[Char2Party], _dir: str):
-    with open(f"{_dir}/char_party_mappings.dmp", "wb") as f1:
-        pickle.dump(char_to_party, f1)
+    save_format.dump(char_to_party, f"{_dir}/char_party_mappings.dmp")
 
 
 def load_char_to_party(_dir: str) -> List[Char2Party]:
     try:
-        with open(f"{_dir}/char_party_mappings.dmp", "rb") as f1:
-            return pickle.load(f1)
+        return save_format.load(f"{_dir}/char_party_mappings.dmp")
     except FileNotFoundError:
         return []
 
 def load_party(_dir: str) -> List[Character]:
     try:
-        with open(f"{_dir}/party.dmp", "rb") as f1:
-            return pickle.load(f1)
+        return save_format.load(f"{_dir}/party.dmp")
     except FileNotFoundError:
         return []
 
 def save_party(party: List[Character], _dir: str):
-    with open(f"{_dir}/party.dmp", "wb") as f1:
-        pickle.dump(party, f1)
+    save_format.dump(party, f"{_dir}/party.dmp")
 
 
 def save_character(char: Character, _dir: str):
     # print(f'Sauvegarde personnage {char.name}')
-    with open(f"{_dir}/{char.name}.dmp", "wb") as f1:
-        pickle.dump(char, f1)
+    save_format.dump(char, f"{_dir}/{char.name}.dmp")
 
 
 def load_character(char_name: str, _dir: str) -> Character:
-    with open(f"{_dir}/{char_name}.dmp", "rb") as f1:
-        return pickle.load(f1)
+    return save_format.load(f"{_dir}/{char_name}.dmp")
 
 
 def get_roster(characters_dir: str) -> List[Character]:
@@ -835,10 +845,7 @@ def get_roster(characters_dir: str) -> List[Character]:
     char_file_list = os.scandir(characters_dir)
     for entry in char_file_list:
         if entry.is_file() and entry.name.endswith(".dmp"):
-            with open(entry, "rb") as f1:
-                # print(f1)
-                # print(entry)
-                roster.append(pickle.load(f1))
+            roster.append(save_format.load(entry.path))
     return roster
 
 
@@ -1102,15 +1109,16 @@ def arena(character: Character):
     difficulty: List[str] = ["HARD", "MEDIUM", "EASY", "KIDDIE"]
     arena_level: str = read_choice(difficulty, "Select difficulty:")
 
+    index = encounter_index(monsters)
     match arena_level:
         case "HARD":
             # monsters_to_fight = [m for m in monsters if m.level > character.level]
-            monsters_to_fight = [m for m in monsters if m.challenge_rating > character.level]
+            monsters_to_fight = index.monsters_with_crs(cr for cr in index.crs if cr > character.level)
         case "MEDIUM":
             # monsters_to_fight = [m for m in monsters if m.level < character.level + 5]
-            monsters_to_fight = [m for m in monsters if m.challenge_rating == character.level]
+            monsters_to_fight = index.monsters_with_cr(character.level)
         case "EASY":
-            monsters_to_fight = [m for m in monsters if m.challenge_rating < character.level]
+            monsters_to_fight = index.monsters_with_crs(cr for cr in index.crs if cr < character.level)
         case "KIDDIE":
             monsters_to_fight = [m for m in monsters if m.level < character.level + 5]
 
@@ -1822,24 +1830,21 @@ def load_encounter_gold_table() -> List[int]:
     return [int(gold) for enc_level, gold in data]
 
 
-def generate_encounter(available_crs: List[Fraction], encounter_table: dict, encounter_level: int, monsters: List[Monster], monster_groups_count: int, spell_casters_only: bool = False, ) -> List[Monster]:
+def generate_encounter(available_crs: Optional[List[Fraction]], encounter_table: dict, encounter_level: int, monsters: List[Monster], monster_groups_count: int, spell_casters_only: bool = False, ) -> List[Monster]:
+    """
+    :param available_crs: not used anymore (CRs come from the EncounterIndex of monsters), kept for existing callers
+    """
     if monster_groups_count > 2:
         exit_message("System Error!... only 2 groups of monsters allowed here. Please contact the Dungeon Master :-)")
         return
+    index = encounter_index(monsters)
     encounter_level = min(19, encounter_level)
     if not spell_casters_only and monster_groups_count == 2:
         cr1, cr2 = encounter_table[encounter_level][0]
         # print(f'(cr_1, cr2) = {(cr1, cr2)}')
-        if cr1 not in available_crs:
-            cr1 = min(available_crs, key=lambda cr: cr - cr1)
-        cr1_monsters: List[Monster] = [m for m in monsters if Fraction(str(m.challenge_rating)) == cr1]
+        cr1_monsters: List[Monster] = index.monsters_with_cr(index.nearest_cr(cr1))
         # print(f'{len(cr1_monsters)} cr_1_monsters = {cr1_monsters}')
-        if cr2 not in available_crs:
-            cr2 = min(available_crs, key=lambda cr: cr - cr2)
-        if spell_casters_only:
-            cr2_monsters: List[Monster] = [m for m in monsters if Fraction(str(m.challenge_rating)) == cr2 and m.is_spell_caster]
-        else:
-            cr2_monsters: List[Monster] = [m for m in monsters if Fraction(str(m.challenge_rating)) == cr2]
+        cr2_monsters: List[Monster] = index.monsters_with_cr(index.nearest_cr(cr2), spell_casters_only=spell_casters_only)
         # print(f'{len(cr2_monsters)} cr2_monsters = {cr2_monsters}')
         monster_1: Monster = choice(cr1_monsters)
         monster_2: Monster = choice(cr2_monsters)
@@ -1851,11 +1856,11 @@ def generate_encounter(available_crs: List[Fraction], encounter_table: dict, enc
             monsters_count: int = choice(list(map(int, enc_key.split("-"))))
             if encounter_level == 20:
                 cr: int = cr_list[0]
-                matching_monsters += [(m, monsters_count) for m in monsters if Fraction(str(m.challenge_rating)) >= cr and m.is_spell_caster]
+                matching_monsters += [(m, monsters_count) for m in index.monsters_from_cr(cr, spell_casters_only=True)]
             else:
-                matching_monsters += [(m, monsters_count) for m in monsters if Fraction(str(m.challenge_rating)) in cr_list and m.is_spell_caster]
+                matching_monsters += [(m, monsters_count) for m in index.monsters_with_crs(cr_list, spell_casters_only=True)]
         monster, monster_count = choice(matching_monsters)
-        group_of_monsters: List[Monster] = [request_monster(monster.index) for m in matching_monsters]
+        group_of_monsters: List[Monster] = [request_monster(monster.index)]
         for _ in range(monster_count - 1):
             m: Monster = request_monster(monster.index)
             m.hp_roll()
@@ -1927,7 +1932,7 @@ def explore_dungeon(party: List[Character], monsters_db: List[Monster]):
             encounter_levels: List[int] = generate_encounter_levels(party_level=party_level)
         encounter_level: int = encounter_levels.pop()
         monsters: List[Monster] = generate_encounter(
-            available_crs=available_crs,
+            available_crs=None,
             encounter_table=encounter_table,
             encounter_level=encounter_level,
             monsters=monsters_db,
@@ -2086,10 +2091,7 @@ if __name__ == "__main__":
     xp_levels: List[int] = load_xp_levels()
 
     """ Load Monster, Armor, Weapon databases """
-    monsters, armors, weapons, equipments, equipment_categories, potions = load_dungeon_collections()
-
-    armors = list(filter(lambda a: a, armors))
-    weapons = list(filter(lambda w: w, weapons))
+    monsters, armors, weapons, equipments, equipment_categories, potions = load_dungeon_collections(background_warm_up=True)
 
     locations: List[str] = ["Edge of Town", "Castle"]
     castle_destinations: List[str] = [
@@ -2119,7 +2121,6 @@ if __name__ == "__main__":
 
     encounter_table: dict() = load_encounter_table()
     encounter_gold_table: List[int] = load_encounter_gold_table()
-    available_crs: List[Fraction] = [Fraction(str(m.challenge_rating)) for m in monsters]
 
     location = "Castle"
 
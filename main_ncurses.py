@@ -32,6 +32,9 @@ from dnd_5e_core.equipment import Weapon, Armor, Cost, HealingPotion
 # No need to call set_data_directory() anymore
 
 from tools.common import get_save_game_path
+from tools.encounter_index import encounter_index
+from tools.lazy_collection import LazyCollection, warm_up
+from tools import save_format
 from populate_functions import (populate, request_monster, request_armor, request_weapon, request_equipment, request_equipment_category)
 
 print("✅ [MIGRATION v2] Successfully loaded with dnd-5e-core package")
@@ -47,9 +50,8 @@ def load_potions_collections():
 
 
 def get_roster(characters_dir: str):
-	"""Load roster from character files"""
+	"""Load roster from character files (save format of tools/save_format.py, or raw pickle)"""
 	import os
-	import pickle
 	roster = []
 	if not os.path.exists(characters_dir):
 		return roster
@@ -58,8 +60,7 @@ def get_roster(characters_dir: str):
 		for entry in char_file_list:
 			if entry.is_file() and entry.name.endswith(".dmp"):
 				try:
-					with open(entry, "rb") as f1:
-						roster.append(pickle.load(f1))
+					roster.append(save_format.load(entry.path))
 				except Exception:
 					pass
 	except Exception:
@@ -70,13 +71,11 @@ def get_roster(characters_dir: str):
 def load_party(_dir: str):
 	"""Load party from file"""
 	import os
-	import pickle
 	party = []
 	party_file = os.path.join(_dir, "party.dmp")
 	if os.path.exists(party_file):
 		try:
-			with open(party_file, "rb") as f1:
-				party = pickle.load(f1)
+			party = save_format.load(party_file)
 		except Exception:
 			pass
 	return party if party else []
@@ -85,30 +84,29 @@ def load_party(_dir: str):
 def save_party(party, _dir: str):
 	"""Save party to file"""
 	import os
-	import pickle
 	os.makedirs(_dir, exist_ok=True)
 	party_file = os.path.join(_dir, "party.dmp")
-	with open(party_file, "wb") as f1:
-		pickle.dump(party, f1)
+	save_format.dump(party, party_file)
 
 
 def save_character(char, _dir: str):
 	"""Save character to file"""
 	import os
-	import pickle
 	os.makedirs(_dir, exist_ok=True)
 	char_file = os.path.join(_dir, f"{char.name}.dmp")
-	with open(char_file, "wb") as f1:
-		pickle.dump(char, f1)
+	save_format.dump(char, char_file)
 
 
-def load_character_collections():
-	"""Charge les collections de création de personnage depuis les fichiers JSON et dnd_5e_core"""
+def load_character_collections(background_warm_up: bool = False):
+	"""
+	Charge les collections de création de personnage depuis les fichiers JSON et dnd_5e_core
+	(collections chargées à la demande, ou en tâche de fond avec background_warm_up)
+	"""
 	from dnd_5e_core.data import list_races, list_classes, load_race, load_class, load_names, load_human_names, list_subraces, load_subrace, list_spells, load_spell
 	# Races
-	races = [load_race(r) for r in list_races()]
-	subraces = [load_subrace(s) for s in list_subraces()]
-	classes = [load_class(c) for c in list_classes()]
+	races = LazyCollection(list_races(), load_race)
+	subraces = LazyCollection(list_subraces(), load_subrace)
+	classes = LazyCollection(list_classes(), load_class)
 	alignments = [
 		"Lawful Good", "Neutral Good", "Chaotic Good",
 		"Lawful Neutral", "True Neutral", "Chaotic Neutral",
@@ -122,23 +120,30 @@ def load_character_collections():
 		names[race] = load_names(race)
 	human_names = load_human_names()
 	# Sorts (optionnel)
-	spells = [load_spell(s) for s in list_spells()]
+	spells = LazyCollection(list_spells(), load_spell)
+	if background_warm_up:
+		warm_up(spells, classes, races, subraces)
 	return races, subraces, classes, alignments, [], [], names, human_names, spells
 
 
-def load_dungeon_collections():
-	"""Load dungeon collections without PyQt5 dependency"""
+def load_dungeon_collections(background_warm_up: bool = False):
+	"""
+	Load dungeon collections without PyQt5 dependency
+	(collections built on first access, or in the background with background_warm_up)
+	"""
 	monster_names = populate(collection_name="monsters", key_name="results")
-	monsters = [request_monster(name) for name in monster_names]
+	monsters = LazyCollection(monster_names, request_monster, skip_missing=True)
 	armor_names = populate(collection_name="armors", key_name="equipment")
-	armors = [request_armor(name) for name in armor_names]
+	armors = LazyCollection(armor_names, request_armor, skip_missing=True)
 	weapon_names = populate(collection_name="weapons", key_name="equipment")
-	weapons = [request_weapon(name) for name in weapon_names]
+	weapons = LazyCollection(weapon_names, request_weapon, skip_missing=True)
 	equipment_names = populate(collection_name="equipment", key_name="results")
-	equipments = [request_equipment(name) for name in equipment_names]
+	equipments = LazyCollection(equipment_names, request_equipment)
 	equipment_category_names = populate(collection_name="equipment-categories", key_name="results")
-	equipment_categories = [request_equipment_category(name) for name in equipment_category_names]
+	equipment_categories = LazyCollection(equipment_category_names, request_equipment_category)
 	healing_potions = load_potions_collections()
+	if background_warm_up:
+		warm_up(monsters, weapons, armors, equipments, equipment_categories)
 	return monsters, armors, weapons, equipments, equipment_categories, healing_potions
 
 
@@ -258,7 +263,6 @@ class DnDCursesUI:
 		self.spells = []
 		self.encounter_table = {}
 		self.encounter_gold_table = []
-		self.available_crs = []
 
 		# Message system
 		self.messages: List[str] = []
@@ -309,25 +313,22 @@ class DnDCursesUI:
 		self.xp_levels = self.load_xp_levels()
 
 		# Load databases
-		self.monsters, self.armors, self.weapons, self.equipments, self.equipment_categories, self.potions = load_dungeon_collections()
+		# Lazy collections (None values left out), built in the background while the menus are shown
+		self.monsters, self.armors, self.weapons, self.equipments, self.equipment_categories, self.potions = load_dungeon_collections(background_warm_up=True)
 
-		# Filter out None values
-		self.armors = list(filter(lambda a: a, self.armors))
-		self.weapons = list(filter(lambda w: w, self.weapons))
-
-		# Debug: Log data loaded
-		if self.monsters:
-			self.push_message(f"Loaded {len(self.monsters)} monsters")
+		# Debug: Log data indexed (counting names does not wait for the warm-up)
+		if self.monsters.names:
+			self.push_message(f"Indexed {len(self.monsters.names)} monsters")
 		else:
 			self.push_message("WARNING: No monsters loaded!")
 
-		if self.weapons:
-			self.push_message(f"Loaded {len(self.weapons)} weapons")
+		if self.weapons.names:
+			self.push_message(f"Indexed {len(self.weapons.names)} weapons")
 		else:
 			self.push_message("WARNING: No weapons loaded!")
 
-		if self.armors:
-			self.push_message(f"Loaded {len(self.armors)} armors")
+		if self.armors.names:
+			self.push_message(f"Indexed {len(self.armors.names)} armors")
 		else:
 			self.push_message("WARNING: No armors loaded!")
 
@@ -354,11 +355,11 @@ class DnDCursesUI:
 
 		# Load character collections (races, classes, spells, etc.)
 		try:
-			self.races, self.subraces, self.classes, self.alignments, _, _, self.names, self.human_names, self.spells = load_character_collections()
+			self.races, self.subraces, self.classes, self.alignments, _, _, self.names, self.human_names, self.spells = load_character_collections(background_warm_up=True)
 
 			# Debug: Check what was loaded
 			if self.races and self.classes:
-				self.push_message(f"✓ Loaded {len(self.races)} races, {len(self.classes)} classes, {len(self.spells)} spells")
+				self.push_message(f"✓ Indexed {len(self.races)} races, {len(self.classes)} classes, {len(self.spells)} spells")
 			else:
 				self.push_message(f"⚠ WARNING: races={len(self.races or [])}, classes={len(self.classes or [])}")
 		except Exception as e:
@@ -375,14 +376,14 @@ class DnDCursesUI:
 			self.human_names = {}
 			self.spells = []
 
-		if self.monsters:
-			from fractions import Fraction
-			self.available_crs = [Fraction(str(m.challenge_rating)) for m in self.monsters]
-			self.push_message(f"Available CRs: {len(self.available_crs)}")
-		else:
-			self.available_crs = []
+		if not self.monsters:
 			self.push_message("WARNING: No CRs available (no monsters)!")
 
+	@property
+	def available_crs(self) -> list:
+		"""Distinct challenge ratings of the bestiary (indexed on first use: it needs every monster)"""
+		return encounter_index(self.monsters).crs
+
 	def load_xp_levels(self) -> List[int]:
 		"""Load XP levels from file"""
 		try:
@@ -2526,9 +2527,10 @@ class DnDCursesUI:
 		if self.monsters:
 			try:
 				# Use new API: select_monsters_by_encounter_table returns (monsters, encounter_type)
-				monsters_result, encounter_type = generate_encounter(
+				# Same selection as select_monsters_by_encounter_table, served by the CR index
+				monsters_result, encounter_type = encounter_index(self.monsters).select_by_encounter_table(
+					ENCOUNTER_TABLE,
 					encounter_level=encounter_level,
-					available_monsters=self.monsters,
 					spell_casters_only=False,
 					allow_pairs=True
 				)
@@ -1,12 +1,16 @@
 """
 Persistence Module for DnD-5th-Edition-API
 Handles character and party save/load operations
+
+Files are written in the versioned save format of tools/save_format.py
+(historical raw pickle files are still read).
 """
 import os
-import pickle
 from typing import List, Optional
 from dnd_5e_core import Character
 
+from tools import save_format
+
 
 def get_roster(characters_dir: str = "characters") -> List[Character]:
     """
@@ -28,8 +32,7 @@ def get_roster(characters_dir: str = "characters") -> List[Character]:
     for entry in char_file_list:
         if entry.is_file() and entry.name.endswith(".dmp"):
             try:
-                with open(entry, "rb") as f1:
-                    roster.append(pickle.load(f1))
+                roster.append(save_format.load(entry.path))
             except Exception as e:
                 print(f"Error loading {entry.name}: {e}")
 
@@ -56,8 +59,7 @@ def save_character(char: Character, directory: str = "characters", _dir: str = N
             os.makedirs(save_dir)
 
         filename = os.path.join(save_dir, f"{char.name}.dmp")
-        with open(filename, "wb") as f:
-            pickle.dump(char, f)
+        save_format.dump(char, filename)
         return True
     except Exception as e:
         print(f"Error saving character {char.name}: {e}")
@@ -78,8 +80,7 @@ def load_character(name: str, directory: str = "characters") -> Optional[Charact
     try:
         filename = os.path.join(directory, f"{name}.dmp")
         if os.path.exists(filename):
-            with open(filename, "rb") as f:
-                return pickle.load(f)
+            return save_format.load(filename)
     except Exception as e:
         print(f"Error loading character {name}: {e}")
 
@@ -105,8 +106,7 @@ def save_party(party: List[Character], filename: str = "party.pkl", _dir: str =
         else:
             filepath = filename
 
-        with open(filepath, "wb") as f:
-            pickle.dump(party, f)
+        save_format.dump(party, filepath)
         return True
     except Exception as e:
         print(f"Error saving party: {e}")
@@ -132,8 +132,7 @@ def load_party(filename: str = "party.pkl", _dir: str = None) -> Optional[List[C
             filepath = filename
 
         if os.path.exists(filepath):
-            with open(filepath, "rb") as f:
-                return pickle.load(f)
+            return save_format.load(filepath)
     except Exception as e:
         print(f"Error loading party: {e}")
 
@@ -34,6 +34,7 @@ from dnd_5e_core.mechanics import DamageDice
 
 from populate_rpg_functions import load_armor_image_name, load_weapon_image_name
 from tools.common import parse_challenge_rating, resource_path
+from tools.data_repository import memoized, repository
 
 # Import dnd-5e-core for data loading
 try:
@@ -238,11 +239,9 @@ def _load_json_data(category: str, index_name: str):
     Helper function to load JSON data from local files.
     DEPRECATED: Most functions now use dnd-5e-core loaders directly.
     This is kept only for legacy functions that haven't been migrated yet.
+    Records come from the shared repository (each data/<category> is read once): do not mutate them.
     """
-    # Fallback: Load from local data directory
-    file_path = resource_path(f"data/{category}/{index_name}.json")
-    with open(file_path, "r") as f:
-        return json.loads(f.read())
+    return repository.get(category, index_name)
 
 
 def populate(collection_name: str, key_name: str, with_url=False, collection_path: str = None) -> List[str]:
@@ -284,6 +283,7 @@ def populate(collection_name: str, key_name: str, with_url=False, collection_pat
     return data_list
 
 
+@memoized('damage-types')
 def request_damage_type(index_name: str) -> DamageType:
     """
     Send a request to local database for a damage type's characteristic
@@ -294,6 +294,7 @@ def request_damage_type(index_name: str) -> DamageType:
     return DamageType(index=data['index'], name=data['name'], desc=data['desc'])
 
 
+@memoized('conditions')
 def request_condition(index_name: str) -> Condition:
     """
     Send a request to local database for a condition's characteristic
@@ -2175,6 +2176,7 @@ def request_armor(index_name: str) -> Armor:
     return core_load_armor(index_name)
 
 
+@memoized('weapon-properties')
 def request_weapon_property(index_name: str) -> WeaponProperty:
     """
     Send a request to local database for a weapon's property characteristic
@@ -2197,6 +2199,7 @@ def request_weapon(index_name: str) -> Weapon:
     return None
 
 
+@memoized('traits')
 def request_trait(index_name: str) -> Trait:
     """
     Send a request to local database for a trait's characteristic
@@ -2232,6 +2235,7 @@ def request_race(index_name: str) -> Race:
                 subraces=subraces)
 
 
+@memoized('subraces')
 def request_subrace(index_name: str) -> SubRace:
     """
     Send a request to local database for a subrace's characteristic
@@ -2251,6 +2255,7 @@ def request_subrace(index_name: str) -> SubRace:
                    racial_traits=racial_traits)
 
 
+@memoized('languages')
 def request_language(index_name: str) -> Language:
     """
     Send a request to local database for a language's characteristic
@@ -2266,6 +2271,7 @@ def request_language(index_name: str) -> Language:
                     script=data['script'])
 
 
+@memoized('proficiencies')
 def request_proficiency(index_name: str) -> Proficiency:
     """
     Send a request to local database for a proficiency's characteristic
@@ -2301,6 +2307,7 @@ def request_proficiency(index_name: str) -> Proficiency:
 
 
 
+@memoized('equipment-categories')
 def request_equipment_category(index_name: str) -> EquipmentCategory:
     """
     Send a request to local database for an equipment category's characteristic
@@ -2313,6 +2320,7 @@ def request_equipment_category(index_name: str) -> EquipmentCategory:
                              url=data['url'])
 
 
+@memoized('equipment-category-contents')
 def list_equipment_category(index_name: str) -> List[Equipment]:
     """
     Send a request to local database to list equipments inside an equipment category
@@ -2,7 +2,6 @@
 # Created by: philRG
 #
 import os
-import pickle
 import random
 import sys
 from functools import partial
@@ -28,7 +27,7 @@ from dnd_5e_core.equipment.magic_item import MagicItem
 print("✅ [MIGRATION v2] character_sheet.py - Using dnd-5e-core package")
 
 # Import from persistence module
-from persistence import get_roster
+from persistence import get_roster, load_character
 
 from pyQTApp.qt_designer_widgets.character_dialog import Ui_character_Dialog
 from pyQTApp.qt_common import populate_spell_table
@@ -336,9 +335,7 @@ if __name__ == "__main__":
     debug(f"{len(roster)} characters in roster! \n")
     char: Character = random.choice(roster)
     # char: Character = [c for c in roster if c.name == 'Brottor'][0]
-    with open(f"{characters_dir}/{char.name}.dmp", "rb") as f1:
-        # debug(f'f1: {f1.name}')
-        char: Character = pickle.load(f1)
+    char: Character = load_character(char.name, characters_dir)
 
     character_dialog = CharacterDialog(char)
     character_dialog.display_sheet()
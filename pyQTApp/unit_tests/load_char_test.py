@@ -1,12 +1,12 @@
 import os
-import pickle
 
 from dao_classes import Character
+from tools import save_format
 
 character_name: str = 'Ghesh. Heskan'
 
 path = os.path.dirname(__file__)
-with open(f'{path}/characters/{character_name}.dmp', 'rb') as f1:
-    character: Character = pickle.load(f1)
+# Save format of tools/save_format.py, or a raw pickle of an older save
+character: Character = save_format.load(f'{path}/characters/{character_name}.dmp')
 
 print(character)
\ No newline at end of file
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests des sessions de combat en mémoire de la démo Flask (flask_demo/combat_sessions.py)
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'flask_demo'))
+
+from combat_sessions import CombatEventLog, CombatSession, CombatSessionRegistry, latest_combat_state
+from storage import SQLiteStorage
+
+
+def _state() -> dict:
+    return {'round': 3,
+            'party': [{'name': 'Aragorn', 'level': 3, 'race': 'human', 'class': 'fighter', 'hp': 30, 'xp': 10, 'gold': 5}],
+            'monsters': [{'name': 'goblin', 'hp': 7}],
+            'active': True, 'messages': []}
+
+
+def test_registry_lru_and_ttl():
+    evicted = []
+    registry = CombatSessionRegistry(max_sessions=2, ttl=60, on_evict=lambda s: evicted.append(s.session_id))
+    for session_id in ('a', 'b'):
+        registry.put(CombatSession(session_id, [], []))
+    assert registry.get('a') is not None  # 'b' is now the least recently used
+    registry.put(CombatSession('c', [], []))
+    assert evicted == ['b'] and registry.get('b') is None
+    assert (registry.hits, registry.misses, registry.evictions) == (1, 1, 1)
+
+    registry.peek('a').last_used -= 61
+    assert registry.get('c') is not None
+    assert evicted == ['b', 'a'] and len(registry) == 1
+    assert registry.discard('c') is not None and evicted == ['b', 'a']
+
+
+def test_latency_percentile():
+    registry = CombatSessionRegistry()
+    assert registry.latency_percentile(95) is None
+    for ms in range(1, 101):
+        registry.record_turn(ms / 1000)
+    assert registry.latency_percentile(95) == 0.095 and registry.latency_percentile(50) == 0.05
+    assert registry.stats()['p95_ms'] == 95.0
+
+
+def test_event_log_is_bounded_and_read_incrementally():
+    log = CombatEventLog(maxlen=3, last_id=10)
+    for n in range(5):
+        log.append(f'message {n}', round_no=1)
+    events, truncated = log.since(0)
+    assert [e.id for e in events] == [13, 14, 15] and truncated
+    events, truncated = log.since(13)
+    assert [e.message for e in events] == ['message 3', 'message 4'] and not truncated
+    assert log.since(15) == ([], False)
+    assert events[0].to_dict() == {'id': 14, 'round': 1, 'message': 'message 3'}
+
+
+def test_event_log_wakes_up_waiting_readers():
+    log = CombatEventLog()
+    assert log.wait(0, timeout=0.01) == []
+    threading.Timer(0.05, log.append, ('hit', 2)).start()
+    assert [e.message for e in log.wait(0, timeout=5)] == ['hit']
+    threading.Timer(0.05, log.close).start()
+    assert log.wait(1, timeout=5) == [] and log.closed
+
+
+def test_live_session_keeps_its_objects():
+    session = CombatSession.from_state('s', _state())
+    hero, goblin = session.characters[0], session.monsters[0]
+    assert (hero.hit_points, hero.xp, goblin.hit_points, session.round) == (30, 10, 7, 3)
+    messages = session.play_round()
+    assert messages and session.round == 4
+    session.play_character_turn(0)
+    assert session.characters[0] is hero and session.monsters[0] is goblin and session.round == 5
+    # Every message is also an event, numbered after the ones of the saved state
+    events, _ = session.events.since(0)
+    assert events[0].id == 1 and events[0].message == messages[0] and events[0].round == 3
+
+    registry = CombatSessionRegistry()
+    registry.put(session)
+    registry.discard('s')
+    assert session.events.closed
+
+
+
+def _played_state(combat_session: CombatSession, state: dict) -> dict:
+    """combat_state after the turns played by combat_session (as the application serializes it)"""
+    return {**state, 'round': combat_session.round,
+            'party': [{**p, 'hp': c.hit_points} for p, c in zip(state['party'], combat_session.characters)],
+            'monsters': [{**m, 'hp': monster.hit_points} for m, monster in zip(state['monsters'], combat_session.monsters)]}
+
+
+def test_fight_is_resumed_mid_way_on_an_empty_registry():
+    state = {**_state(), 'id': 'fight-1'}
+    state['party'][0]['hp'] = 200  # survives the rounds played
+    live = CombatSession.from_state('s', state)
+    live.play_round()
+    live.play_round()
+    played = _played_state(live, state)
+    assert played['round'] == 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(Path(tmp) / 'test.db')
+        storage.save_session('s', [], state, 0)  # saved when the fight started
+        storage.save_combat_state('s', played)  # saved after each turn
+        # Another worker (empty registry) with a cookie of round 3
+        resumed = latest_combat_state(storage.load_session('s')['combat_state'], state)
+        rebuilt = CombatSessionRegistry().get('s') or CombatSession.from_state('s', resumed)
+    assert rebuilt.round == 5
+    assert [c.hit_points for c in rebuilt.characters] == [c.hit_points for c in live.characters]
+    assert [m.hit_points for m in rebuilt.monsters] == [m.hit_points for m in live.monsters]
+
+
+def test_latest_combat_state_keeps_the_state_ahead_of_the_save():
+    saved = {'id': 'a', 'round': 2}
+    assert latest_combat_state(saved, {'id': 'a', 'round': 4}, None) == {'id': 'a', 'round': 4}
+    assert latest_combat_state(saved, {'id': 'a', 'round': 1}) is saved
+    assert latest_combat_state(saved, {'id': 'b', 'round': 9}) is saved  # another fight
+    assert latest_combat_state(None, {'id': 'a', 'round': 4}) is None  # fight ended and saved
+
+
+if __name__ == '__main__':
+    test_registry_lru_and_ttl()
+    test_latency_percentile()
+    test_event_log_is_bounded_and_read_incrementally()
+    test_event_log_wakes_up_waiting_readers()
+    test_live_session_keeps_its_objects()
+    test_fight_is_resumed_mid_way_on_an_empty_registry()
+    test_latest_combat_state_keeps_the_state_ahead_of_the_save()
+    print("✅ Combat sessions OK")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests du simulateur de combats Monte Carlo (combat_simulator.py)
+"""
+
+import contextlib
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from combat_simulator import FightResult, SimulationJob, SimulationStats, _load_collections, build_character, simulate, sweep_jobs
+
+
+def test_stats_are_merged():
+    stats = SimulationStats()
+    stats.add(FightResult(victory=True, rounds=4, damage_dealt=20, damage_taken=5, deaths=0))
+    other = SimulationStats()
+    other.add(FightResult(victory=False, rounds=2, damage_dealt=3, damage_taken=12, deaths=1))
+    other.errors, other.error = 1, 'KeyError: 2'
+    stats.merge(other)
+    assert (stats.fights, stats.victories, stats.deaths, stats.errors) == (2, 1, 1, 1)
+    assert stats.win_rate == 0.5 and stats.mean_rounds == 3 and stats.mean_damage_taken == 8.5
+    assert stats.error == 'KeyError: 2'
+
+
+def test_sweep_jobs():
+    jobs = sweep_jobs(['fighter', 'wizard'], [1, 3], [2], party_size=2)
+    assert len(jobs) == 4
+    assert jobs[0] == SimulationJob(party=(('fighter', 1), ('fighter', 1)), encounter_level=2)
+    assert jobs[0].party_label == '2 x fighter 1'
+
+
+def test_results_do_not_depend_on_workers():
+    jobs = [SimulationJob(party=(('fighter', 2), ('cleric', 2)), encounter_level=1)]
+    local = simulate(jobs, fights=6, workers=1, seed=7, batch_size=3)
+    pooled = simulate(jobs, fights=6, workers=2, seed=7, batch_size=3)
+    assert local == pooled
+    stats = local[jobs[0]]
+    assert stats.fights == 6 and stats.errors == 0 and stats.rounds > 0
+
+
+def test_built_characters_are_equipped():
+    random.seed(5)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        db = _load_collections()
+        for class_index in ('fighter', 'cleric', 'rogue'):
+            char = build_character(class_index, 5, db)
+            assert char.level == 5 and char.weapon is not None and char.armor is not None, class_index
+            assert char.armor_class > 10
+
+
+def test_level_5_party_beats_encounter_level_1():
+    job = SimulationJob(party=(('fighter', 5), ('cleric', 5)), encounter_level=1)
+    stats = simulate([job], fights=20, workers=1, seed=3, batch_size=10)[job]
+    assert stats.errors == 0 and stats.win_rate >= 0.75, stats
+
+
+if __name__ == '__main__':
+    test_stats_are_merged()
+    test_sweep_jobs()
+    test_results_do_not_depend_on_workers()
+    test_built_characters_are_equipped()
+    test_level_5_party_beats_encounter_level_1()
+    print("✅ Combat simulator OK")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests de la compilation des niveaux donjon (tools/compile_dungeon.py)
+"""
+
+import contextlib
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import cell_bits_dnd as cb
+from tools import compile_dungeon as cd
+from tools.parse_json_dungeon import parse_dungeon_json
+
+MAZE = 'The Chambers of Profane Ruin 01.json'
+
+
+@contextlib.contextmanager
+def _cache_dir():
+    """Compiled dungeons cached in a temporary directory, in-process cache emptied"""
+    cache_dir, loaded = cd.CACHE_DIR, dict(cd._loaded)
+    with tempfile.TemporaryDirectory() as tmp:
+        cd.CACHE_DIR = tmp
+        cd._loaded.clear()
+        try:
+            yield tmp
+        finally:
+            cd.CACHE_DIR = cache_dir
+            cd._loaded.clear()
+            cd._loaded.update(loaded)
+
+
+def test_open_space_round_trip():
+    cells = [[cb.OPENSPACE if (x + y) % 3 else cb.BLOCKED for x in range(11)] for y in range(3)]
+    dungeon = {'width': 11, 'height': 3, 'open_space': cd.pack_open_space(cells)}
+    assert len(dungeon['open_space']) == 2 * 3
+    assert cd.unpack_open_space(dungeon) == [['.' if cell & cb.OPENSPACE else '#' for cell in row] for row in cells]
+
+
+def test_compiled_maze_matches_the_json():
+    source = parse_dungeon_json(MAZE)
+    dungeon = cd.compile_dungeon(MAZE)
+    cells = source['cells']
+    assert (dungeon['height'], dungeon['width']) == (len(cells), len(cells[0]))
+    assert cd.unpack_open_space(dungeon) == [['.' if cell & cb.OPENSPACE else '#' for cell in row] for row in cells]
+    x, y = dungeon['stair_down']
+    assert cells[y][x] & cb.STAIR_DN
+    assert dungeon['doors'] and all(cells[y][x] & cb.DOORSPACE for x, y in dungeon['doors'])
+    assert len(dungeon['rooms']) == len([room for room in source['rooms'] if room])
+
+
+def test_cache_is_used_until_the_source_changes():
+    stat = os.stat(os.path.join(cd.MAZE_DIR, MAZE))
+    with _cache_dir():
+        compiled = cd.load_compiled_dungeon(MAZE)
+        cache_file = cd._cache_filename(MAZE)
+        assert os.path.exists(cache_file)
+        assert cd.load_compiled_dungeon(MAZE) is compiled
+
+        # Up to date cache file: used as is
+        cd._loaded.clear()
+        cd._write_cache(cache_file, stat.st_mtime_ns, stat.st_size, {'cached': True})
+        assert cd.load_compiled_dungeon(MAZE) == {'cached': True}
+
+        # Stale (other source mtime or size, other compiler version) or corrupt: compiled again
+        for mtime, size in ((stat.st_mtime_ns - 1, stat.st_size), (stat.st_mtime_ns, stat.st_size + 1)):
+            cd._loaded.clear()
+            cd._write_cache(cache_file, mtime, size, {'cached': True})
+            assert cd.load_compiled_dungeon(MAZE) == compiled
+        cd._loaded.clear()
+        with open(cache_file, 'r+b') as f:
+            f.write(cd.HEADER.pack(cd.MAGIC, cd.COMPILER_VERSION + 1, stat.st_mtime_ns, stat.st_size))
+        assert cd.load_compiled_dungeon(MAZE) == compiled
+        cd._loaded.clear()
+        with open(cache_file, 'wb') as f:
+            f.write(b'DNJC')
+        assert cd.load_compiled_dungeon(MAZE) == compiled
+        assert cd.load_compiled_dungeon('missing.json') is None
+
+
+if __name__ == '__main__':
+    test_open_space_round_trip()
+    test_compiled_maze_matches_the_json()
+    test_cache_is_used_until_the_source_changes()
+    print("✅ Compiled dungeons OK")
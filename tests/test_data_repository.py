@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests du dépôt mémoïsé des données de jeu (tools/data_repository.py)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.data_repository import DataRepository
+
+
+def make_data_dir() -> str:
+    data_dir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(data_dir, 'traits'))
+    for index in ('darkvision', 'brave'):
+        with open(os.path.join(data_dir, 'traits', f'{index}.json'), 'w') as f:
+            json.dump({'index': index, 'name': index.title(), 'desc': []}, f)
+    return data_dir
+
+
+def test_category_is_read_once():
+    repo = DataRepository(make_data_dir())
+    assert repo.get('traits', 'brave')['name'] == 'Brave'
+    assert repo.get('traits', 'darkvision')['name'] == 'Darkvision'
+    assert repo.category_loads == 1
+    try:
+        repo.get('traits', 'unknown')
+        assert False, 'missing record must raise FileNotFoundError'
+    except FileNotFoundError:
+        pass
+
+
+def test_identity_map():
+    repo = DataRepository(make_data_dir())
+    calls = []
+
+    def builder():
+        calls.append(1)
+        return dict(repo.get('traits', 'brave'))
+
+    first = repo.build('trait', 'brave', builder)
+    assert repo.build('trait', 'brave', builder) is first
+    assert len(calls) == 1
+
+
+def test_concurrent_builds_share_one_object():
+    repo = DataRepository(make_data_dir())
+    barrier = threading.Barrier(4)
+    results = []
+
+    def builder():
+        barrier.wait(5)  # every thread missed the identity map before any stores its object
+        return dict(repo.get('traits', 'brave'))
+
+    threads = [threading.Thread(target=lambda: results.append(repo.build('trait', 'brave', builder))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 4 and all(result is results[0] for result in results)
+    assert repo.build('trait', 'brave', builder) is results[0]
+
+
+def test_packed_index_is_used_while_up_to_date():
+    data_dir = make_data_dir()
+    DataRepository(data_dir).pack(['traits'])
+    repo = DataRepository(data_dir)
+    assert repo.get('traits', 'brave')['name'] == 'Brave'
+    # Un nouveau fichier invalide l'index packé de la catégorie
+    with open(os.path.join(data_dir, 'traits', 'lucky.json'), 'w') as f:
+        json.dump({'index': 'lucky', 'name': 'Lucky', 'desc': []}, f)
+    assert DataRepository(data_dir).get('traits', 'lucky')['name'] == 'Lucky'
+
+
+if __name__ == '__main__':
+    test_category_is_read_once()
+    test_identity_map()
+    test_concurrent_builds_share_one_object()
+    test_packed_index_is_used_while_up_to_date()
+    print("✅ DataRepository OK")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests de la carte des distances vers le héros (algo/distance_map.py)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algo.distance_map import DistanceMap, UNREACHABLE
+from algo.occupancy import OccupancyGrid
+from algo.pathfinding import PathFinder
+
+WORLD_MAP = [
+    list('#########'),
+    list('#.......#'),
+    list('#.#####.#'),
+    list('#.#...#.#'),
+    list('#...#...#'),
+    list('#########'),
+]
+HERO = (5, 3)
+
+
+def test_distances_match_a_star():
+    grid = OccupancyGrid(WORLD_MAP, doors={})
+    dmap, finder = DistanceMap(grid), PathFinder(grid)
+    dmap.update(HERO)
+    for pos in grid.walkable:
+        assert dmap.distance(pos) == len(finder.find_path(pos, HERO)) - 1
+    assert dmap.distance((0, 0)) == UNREACHABLE
+
+
+def test_rebuilt_only_when_target_or_doors_change():
+    grid = OccupancyGrid(WORLD_MAP, doors={(7, 2): True})
+    dmap = DistanceMap(grid)
+    assert dmap.update(HERO)
+    assert not dmap.update(HERO)
+    grid.set_door((7, 2), False)
+    assert dmap.update(HERO)
+    assert dmap.update((1, 1))
+    assert dmap.builds == 3
+
+
+def test_descend_stops_next_to_target_and_avoids_monsters():
+    grid = OccupancyGrid(WORLD_MAP, doors={})
+    dmap = DistanceMap(grid)
+    dmap.update(HERO)
+    steps = dmap.descend((7, 1), 10)
+    assert steps[-1] != HERO and dmap.distance(steps[-1]) == 1
+    assert dmap.descend((7, 1), 2) == steps[:2]
+    grid.add_occupant((7, 2))
+    assert dmap.descend((7, 1), 2) == []
+
+
+if __name__ == '__main__':
+    test_distances_match_a_star()
+    test_rebuilt_only_when_target_or_doors_change()
+    test_descend_stops_next_to_target_and_avoids_monsters()
+    print("✅ DistanceMap OK")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests du mode sans affichage de dungeon_pygame (dungeon_headless.py)
+"""
+
+import contextlib
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import dungeon_headless
+from dungeon_headless import ExplorerPolicy, Game, play
+
+
+def _new_game(seed: int) -> Game:
+    from main import generate_random_character, load_character_collections
+    random.seed(seed)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        races, subraces, classes, alignments, equipments, proficiencies, names, human_names, spells = load_character_collections()
+        char = generate_random_character([], races, subraces, classes, names, human_names, spells)
+        char.hit_points = char.max_hit_points = 10_000
+        return Game(hero=char)
+
+
+def test_explorer_walks_the_level_without_display():
+    game = _new_game(seed=2)
+    start = game.pos
+    policy = ExplorerPolicy()
+    headless = dungeon_headless.dp.headless
+    run = play(game, policy=policy, max_turns=150)
+    assert run.outcome in ('timeout', 'completed', 'stuck'), run
+    assert run.error == ''
+    assert dungeon_headless.dp.headless == headless
+    assert run.turns > 0 and policy.searches > 0
+    assert game.pos != start or game.dungeon_level > 1
+    assert sum(policy.seen) > 0
+    # Nothing drawn
+    assert pygame.display.get_surface() is None
+
+
+def test_summary():
+    runs = [dungeon_headless.HeadlessRun(outcome='dead', turns=10, elapsed=0.5),
+            dungeon_headless.HeadlessRun(outcome='timeout', turns=30, dungeon_level=3, kills=4, elapsed=0.5)]
+    report = dungeon_headless.summary(runs)
+    assert '2 runs (dead: 1, timeout: 1)' in report and '120 runs/min, 40 turns/s' in report
+    assert 'mean dungeon level 2.0 (max 3)' in report
+
+
+if __name__ == '__main__':
+    test_explorer_walks_the_level_without_display()
+    test_summary()
+    print("✅ Headless dungeon OK")
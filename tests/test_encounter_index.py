@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests de l'index des rencontres par CR (tools/encounter_index.py)
+"""
+
+import os
+import sys
+from fractions import Fraction
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.encounter_index import EncounterIndex, encounter_index
+
+
+def monster(name, cr, caster=False):
+    return SimpleNamespace(name=name, challenge_rating=cr, is_spell_caster=caster)
+
+
+MONSTERS = [monster('rat', 0.125), monster('goblin', 0.25), monster('kobold', 0.125), None,
+            monster('orc', 0.5), monster('mage', 6, caster=True), monster('troll', 5), monster('lich', 21, caster=True)]
+ENCOUNTER_TABLE = {1: [(Fraction(1, 4), Fraction(1, 8)), {'1': [Fraction(1, 2)], '2-3': [Fraction(1, 8)]}]}
+
+
+def test_monsters_by_cr():
+    index = EncounterIndex(MONSTERS)
+    assert index.crs == [Fraction(1, 8), Fraction(1, 4), Fraction(1, 2), 5, 6, 21]
+    assert [m.name for m in index.monsters_with_cr(Fraction(1, 8))] == ['rat', 'kobold']
+    assert [m.name for m in index.monsters_with_cr(0.125)] == ['rat', 'kobold']
+    assert [m.name for m in index.monsters_with_cr(6, spell_casters_only=True)] == ['mage']
+    assert index.monsters_with_cr(5, spell_casters_only=True) == []
+    assert [m.name for m in index.monsters_from_cr(5)] == ['troll', 'mage', 'lich']
+
+
+def test_nearest_cr():
+    index = EncounterIndex(MONSTERS)
+    assert index.nearest_cr(Fraction(1, 4)) == Fraction(1, 4)
+    assert index.nearest_cr(2) == Fraction(1, 2)
+    assert index.nearest_cr(Fraction(11, 2)) == 5  # égalité: le plus faible
+    assert index.nearest_cr(30) == 21
+    assert index.nearest_cr(0) == Fraction(1, 8)
+    assert EncounterIndex([]).nearest_cr(3) is None
+
+
+def test_select_by_encounter_table():
+    index = EncounterIndex(MONSTERS)
+    for _ in range(50):
+        monsters, kind = index.select_by_encounter_table(ENCOUNTER_TABLE, encounter_level=1)
+        if kind == 'pair':
+            assert [m.name for m in monsters][0] == 'goblin' and monsters[1].name in ('rat', 'kobold')
+        else:
+            assert len(monsters) in (1, 2, 3) and len({m.name for m in monsters}) == 1
+
+
+def test_index_is_shared_per_collection():
+    assert encounter_index(MONSTERS) is encounter_index(MONSTERS)
+    assert encounter_index(list(MONSTERS)) is not encounter_index(MONSTERS)
+
+
+if __name__ == '__main__':
+    test_monsters_by_cr()
+    test_nearest_cr()
+    test_select_by_encounter_table()
+    test_index_is_shared_per_collection()
+    print("✅ EncounterIndex OK")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests des catalogues précalculés de la démo Flask (flask_demo/catalogs.py)
+"""
+
+import gzip
+import json
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'flask_demo'))
+sys.path.insert(0, ROOT_DIR)
+
+from dnd_5e_core import load_monster
+
+from catalogs import Catalog, monsters_catalog, shop_catalog
+
+
+def test_queries_are_filtered_paginated_and_cached():
+    catalog = monsters_catalog([load_monster(name) for name in ('goblin', 'orc', 'ogre', 'adult-red-dragon')] + ['kobold'])
+    assert [e['index'] for e in catalog.entries] == ['kobold', 'goblin', 'orc', 'ogre', 'adult-red-dragon']
+    assert json.loads(gzip.decompress(catalog.full.gzipped)) == json.loads(catalog.full.body)
+    assert catalog.query({}) is catalog.full and catalog.query({'unknown': '1'}) is catalog.full
+
+    page = catalog.query({'cr_max': '1/2', 'type': 'HUMANOID', 'per_page': '1'})
+    assert json.loads(page.body) == {'monsters': [catalog.entries[0]], 'total': 3, 'page': 1, 'per_page': 1}
+    assert catalog.query({'per_page': '1', 'type': 'HUMANOID', 'cr_max': '1/2'}) is page
+    assert catalog.query({'type': 'humanoid', 'cr_max': '0.5', 'per_page': '1'}).etag == page.etag
+    assert catalog.query({'per_page': '1', 'type': 'humanoid', 'cr_max': '0.5', 'page': '2'}).etag != page.etag
+    assert json.loads(catalog.query({'cr': '2'}).body)['total'] == 1
+
+    for args in ({'page': '0'}, {'per_page': '100000'}, {'cr_min': 'high'}):
+        try:
+            catalog.query(args)
+            assert False, args
+        except ValueError:
+            pass
+
+
+def test_catalog_of_strings():
+    catalog = Catalog('races', ['elf', 'dwarf'])
+    assert json.loads(catalog.full.body) == {'races': ['elf', 'dwarf'], 'total': 2}
+    assert catalog.full.etag == Catalog('races', ['elf', 'dwarf']).full.etag
+
+
+def test_shop_catalog():
+    catalog = shop_catalog()
+    weapons = catalog.category('weapon')
+    assert weapons and weapons == sorted(weapons, key=lambda e: e['name'])
+    dagger = catalog.entry('weapon', 'dagger')
+    assert dagger['price'] == 2 and dagger['damage_dice'] == '1d4'
+    assert catalog.item('weapon', 'dagger').name == 'Dagger'
+    assert catalog.entry('magic', 'potion-of-healing')['type'] == 'HealingPotion'
+    cheap = json.loads(catalog.query({'category': 'weapon', 'price_max': '2'}).body)['items']
+    assert cheap and all(e['price'] <= 2 and e['category'] == 'weapon' for e in cheap)
+
+
+if __name__ == '__main__':
+    test_queries_are_filtered_paginated_and_cached()
+    test_catalog_of_strings()
+    test_shop_catalog()
+    print("✅ Flask catalogs OK")
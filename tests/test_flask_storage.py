@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests du stockage des sessions et du roster de la démo Flask (flask_demo/storage.py)
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'flask_demo'))
+
+from storage import PickleStorage, SQLiteStorage, open_storage
+
+
+def _character(name: str, hp: int = 20, **fields) -> dict:
+    return {'name': name, 'level': 3, 'race': 'Human', 'class': 'Fighter', 'hp': hp, 'max_hp': 20, 'xp': 0, 'gold': 10,
+            'inventory': [{'name': 'Dague', 'type': 'Weapon'}], **fields}
+
+
+def test_sqlite_session_writes_only_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(Path(tmp) / 'test.db')
+        party = [_character('Conan'), _character('Merlin')]
+        storage.save_session('s1', party, {'round': 1, 'active': True}, 50)
+        assert storage.rows_written == 3
+        assert storage.load_session('s1') == {'party': party, 'combat_state': {'round': 1, 'active': True}, 'party_gold': 50}
+
+        storage.save_session('s1', party, {'round': 1, 'active': True}, 50)
+        assert storage.rows_written == 3  # nothing changed
+
+        party[1]['hp'], party[1]['status'] = 0, 'DEAD'
+        storage.save_session('s1', party[::-1][:1] + party[:1], None, 50)
+        assert storage.rows_written == 6
+        loaded = storage.load_session('s1')
+        assert [p['name'] for p in loaded['party']] == ['Merlin', 'Conan'] and loaded['party'][0]['status'] == 'DEAD'
+
+        storage.save_session('s1', party[:1], None, 50)
+        assert len(storage.load_session('s1')['party']) == 1
+        storage.save_combat_state('s1', {'round': 4})
+        assert storage.load_session('s1')['combat_state'] == {'round': 4} and storage.load_session('s2') is None
+
+
+def test_sqlite_roster():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(Path(tmp) / 'test.db')
+        storage.save_characters([_character('Zed'), _character('Alia', status='DEAD')])
+        assert [c['name'] for c in storage.roster()] == ['Alia', 'Zed']
+        assert [c['name'] for c in storage.roster(status='DEAD')] == ['Alia']
+
+        written = storage.rows_written
+        storage.save_characters([_character('Zed', hp=5)])
+        assert storage.rows_written == written + 1 and storage.get_character('Zed')['hp'] == 5
+        assert storage.delete_character('Zed') and not storage.delete_character('Zed')
+        assert storage.get_character('Zed') is None
+
+
+def test_sqlite_imports_pickle_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = open_storage('pickle', tmp)
+        assert isinstance(legacy, PickleStorage)
+        legacy.save_characters([_character('Conan')])
+        legacy.save_session('s1', [_character('Conan')], None, 7)
+        storage = open_storage('sqlite', tmp)
+        assert storage.get_character('Conan') == legacy.get_character('Conan')
+        assert storage.load_session('s1') == legacy.load_session('s1')
+
+
+if __name__ == '__main__':
+    test_sqlite_session_writes_only_changes()
+    test_sqlite_roster()
+    test_sqlite_imports_pickle_files()
+    print("✅ Flask storage OK")
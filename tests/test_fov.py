@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests du champ de vision par ombrage récursif (algo/fov.py)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algo.fov import FieldOfView, compute_fov
+from algo.occupancy import OccupancyGrid
+
+WORLD_MAP = [
+    list('###########'),
+    list('#.........#'),
+    list('#.........#'),
+    list('#####.#####'),
+    list('#.........#'),
+    list('###########'),
+]
+DOOR = (5, 3)
+
+
+def test_open_room_is_fully_visible():
+    grid = OccupancyGrid(WORLD_MAP, doors={DOOR: True})
+    visible = compute_fov(grid.is_blocked, grid.in_bounds, 5, 1, 20)
+    room = {(x, y) for x in range(1, 10) for y in (1, 2)}
+    assert room <= visible
+    # Les murs qui bordent la pièce sont éclairés
+    assert (0, 1) in visible and (5, 0) in visible
+
+
+def test_walls_and_doors_block_sight():
+    grid = OccupancyGrid(WORLD_MAP, doors={DOOR: False})
+    visible = compute_fov(grid.is_blocked, grid.in_bounds, 5, 1, 20)
+    assert DOOR in visible
+    assert (5, 4) not in visible
+    grid.set_door(DOOR, True)
+    visible = compute_fov(grid.is_blocked, grid.in_bounds, 5, 1, 20)
+    assert (5, 4) in visible
+    assert (1, 4) not in visible
+
+
+def test_radius():
+    grid = OccupancyGrid(WORLD_MAP, doors={})
+    visible = compute_fov(grid.is_blocked, grid.in_bounds, 1, 1, 3)
+    assert (4, 1) in visible and (5, 1) not in visible
+
+
+def test_cache_is_keyed_on_door_state():
+    grid = OccupancyGrid(WORLD_MAP, doors={DOOR: False})
+    fov = FieldOfView(grid)
+    first = fov.visible_from((5, 1), 10)
+    assert fov.visible_from((5, 1), 10) is first
+    grid.set_door(DOOR, True)
+    assert (5, 4) in fov.visible_from((5, 1), 10)
+
+
+if __name__ == '__main__':
+    test_open_room_is_fully_visible()
+    test_walls_and_doors_block_sight()
+    test_radius()
+    test_cache_is_keyed_on_door_state()
+    print("✅ FieldOfView OK")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests des collections chargées à la demande (tools/lazy_collection.py)
+"""
+
+import contextlib
+import copy
+import io
+import os
+import pickle
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.lazy_collection import LazyCollection, warm_up
+
+
+def test_entries_are_built_on_first_access():
+    calls = []
+
+    def loader(name):
+        calls.append(name)
+        return name.upper()
+
+    collection = LazyCollection(['orc', 'goblin', 'kobold'], loader)
+    assert len(collection) == 3 and calls == []
+    assert collection[1] == 'GOBLIN' and collection[-1] == 'KOBOLD'
+    assert calls == ['goblin', 'kobold']
+    assert list(collection) == ['ORC', 'GOBLIN', 'KOBOLD']
+    assert collection[:2] == ['ORC', 'GOBLIN']
+    assert calls == ['goblin', 'kobold', 'orc']
+
+
+def test_skip_missing():
+    collection = LazyCollection(['a', 'b', 'c'], lambda name: None if name == 'b' else name, skip_missing=True)
+    assert list(collection) == ['a', 'c']
+    assert len(collection) == 2 and collection[1] == 'c'
+    assert 'b' not in collection
+
+
+def test_warm_up_and_pickle():
+    collection = LazyCollection([str(i) for i in range(50)], int)
+    for thread in warm_up(collection, workers=3):
+        thread.join()
+    assert collection.loaded_count == 50
+    assert pickle.loads(pickle.dumps(collection)) == list(range(50))
+    assert copy.copy(collection) == list(range(50))
+
+
+def test_bool_and_warm_up_errors_build_nothing_in_the_caller():
+    def loader(name):
+        if name == 'broken':
+            raise KeyError(name)
+        return name
+
+    collection = LazyCollection(['ok', 'broken'], loader, skip_missing=True)
+    assert collection and collection.loaded_count == 0
+    assert not LazyCollection([], loader)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        for thread in warm_up(collection, workers=2):
+            thread.join()
+    assert output.getvalue() == ''
+    assert collection.errors == {'broken': "KeyError: 'broken'"} and collection.loaded_count == 1
+
+
+if __name__ == '__main__':
+    test_entries_are_built_on_first_access()
+    test_skip_missing()
+    test_warm_up_and_pickle()
+    test_bool_and_warm_up_errors_build_nothing_in_the_caller()
+    print("✅ LazyCollection OK")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests de la préparation du niveau suivant en tâche de fond (dungeon_pygame.LevelPrefetcher)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import dungeon_pygame
+from dungeon_pygame import Level, LevelPrefetcher
+
+
+class FakePrefetcher(LevelPrefetcher):
+    """Levels are (level_no, thread name) tuples; builds of the levels in `failing` raise off the main thread"""
+
+    def __init__(self, failing=(), gate: threading.Event = None):
+        super().__init__()
+        self.failing = set(failing)
+        self.gate = gate
+        self.started = threading.Event()  # a build began on the worker
+        self.builds = []
+
+    def build_level(self, level_no: int):
+        if threading.current_thread() is not threading.main_thread():
+            self.started.set()
+            if self.gate is not None:
+                self.gate.wait(5)
+        thread = threading.current_thread().name
+        self.builds.append((level_no, thread))
+        if level_no in self.failing and thread != threading.main_thread().name:
+            raise RuntimeError(f'level {level_no}')
+        return (level_no, thread), 1.0
+
+
+def test_prefetched_level_is_handed_over():
+    prefetcher = FakePrefetcher()
+    prefetcher.prefetch(2)
+    prefetcher.prefetch(2)  # already prefetched: ignored
+    prefetcher.prefetch(dungeon_pygame.MAX_LEVELS + 1)  # no such level
+    level_no, thread = prefetcher.take(2)
+    assert level_no == 2 and thread.startswith('level-prefetch')
+    assert len(prefetcher.builds) == 1
+    assert prefetcher.transitions[-1]['prefetched'] and prefetcher.transitions[-1]['level_no'] == 2
+
+
+def test_missing_level_is_built_synchronously():
+    prefetcher = FakePrefetcher()
+    assert prefetcher.take(3) == (3, threading.current_thread().name)
+    assert not prefetcher.transitions[-1]['prefetched']
+
+
+def test_discard_cancels_pending_builds():
+    gate = threading.Event()
+    prefetcher = FakePrefetcher(gate=gate)
+    prefetcher.prefetch(2)  # running, waiting for the gate
+    prefetcher.prefetch(3)  # queued behind it
+    assert prefetcher.started.wait(5)
+    prefetcher.discard()
+    gate.set()
+    assert prefetcher.take(3) == (3, threading.current_thread().name)
+    assert not prefetcher.transitions[-1]['prefetched']
+    prefetcher._executor.shutdown(wait=True)
+    assert [level_no for level_no, _ in prefetcher.builds].count(3) == 1
+
+
+def test_failed_prefetch_falls_back_to_a_synchronous_build():
+    prefetcher = FakePrefetcher(failing={4})
+    prefetcher.prefetch(4)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        level = prefetcher.take(4)
+    assert level == (4, threading.current_thread().name)
+    assert 'Level 4 prefetch failed' in output.getvalue()
+    assert not prefetcher.transitions[-1]['prefetched'] and len(prefetcher.builds) == 2
+
+
+def test_real_level_is_built_off_the_main_thread():
+    prefetcher = LevelPrefetcher()
+    with contextlib.redirect_stdout(io.StringIO()):
+        prefetcher.prefetch(2)
+        level = prefetcher.take(2)
+    assert isinstance(level, Level) and level.map_width > 0
+    assert prefetcher.transitions[-1]['prefetched'] and prefetcher.transitions[-1]['build_ms'] > 0
+
+
+if __name__ == '__main__':
+    test_prefetched_level_is_handed_over()
+    test_missing_level_is_built_synchronously()
+    test_discard_cancels_pending_builds()
+    test_failed_prefetch_falls_back_to_a_synchronous_build()
+    test_real_level_is_built_off_the_main_thread()
+    print("✅ LevelPrefetcher OK")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests de la grille d'occupation (algo/occupancy.py)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algo.occupancy import OccupancyGrid
+
+WORLD_MAP = [
+    list('#####'),
+    list('#..>#'),
+    list('#.#.#'),
+    list('#<..#'),
+    list('#####'),
+]
+
+
+def test_initial_sets_match_map():
+    grid = OccupancyGrid(WORLD_MAP, doors={(3, 2): False})
+    assert (0, 0) in grid.obstacles
+    assert (3, 2) in grid.obstacles
+    assert (3, 2) not in grid.walkable
+    assert {(1, 1), (2, 1), (3, 1), (1, 2), (1, 3), (2, 3), (3, 3)} == grid.walkable
+
+
+def test_set_door_updates_views_incrementally():
+    grid = OccupancyGrid(WORLD_MAP, doors={(3, 2): False})
+    carte = grid.carte()
+    assert carte[2][3] == 0
+    assert grid.set_door((3, 2), True)
+    assert not grid.set_door((3, 2), True)
+    assert (3, 2) in grid.walkable and (3, 2) not in grid.obstacles
+    assert grid.carte()[2][3] == 1
+    assert grid.door_version == 1
+
+
+def test_occupants():
+    grid = OccupancyGrid(WORLD_MAP, doors={}, occupants=[(1, 1)])
+    assert not grid.is_free(1, 1)
+    assert not grid.is_blocked(1, 1)
+    grid.move_occupant((1, 1), (2, 1))
+    assert grid.is_free(1, 1) and not grid.is_free(2, 1)
+    grid.add_occupant((2, 1))
+    grid.remove_occupant((2, 1))
+    assert grid.is_occupied(2, 1)
+    grid.remove_occupant((2, 1))
+    assert grid.is_free(2, 1)
+    assert not grid.is_free(-1, 0)
+
+
+if __name__ == '__main__':
+    test_initial_sets_match_map()
+    test_set_door_updates_views_incrementally()
+    test_occupants()
+    print("✅ OccupancyGrid OK")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests de la recherche de chemin A* (algo/pathfinding.py)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algo.lee import parcours_a_star
+from algo.occupancy import OccupancyGrid
+from algo.pathfinding import PathFinder
+
+WORLD_MAP = [
+    list('#########'),
+    list('#.......#'),
+    list('#.#####.#'),
+    list('#.#...#.#'),
+    list('#...#...#'),
+    list('#########'),
+]
+
+
+def test_same_length_as_lee_a_star():
+    grid = OccupancyGrid(WORLD_MAP, doors={})
+    finder = PathFinder(grid)
+    for start, end in [((1, 1), (5, 3)), ((7, 1), (1, 4)), ((3, 3), (7, 4))]:
+        path = finder.find_path(start, end)
+        dist, _ = parcours_a_star(grid.carte(), *start, *end)
+        assert len(path) - 1 == dist
+        assert path[0] == start and path[-1] == end
+        assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+
+
+def test_buffers_are_reused_between_searches():
+    finder = PathFinder(OccupancyGrid(WORLD_MAP, doors={}))
+    finder.find_path((1, 1), (7, 4))
+    closed = finder._closed
+    assert finder.find_path((7, 4), (1, 1))[-1] == (1, 1)
+    assert finder._closed is closed and finder.generation == 2
+
+
+def test_blockers_doors_and_occupants():
+    grid = OccupancyGrid(WORLD_MAP, doors={(7, 2): False})
+    finder = PathFinder(grid)
+    # Seul passage restant : par la gauche
+    assert (1, 2) in finder.find_path((1, 1), (7, 4))
+    assert finder.find_path((1, 1), (7, 4), blockers={(1, 3)}) == []
+    grid.set_door((7, 2), True)
+    assert finder.find_path((1, 1), (7, 4), blockers={(1, 3)})
+    grid.add_occupant((7, 2))
+    assert (7, 2) not in finder.find_path((7, 1), (7, 4), avoid_occupied=True)
+    # La case d'arrivée reste atteignable même si elle est occupée
+    assert finder.find_path((7, 1), (7, 2), avoid_occupied=True) == [(7, 1), (7, 2)]
+
+
+def test_partial_paths():
+    finder = PathFinder(OccupancyGrid(WORLD_MAP, doors={}))
+    assert finder.find_path((1, 1), (7, 4), max_steps=2) == finder.find_path((1, 1), (7, 4))[:3]
+    partial = finder.find_path((1, 1), (7, 4), max_expansions=3)
+    assert partial and partial[0] == (1, 1) and partial[-1] != (7, 4)
+
+
+if __name__ == '__main__':
+    test_same_length_as_lee_a_star()
+    test_buffers_are_reused_between_searches()
+    test_blockers_doors_and_occupants()
+    test_partial_paths()
+    print("✅ PathFinder OK")
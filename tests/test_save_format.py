@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests du format de sauvegarde versionné (tools/save_format.py)
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dnd_5e_core.data.loaders import simple_character_generator
+
+import persistence
+from tools import save_format
+
+
+def _character(name: str = 'Elminster'):
+    return simple_character_generator(level=5, race_name='elf', class_name='wizard', name=name)
+
+
+def test_static_data_is_saved_by_reference():
+    char = _character()
+    spell = char.sc.learned_spells[0]
+    char.armor.equipped = True
+
+    data = save_format.dumps(char)
+    assert data.startswith(save_format.MAGIC)
+    assert len(data) * 3 < len(pickle.dumps(char, protocol=pickle.HIGHEST_PROTOCOL))
+    loaded = save_format.loads(data)
+    assert loaded == char and loaded is not char
+    assert loaded.sc.learned_spells[0] == spell and loaded.sc.learned_spells[0] is not spell
+    # Fields changed since the data files are kept
+    assert loaded.armor.equipped and loaded.armor.index == char.armor.index
+
+
+def test_persistence_reads_raw_pickle_and_converts_it():
+    char = _character('Mordenkainen')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f'{char.name}.dmp')
+        with open(path, 'wb') as f:
+            pickle.dump(char, f)
+        assert save_format.schema_version(path) == 0
+        assert [c.name for c in persistence.get_roster(tmp)] == [char.name]
+
+        assert persistence.save_character(persistence.load_character(char.name, tmp), tmp)
+        assert save_format.schema_version(path) == save_format.SAVE_VERSION
+        assert persistence.load_character(char.name, tmp) == char
+        assert os.listdir(tmp) == [f'{char.name}.dmp']
+
+        assert persistence.save_party([char], _dir=tmp) and persistence.load_party(_dir=tmp) == [char]
+
+
+def test_migrations_upgrade_older_saves():
+    data = save_format.dumps({'name': 'Tasha', 'hp': 12})
+    version = save_format.SAVE_VERSION
+    save_format.MIGRATIONS[version] = lambda state: {**state, 'max_hp': state['hp']}
+    save_format.SAVE_VERSION = version + 1
+    try:
+        assert save_format.loads(data) == {'name': 'Tasha', 'hp': 12, 'max_hp': 12}
+        assert save_format.loads(save_format.dumps({'hp': 3})) == {'hp': 3}
+    finally:
+        save_format.SAVE_VERSION = version
+        del save_format.MIGRATIONS[version]
+    try:
+        save_format.loads(data.replace(save_format.HEADER.pack(save_format.MAGIC, version, 0)[:6],
+                                       save_format.HEADER.pack(save_format.MAGIC, version + 1, 0)[:6], 1))
+        assert False, 'newer schema version'
+    except pickle.UnpicklingError:
+        pass
+
+
+if __name__ == '__main__':
+    test_static_data_is_saved_by_reference()
+    test_persistence_reads_raw_pickle_and_converts_it()
+    test_migrations_upgrade_older_saves()
+    print("✅ Save format OK")
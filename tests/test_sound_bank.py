@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests de la banque d'effets sonores (tools/sound_bank.py)
+"""
+
+import os
+import sys
+import tempfile
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Dummy audio driver: the mixer works without an audio device
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+import pygame
+
+from tools import sound_bank
+from tools.sound_bank import SoundBank
+
+
+def _save_wav(path: str, frames: int = 4410):
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(44100)
+        f.writeframes(b'\x00\x01' * frames)
+
+
+def test_sounds_are_preloaded_and_rate_limited():
+    with tempfile.TemporaryDirectory() as tmp:
+        _save_wav(os.path.join(tmp, 'walk.wav'))
+        _save_wav(os.path.join(tmp, 'door.wav'))
+        bank = SoundBank(tmp, channels=2, min_interval=10)
+        assert bank.enabled
+        assert sorted(bank.sounds) == ['door.wav', 'walk.wav']
+        assert bank.play(os.path.join(tmp, 'walk.wav')) is not None
+        # Same sound replayed too soon: dropped
+        assert bank.play('walk.wav') is None
+        assert bank.play('door.wav') is not None
+        # Missing sounds are not played (and only looked for once)
+        assert bank.play('missing.wav') is None and bank.sounds['missing.wav'] is None
+        assert (bank.played, bank.dropped) == (2, 1)
+
+
+def test_channel_pool_is_bounded():
+    with tempfile.TemporaryDirectory() as tmp:
+        _save_wav(os.path.join(tmp, 'hit.wav'), frames=441000)
+        bank = SoundBank(tmp, channels=2, min_interval=0)
+        assert bank.enabled
+        channels = {id(bank.play('hit.wav')) for _ in range(5)}
+        assert len(channels) <= 2
+
+
+def test_other_sounds_still_play():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'spell.wav')
+        _save_wav(path, frames=441000)
+        channels = pygame.mixer.get_num_channels() if pygame.mixer.get_init() else 8
+        bank = SoundBank(tmp, channels=8)
+        assert pygame.mixer.get_num_channels() == channels + 8
+        # Sound.play() outside of the bank (Sprite.draw_effect) gets a channel, never one of the bank
+        free = pygame.mixer.get_num_channels() - sound_bank._reserved_channels
+        assert free == channels - (sound_bank._reserved_channels - 8)  # as many free channels as before the bank
+        sound = pygame.mixer.Sound(path)
+        others = [sound.play() for _ in range(free + 1)]
+        assert all(others[:free]) and others[free] is None
+        assert not any(channel.get_busy() for channel in bank._channels)
+        # and the sounds of the bank do not cut them off
+        for _ in range(8):
+            assert bank.play('spell.wav', min_interval=0) is not None
+        assert all(channel.get_busy() for channel in others[:free])
+
+
+if __name__ == '__main__':
+    test_sounds_are_preloaded_and_rate_limited()
+    test_channel_pool_is_bounded()
+    test_other_sounds_still_play()
+    print("✅ SoundBank OK")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests de l'index spatial des entités (algo/spatial_hash.py)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algo.spatial_hash import SpatialHash
+
+
+class Token:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_add_move_remove():
+    goblin, orc, rat = Token('goblin'), Token('orc'), Token('rat')
+    index = SpatialHash([(goblin, (1, 1)), (orc, (1, 1))])
+    index.add(rat, (4, 2))
+    assert index.at((1, 1)) == [goblin, orc]
+    assert index.first_at((4, 2)) is rat and index.first_at((0, 0)) is None
+    index.move(goblin, (1, 1), (2, 1))
+    assert index.at((1, 1)) == [orc] and (2, 1) in index
+    assert index.remove(orc, (1, 1)) and not index.remove(orc, (1, 1))
+    assert (1, 1) not in index and len(index) == 2
+
+
+def test_within_visits_only_given_cells():
+    tokens = [Token(str(i)) for i in range(50)]
+    index = SpatialHash((t, (i, 0)) for i, t in enumerate(tokens))
+    assert set(index.within({(3, 0), (7, 0), (99, 99)})) == {tokens[3], tokens[7]}
+    big_area = frozenset((x, y) for x in range(100) for y in range(3))
+    assert len(index.within(big_area)) == 50
+
+
+if __name__ == '__main__':
+    test_add_move_remove()
+    test_within_visits_only_given_cells()
+    print("✅ SpatialHash OK")
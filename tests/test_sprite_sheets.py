@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests du cache de planches de sprites (tools/sprite_sheets.py)
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from tools import sprite_sheets
+from tools.sprite_sheets import extract_and_save_sprites, sheet_frames
+
+
+def _save_sheet(path: str, columns: int, rows: int, frame_size: int = 8):
+    sheet = pygame.Surface((columns * frame_size, rows * frame_size), pygame.SRCALPHA)
+    for i in range(columns * rows):
+        sheet.fill((10 * i, 0, 0, 255), ((i % columns) * frame_size, (i // columns) * frame_size, frame_size, frame_size))
+    pygame.image.save(sheet, path)
+
+
+def test_frames_are_subsurfaces_loaded_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'flash.png')
+        _save_sheet(path, 5, 2)
+        frames = sheet_frames(path, 5, 2)
+        assert len(frames) == 10 and frames[7].get_size() == (8, 8)
+        assert frames[7].get_parent() is frames[0].get_parent()
+        assert frames[7].get_at((0, 0))[0] == 70
+        assert sheet_frames(path, 5, 2) is frames
+        # Edited spritesheet: reloaded
+        _save_sheet(path, 5, 2, frame_size=4)
+        os.utime(path, ns=(0, 0))
+        assert sheet_frames(path, 5, 2)[0].get_size() == (4, 4)
+
+
+def test_packed_cache_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        path, save_dir = os.path.join(tmp, 'fire.png'), os.path.join(tmp, 'cache')
+        _save_sheet(path, 4, 3)
+        frames = extract_and_save_sprites(path, 4, 3, save_dir)
+        assert sorted(os.listdir(save_dir)) == ['fire_4x3.frames.json', 'fire_4x3.frames.png']
+        sprite_sheets._sheets.clear()
+        cached = extract_and_save_sprites(path, 4, 3, save_dir)
+        assert [f.get_at((0, 0)) for f in cached] == [f.get_at((0, 0)) for f in frames]
+        assert cached[11].get_parent() is cached[0].get_parent()
+
+
+if __name__ == '__main__':
+    test_frames_are_subsurfaces_loaded_once()
+    test_packed_cache_round_trip()
+    print("✅ Sprite sheets OK")
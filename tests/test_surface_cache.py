@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests du cache d'images (tools/surface_cache.py)
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from tools.surface_cache import SurfaceCache, TokenImages, new_sprite_id
+
+
+def _save_image(directory: str, name: str, size=(64, 64)) -> str:
+    path = os.path.join(directory, name)
+    pygame.image.save(pygame.Surface(size), path)
+    return path
+
+
+def test_surfaces_are_decoded_once_per_path_and_size():
+    cache = SurfaceCache(max_entries=3)
+    with tempfile.TemporaryDirectory() as tmp:
+        goblin, orc = _save_image(tmp, 'goblin.png'), _save_image(tmp, 'orc.png')
+        image = cache.get(goblin)
+        assert cache.get(goblin) is image
+        small = cache.get(goblin, (32, 32))
+        assert small.get_size() == (32, 32) and cache.get(goblin, (32, 32)) is small
+        assert cache.hits == 3 and cache.misses == 2
+        # Least recently used entry goes first
+        cache.get(orc)
+        cache.get(orc, (16, 16))
+        assert len(cache) == 3 and cache.get(goblin, (32, 32)) is small
+        assert cache.get(goblin) is not image
+        assert cache.get_first([os.path.join(tmp, 'missing.png'), orc]) is cache.get(orc)
+        try:
+            cache.get(os.path.join(tmp, 'missing.png'))
+            assert False, 'FileNotFoundError expected'
+        except FileNotFoundError:
+            pass
+
+
+def test_tokens_are_loaded_on_first_sighting():
+    cache = SurfaceCache()
+    with tempfile.TemporaryDirectory() as tmp:
+        _save_image(tmp, 'Goblin.png', (200, 200))
+        _save_image(tmp, 'Orc.png', (200, 200))
+        tokens = TokenImages(tmp, size=(105, 105), cache=cache)
+        assert len(tokens) == 2 and 'Goblin' in tokens and len(cache) == 0
+        assert tokens.get('Goblin').get_size() == (105, 105)
+        assert tokens.get('Dragon') is None
+        assert cache.misses == 2  # original + resized token, Orc still not decoded
+
+
+def test_sprite_ids_are_unique():
+    ids = [new_sprite_id() for _ in range(100)]
+    assert len(set(ids)) == 100 and min(ids) > 1
+
+
+if __name__ == '__main__':
+    test_surfaces_are_decoded_once_per_path_and_size()
+    test_tokens_are_loaded_on_first_sighting()
+    test_sprite_ids_are_unique()
+    print("✅ SurfaceCache OK")
@@ -0,0 +1,202 @@
+"""
+Compilation des niveaux donjon (maze/*.json) vers un format binaire compact
+
+A donjon JSON export is ~40-100 KB of nested dicts that Level.load_maze used
+to walk several times per descent. compile_dungeon() does that work once and
+keeps only what the game needs:
+
+- the open space as a bit-packed array (1 bit per cell, one padded row after the other)
+- the donjon ROOM_ID of each cell (uint16)
+- door / trapped door / stair tables
+- room rectangles with their features and pre-resolved monster indexes
+- wandering monster groups (one name per monster)
+
+The artifact is cached in maze/.compiled/ and reused as long as the source
+JSON keeps the same mtime and size. Usage (offline): python -m tools.compile_dungeon
+"""
+import os
+import pickle
+import struct
+from array import array
+from typing import Dict, List, Optional
+
+from tools import cell_bits_dnd as cb
+from tools.parse_json_dungeon import parse_dungeon_json
+
+COMPILER_VERSION = 1
+MAGIC = b'DNJC'
+HEADER = struct.Struct('<4sHqq')  # magic, compiler version, source mtime (ns), source size
+
+MAZE_DIR = os.path.join(os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)), 'maze')
+CACHE_DIR = os.path.join(MAZE_DIR, '.compiled')
+
+# 8 cells ('.' = open, '#' = blocked) for each possible byte, most significant bit first
+_BYTE_CELLS = [''.join('.' if byte >> (7 - bit) & 1 else '#' for bit in range(8)) for byte in range(256)]
+
+# In-process cache: json filename -> (mtime, size, compiled dungeon)
+_loaded: Dict[str, tuple] = {}
+
+
+def monster_index(monster_name: str) -> str:
+    return monster_name.lower().replace(' ', '-')
+
+
+def pack_open_space(cells: List[List[int]]) -> bytes:
+    packed = bytearray()
+    for row in cells:
+        row_bytes = bytearray((len(row) + 7) // 8)
+        for x, cell in enumerate(row):
+            if cell & cb.OPENSPACE:
+                row_bytes[x >> 3] |= 0x80 >> (x & 7)
+        packed += row_bytes
+    return bytes(packed)
+
+
+def unpack_open_space(dungeon: dict) -> List[List[str]]:
+    """Maze rows of '.' / '#' from a compiled dungeon"""
+    width, height = dungeon['width'], dungeon['height']
+    stride = (width + 7) // 8
+    packed = dungeon['open_space']
+    return [list(''.join(_BYTE_CELLS[b] for b in packed[y * stride:(y + 1) * stride])[:width]) for y in range(height)]
+
+
+def compile_dungeon(json_filename: str) -> Optional[dict]:
+    """Parse a donjon JSON export once and keep only what Level needs"""
+    # Imported here: the regex parser pulls populate_functions, not needed to load a compiled level
+    from tools.parsing_json_monsters import get_monster_counts
+
+    dungeon = parse_dungeon_json(json_filename)
+    if dungeon is None:
+        return None
+    cells = dungeon['cell'] if 'cell' in dungeon else dungeon['cells']
+    height, width = len(cells), len(cells[0])
+
+    doors: List[tuple] = []
+    door_traps: List[tuple] = []
+    stair_up = stair_down = None
+    room_cells = array('H', bytes(2 * width * height))
+    for y, row in enumerate(cells):
+        for x, cell in enumerate(row):
+            if cell & cb.DOORSPACE:
+                doors.append((x, y))
+            if cell & cb.TRAPPED:
+                door_traps.append((x, y))
+            if cell & cb.STAIR_UP and stair_up is None:
+                stair_up = (x, y)
+            if cell & cb.STAIR_DN and stair_down is None:
+                stair_down = (x, y)
+            if cell & cb.ROOM:
+                room_cells[y * width + x] = (cell & cb.ROOM_ID) >> 6
+    if 'door' in dungeon:
+        doors = [(door['col'], door['row']) for door in dungeon['door']]
+
+    corridor_events: dict = {}
+    for feature_detail in (dungeon.get('corridor_features') or {}).values():
+        for mark in feature_detail['marks']:
+            corridor_events[(mark['col'], mark['row'])] = feature_detail['detail']
+
+    wandering_monsters: List[List[str]] = []
+    for monsters_detail in (dungeon.get('wandering_monsters') or {}).values():
+        monsters: List[str] = []
+        for monster_name, monster_count in get_monster_counts(text=monsters_detail).items():
+            monsters += [monster_name] * monster_count
+        wandering_monsters.append(monsters)
+
+    rooms: List[dict] = []
+    room_door_traps: dict = {}
+    for room in dungeon['rooms']:
+        if not room:
+            continue
+        contents = room.get('contents', {})
+        details = contents.get('detail', {})
+        monsters_in_room: dict = get_monster_counts(contents['inhabited']) if 'inhabited' in contents else {}
+        for door_lst in room.get('doors', {}).values():
+            for door in door_lst:
+                if 'trap' in door:
+                    room_door_traps[(door['col'], door['row'])] = door['trap']
+        rooms.append({
+            'id': room['id'], 'x': room['col'], 'y': room['row'], 'w': room['width'], 'h': room['height'],
+            'inhabited': 'inhabited' in contents,
+            'features': details.get('room_features', ''),
+            'trap': details.get('trap'),
+            # One monster per kind, as Level.load_maze always did
+            'monsters': [monster_index(name) for name in monsters_in_room],
+        })
+
+    return {
+        'width': width, 'height': height,
+        'open_space': pack_open_space(cells),
+        'room_cells': room_cells.tobytes(),
+        'doors': doors, 'door_traps': door_traps,
+        'stair_up': stair_up, 'stair_down': stair_down,
+        'corridor_events': corridor_events,
+        'wandering_monsters': wandering_monsters,
+        'rooms': rooms, 'room_door_traps': room_door_traps,
+    }
+
+
+def _cache_filename(json_filename: str) -> str:
+    return os.path.join(CACHE_DIR, f'{os.path.splitext(json_filename)[0]}.dnc')
+
+
+def _read_cache(cache_file: str, mtime: int, size: int) -> Optional[dict]:
+    try:
+        with open(cache_file, 'rb') as f:
+            magic, version, src_mtime, src_size = HEADER.unpack(f.read(HEADER.size))
+            if (magic, version, src_mtime, src_size) != (MAGIC, COMPILER_VERSION, mtime, size):
+                return None
+            return pickle.load(f)
+    except (OSError, struct.error, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def _write_cache(cache_file: str, mtime: int, size: int, dungeon: dict):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_file = f'{cache_file}.tmp{os.getpid()}'
+        with open(tmp_file, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, COMPILER_VERSION, mtime, size))
+            pickle.dump(dungeon, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        # Read-only install (e.g. bundled executable): keep the in-memory copy only
+        print(f'Unable to cache compiled dungeon {cache_file}: {e}')
+
+
+def load_compiled_dungeon(json_filename: str) -> Optional[dict]:
+    """
+    Compiled form of maze/<json_filename>, from memory, then from maze/.compiled/,
+    compiling (and caching) it when the source JSON changed. Callers must not mutate the result.
+    """
+    json_pathname = os.path.join(MAZE_DIR, json_filename)
+    try:
+        stat = os.stat(json_pathname)
+    except OSError:
+        return None
+    mtime, size = stat.st_mtime_ns, stat.st_size
+
+    loaded = _loaded.get(json_filename)
+    if loaded and loaded[:2] == (mtime, size):
+        return loaded[2]
+
+    cache_file = _cache_filename(json_filename)
+    dungeon = _read_cache(cache_file, mtime, size)
+    if dungeon is None:
+        dungeon = compile_dungeon(json_filename)
+        if dungeon is None:
+            return None
+        _write_cache(cache_file, mtime, size, dungeon)
+    _loaded[json_filename] = (mtime, size, dungeon)
+    return dungeon
+
+
+if __name__ == '__main__':
+    import time
+
+    for filename in sorted(f for f in os.listdir(MAZE_DIR) if f.endswith('.json')):
+        start = time.perf_counter()
+        compiled = compile_dungeon(filename)
+        stat = os.stat(os.path.join(MAZE_DIR, filename))
+        _write_cache(_cache_filename(filename), stat.st_mtime_ns, stat.st_size, compiled)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f'{filename}: {stat.st_size // 1024} KB -> {os.path.getsize(_cache_filename(filename)) // 1024} KB ({elapsed:.1f} ms)')
@@ -0,0 +1,204 @@
+"""
+Dépôt mémoïsé des données de jeu (data/<category>/*.json)
+
+populate_functions used to reopen and reparse one JSON file per request_*
+call, and request_proficiency reloads whole equipment categories each time.
+DataRepository reads each data/<category> directory once (one JSON file after
+the other, or from a single packed index file when it is up to date) and keeps
+an identity map of the objects built from it, so that the same proficiency,
+trait or language is built only once per process.
+
+Usage (offline):
+    python -m tools.data_repository          # (re)build the packed index
+    python -m tools.data_repository --bench  # compare with per-file loading
+"""
+import functools
+import json
+import os
+import pickle
+import struct
+import sys
+from typing import Callable, Dict, Iterable, Optional
+
+from tools.common import resource_path
+
+PACK_VERSION = 1
+MAGIC = b'DNDR'
+HEADER = struct.Struct('<4sH')  # magic, pack version
+PACK_FILENAME = '.packed_index.pkl'
+
+DATA_DIR = resource_path('data')
+
+# Categories read through populate_functions._load_json_data, packed by default
+PACKED_CATEGORIES = ('conditions', 'damage-types', 'equipment-categories', 'languages', 'proficiencies', 'subraces', 'traits', 'weapon-properties')
+
+
+def _category_signature(category_dir: str) -> tuple:
+    """(number of JSON files, latest mtime) of a data directory: changes whenever a file is added, removed or edited"""
+    count, latest = 0, 0
+    with os.scandir(category_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.json'):
+                count += 1
+                latest = max(latest, entry.stat().st_mtime_ns)
+    return count, latest
+
+
+def _read_category_dir(category_dir: str) -> Dict[str, dict]:
+    records: Dict[str, dict] = {}
+    with os.scandir(category_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.json'):
+                with open(entry.path, 'r') as f:
+                    records[entry.name[:-5]] = json.load(f)
+    return records
+
+
+class DataRepository:
+    """
+    Raw records of data/<category>/<index>.json, loaded one whole category at a time,
+    plus an identity map of the objects built from them.
+
+    Records and built objects are shared: callers must not mutate them.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None, pack_file: Optional[str] = None):
+        self.data_dir = data_dir or DATA_DIR
+        self.pack_file = pack_file or os.path.join(self.data_dir, PACK_FILENAME)
+        self._records: Dict[str, Dict[str, dict]] = {}
+        self._objects: Dict[tuple, object] = {}
+        self._pack: Optional[dict] = None
+        self.category_loads = 0  # instrumentation: directories actually read
+
+    def _packed(self) -> dict:
+        if self._pack is None:
+            self._pack = {}
+            try:
+                with open(self.pack_file, 'rb') as f:
+                    if HEADER.unpack(f.read(HEADER.size)) == (MAGIC, PACK_VERSION):
+                        self._pack = pickle.load(f)
+            except (OSError, struct.error, pickle.UnpicklingError, EOFError):
+                pass
+        return self._pack
+
+    def records(self, category: str) -> Dict[str, dict]:
+        """index -> raw JSON record for a whole category, loaded on first use"""
+        records = self._records.get(category)
+        if records is None:
+            category_dir = os.path.join(self.data_dir, category)
+            signature = _category_signature(category_dir)
+            packed = self._packed().get(category)
+            if packed and packed[0] == signature:
+                records = packed[1]
+            else:
+                records = _read_category_dir(category_dir)
+            self._records[category] = records
+            self.category_loads += 1
+        return records
+
+    def get(self, category: str, index_name: str) -> dict:
+        """Raw record of data/<category>/<index_name>.json (FileNotFoundError if missing, as open() did)"""
+        try:
+            return self.records(category)[index_name]
+        except KeyError:
+            raise FileNotFoundError(os.path.join(self.data_dir, category, f'{index_name}.json')) from None
+
+    def build(self, kind: str, index_name: str, builder: Callable[[], object]):
+        """Object of that kind and index, built by builder() then served from the identity map"""
+        key = (kind, index_name)
+        try:
+            return self._objects[key]
+        except KeyError:
+            # Threads racing on a missing key may each build it, but setdefault is atomic:
+            # the first object stored is the one every caller gets
+            return self._objects.setdefault(key, builder())
+
+    def clear(self):
+        self._records.clear()
+        self._objects.clear()
+        self._pack = None
+
+    def pack(self, categories: Iterable[str] = PACKED_CATEGORIES) -> str:
+        """Write all given categories into one packed index file, returns its path"""
+        content = {}
+        for category in categories:
+            category_dir = os.path.join(self.data_dir, category)
+            content[category] = (_category_signature(category_dir), _read_category_dir(category_dir))
+        tmp_file = f'{self.pack_file}.tmp{os.getpid()}'
+        with open(tmp_file, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, PACK_VERSION))
+            pickle.dump(content, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, self.pack_file)
+        self._pack = content
+        return self.pack_file
+
+
+repository = DataRepository()
+
+
+def memoized(kind: str):
+    """Turns a request_<kind>(index_name) loader into a thin wrapper over the repository identity map"""
+
+    def decorator(loader: Callable[[str], object]):
+        @functools.wraps(loader)
+        def wrapper(index_name: str):
+            return repository.build(kind, index_name, lambda: loader(index_name))
+
+        wrapper.uncached = loader
+        return wrapper
+
+    return decorator
+
+
+def _bench():
+    import time
+
+    def per_file_load():
+        # What _load_json_data did: one open() + json.loads() per request
+        for category in PACKED_CATEGORIES:
+            category_dir = os.path.join(repository.data_dir, category)
+            for filename in os.listdir(category_dir):
+                with open(os.path.join(category_dir, filename), 'r') as f:
+                    json.loads(f.read())
+
+    def repository_load(repo: DataRepository):
+        for category in PACKED_CATEGORIES:
+            for index_name in list(repo.records(category)):
+                repo.get(category, index_name)
+
+    start = time.perf_counter()
+    per_file_load()
+    print(f'per file JSON reads       : {(time.perf_counter() - start) * 1000:7.1f} ms')
+    start = time.perf_counter()
+    repository_load(DataRepository(pack_file=os.devnull))
+    print(f'repository, JSON dirs     : {(time.perf_counter() - start) * 1000:7.1f} ms')
+    start = time.perf_counter()
+    repository_load(DataRepository())
+    print(f'repository, packed index  : {(time.perf_counter() - start) * 1000:7.1f} ms')
+
+    try:
+        import main
+        from populate_functions import populate, request_proficiency
+    except ImportError as e:
+        print(f'Skipping character collections benchmark ({e})')
+        return
+    names = populate(collection_name='proficiencies', key_name='results')
+    start = time.perf_counter()
+    for name in names:
+        request_proficiency(name)
+    print(f'{len(names)} proficiencies, cold   : {(time.perf_counter() - start) * 1000:7.1f} ms')
+    start = time.perf_counter()
+    for name in names:
+        request_proficiency(name)
+    print(f'{len(names)} proficiencies, cached : {(time.perf_counter() - start) * 1000:7.1f} ms')
+    repository.clear()
+    start = time.perf_counter()
+    main.load_character_collections()
+    print(f'load_character_collections: {(time.perf_counter() - start) * 1000:7.1f} ms')
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        _bench()
+    else:
+        print(f'Packed index written to {repository.pack()}')
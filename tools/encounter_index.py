@@ -0,0 +1,126 @@
+"""
+Index des monstres par facteur de puissance (challenge rating)
+
+Encounter generation used to scan the whole bestiary several times per
+encounter, building one Fraction per monster and per filter. EncounterIndex
+groups the monsters by CR once (all monsters and spellcasters only) and keeps
+the sorted distinct CRs, so that "monsters of CR x" is a dict lookup and
+"nearest available CR" a bisection.
+"""
+from bisect import bisect_left
+from fractions import Fraction
+from random import choice
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def challenge_rating(monster) -> Fraction:
+    return Fraction(str(monster.challenge_rating))
+
+
+class EncounterIndex:
+    """
+    CR -> monsters and CR -> spellcasters for a monster collection (None entries are ignored).
+    The index is built on first query, so that creating it does not load a lazy collection.
+    """
+
+    def __init__(self, monsters: Iterable):
+        self.monsters = monsters
+        self._by_cr: Optional[Dict[Fraction, list]] = None
+        self._casters_by_cr: Dict[Fraction, list] = {}
+        self._crs: List[Fraction] = []
+
+    def _index(self) -> Dict[Fraction, list]:
+        if self._by_cr is None:
+            by_cr: Dict[Fraction, list] = {}
+            casters_by_cr: Dict[Fraction, list] = {}
+            for monster in self.monsters:
+                if not monster:
+                    continue
+                cr = challenge_rating(monster)
+                by_cr.setdefault(cr, []).append(monster)
+                if getattr(monster, 'is_spell_caster', False):
+                    casters_by_cr.setdefault(cr, []).append(monster)
+            self._casters_by_cr = casters_by_cr
+            self._crs = sorted(by_cr)
+            self._by_cr = by_cr
+        return self._by_cr
+
+    @property
+    def crs(self) -> List[Fraction]:
+        """Sorted distinct challenge ratings"""
+        self._index()
+        return self._crs
+
+    def nearest_cr(self, cr) -> Optional[Fraction]:
+        """Available CR closest to cr (the lower one on a tie), None for an empty bestiary"""
+        crs = self.crs
+        if not crs:
+            return None
+        cr = Fraction(str(cr))
+        i = bisect_left(crs, cr)
+        if i < len(crs) and crs[i] == cr:
+            return cr
+        candidates = crs[max(0, i - 1):i + 1]
+        return min(candidates, key=lambda c: abs(c - cr))
+
+    def monsters_with_cr(self, cr, spell_casters_only: bool = False) -> List:
+        """Monsters of exactly that CR (shared list: do not mutate)"""
+        by_cr = self._index()
+        if cr is None:
+            return []
+        return (self._casters_by_cr if spell_casters_only else by_cr).get(Fraction(str(cr)), [])
+
+    def monsters_with_crs(self, crs: Iterable, spell_casters_only: bool = False) -> List:
+        return [m for cr in crs for m in self.monsters_with_cr(cr, spell_casters_only)]
+
+    def monsters_from_cr(self, min_cr, spell_casters_only: bool = False) -> List:
+        """Monsters of CR >= min_cr"""
+        crs = self.crs
+        return self.monsters_with_crs(crs[bisect_left(crs, Fraction(str(min_cr))):], spell_casters_only)
+
+    def select_by_encounter_table(self, encounter_table: dict, encounter_level: int, spell_casters_only: bool = False,
+                                  allow_pairs: bool = True) -> Tuple[List, str]:
+        """
+        Same selection as dnd_5e_core's select_monsters_by_encounter_table(), served by the index:
+        a pair of monsters of different CR, or a group of monsters of the same kind.
+        :return: (monsters, "pair" | "group")
+        """
+        encounter_level = min(20, max(1, encounter_level))
+        if encounter_level not in encounter_table:
+            encounter_level = min(encounter_table, key=lambda k: abs(k - encounter_level))
+        pair_crs, group_dict = encounter_table[encounter_level]
+
+        if allow_pairs and choice([True, False]):
+            # No monster of the exact CR: any monster of the nearest CR
+            cr1_monsters, cr2_monsters = [self.monsters_with_cr(cr, spell_casters_only) or self.monsters_with_cr(self.nearest_cr(cr)) for cr in pair_crs]
+            if cr1_monsters and cr2_monsters:
+                return [choice(cr1_monsters), choice(cr2_monsters)], "pair"
+
+        group_size_key = choice(list(group_dict))
+        group_size = choice(list(map(int, group_size_key.split("-"))))
+        possible_crs: Sequence = group_dict[group_size_key]
+        if encounter_level == 20 and group_size_key == "1":
+            matching_monsters = self.monsters_from_cr(possible_crs[0], spell_casters_only)
+        else:
+            matching_monsters = self.monsters_with_crs(possible_crs, spell_casters_only)
+        if not matching_monsters and self.crs:
+            target_cr = choice(possible_crs) if possible_crs else encounter_level
+            matching_monsters = self.monsters_with_cr(self.nearest_cr(target_cr))
+
+        if matching_monsters:
+            return [choice(matching_monsters)] * group_size, "group"
+        if self.crs:
+            return [choice(self.monsters_with_crs(self.crs))], "group"
+        return [], "group"
+
+
+# Indexes already built, by monster collection (the collection is kept alive with its index)
+_indexes: Dict[int, Tuple[object, EncounterIndex]] = {}
+
+
+def encounter_index(monsters: Iterable) -> EncounterIndex:
+    """Shared EncounterIndex of a monster collection, built once per collection"""
+    entry = _indexes.get(id(monsters))
+    if entry is None or entry[0] is not monsters:
+        entry = _indexes[id(monsters)] = (monsters, EncounterIndex(monsters))
+    return entry[1]
@@ -0,0 +1,117 @@
+"""
+Collections de données chargées à la demande
+
+load_dungeon_collections() and load_character_collections() used to build every
+monster, weapon, spell... before the first menu could be shown. LazyCollection
+only keeps the list of names and builds an entry the first time it is accessed,
+so startup time no longer grows with the size of the data directory.
+
+warm_up() optionally builds all entries in the background on a small pool of
+daemon threads: by the time a menu needs the whole collection, it is usually
+already built. Entries are built once, whichever thread gets there first.
+Warm-up errors are kept in LazyCollection.errors, never printed (the curses
+screen would be overwritten).
+"""
+import queue
+import threading
+from collections.abc import Sequence
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+_UNSET = object()
+
+
+class LazyCollection(Sequence):
+    """
+    Read-only sequence of loader(name) for each name, built on first access.
+
+    With skip_missing, entries for which the loader returns None are left out (as the
+    eager loaders did with filter()): len() and indexing then build the whole collection,
+    bool() does not (true if there are names).
+    Pickles (and copies) as a plain list.
+    """
+
+    def __init__(self, names: Iterable[str], loader: Callable[[str], object], skip_missing: bool = False):
+        self.names: List[str] = list(names)
+        self.loader = loader
+        self.skip_missing = skip_missing
+        self._items: list = [_UNSET] * len(self.names)
+        self._lock = threading.Lock()
+        self._materialized: Optional[list] = None
+        self.errors: Dict[str, str] = {}  # name -> error of its background build (see warm_up)
+
+    def _load(self, i: int):
+        item = self._items[i]
+        if item is _UNSET:
+            # Built outside the lock so that warm-up threads load in parallel; first result wins
+            item = self.loader(self.names[i])
+            with self._lock:
+                if self._items[i] is _UNSET:
+                    self._items[i] = item
+                item = self._items[i]
+        return item
+
+    @property
+    def loaded_count(self) -> int:
+        return sum(item is not _UNSET for item in self._items)
+
+    def materialize(self) -> list:
+        """All entries as a list (built if needed)"""
+        if self._materialized is None:
+            items = [self._load(i) for i in range(len(self.names))]
+            self._materialized = [item for item in items if item is not None] if self.skip_missing else items
+        return self._materialized
+
+    def __bool__(self) -> bool:
+        # Without building anything (len() builds the whole collection with skip_missing)
+        return bool(self._materialized) if self._materialized is not None else bool(self.names)
+
+    def __len__(self) -> int:
+        return len(self.materialize()) if self.skip_missing else len(self.names)
+
+    def __getitem__(self, i):
+        if self.skip_missing or self._materialized is not None:
+            return self.materialize()[i]
+        if isinstance(i, slice):
+            return [self._load(j) for j in range(len(self.names))[i]]
+        return self._load(range(len(self.names))[i])
+
+    def __iter__(self) -> Iterator:
+        if self._materialized is not None:
+            yield from self._materialized
+            return
+        for i in range(len(self.names)):
+            item = self._load(i)
+            if item is None and self.skip_missing:
+                continue
+            yield item
+
+    def __reduce__(self):
+        return list, (self.materialize(),)
+
+    def __repr__(self) -> str:
+        return f'LazyCollection({self.loaded_count}/{len(self.names)} loaded)'
+
+
+def warm_up(*collections: LazyCollection, workers: int = 4) -> List[threading.Thread]:
+    """Build every entry of the collections in the background, returns the (daemon) worker threads"""
+    tasks: queue.SimpleQueue = queue.SimpleQueue()
+    for collection in collections:
+        for i in range(len(collection.names)):
+            tasks.put((collection, i))
+
+    def work():
+        while True:
+            try:
+                collection, i = tasks.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                collection._load(i)
+            except Exception as e:
+                # Left unloaded: the error will surface again on access, in the caller's thread
+                collection.errors[collection.names[i]] = f'{type(e).__name__}: {e}'
+
+    threads = [threading.Thread(target=work, name=f'collections-warm-up-{n}', daemon=True) for n in range(workers)]
+    for thread in threads:
+        thread.start()
+    return threads
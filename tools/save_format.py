@@ -0,0 +1,220 @@
+"""
+Format de sauvegarde versionné et compressé (personnages, groupe, parties pygame)
+
+Saves used to be raw pickles of whole object graphs: every spell, weapon,
+proficiency or class of a character was embedded field by field, and a save
+could no longer be read once a dnd_5e_core class was renamed or moved.
+
+A save file is now:
+
+    header  magic b'DNDS', schema version, length of the uncompressed payload
+    payload zlib-compressed pickle of the object graph, in which the static data
+            of dnd_5e_core (spells, weapons, armors, races, classes,
+            proficiencies...) is written as a reference (kind, index) plus the
+            fields that differ from the data files (equipped, custom name...)
+
+On load, references are resolved through the dnd_5e_core loaders (each index is
+loaded once per process, new copies are unpickled from that template), classes
+are looked up through RENAMED_CLASSES, and the migrations registered with
+@migration are applied to saves of an older schema version. Files without the
+header are the historical raw pickles (schema version 0): they are still read,
+so the first save converts them.
+
+Usage (offline):
+    python -m tools.save_format gameState/characters/*.dmp   # sizes and load times, pickle vs save format
+"""
+import functools
+import io
+import os
+import pickle
+import struct
+import sys
+import zlib
+from typing import Any, Callable, Dict, Tuple
+
+SAVE_VERSION = 1
+MAGIC = b'DNDS'
+HEADER = struct.Struct('<4sHI')  # magic, schema version, uncompressed payload size
+COMPRESSION_LEVEL = 6
+
+# Static data written by reference: kind -> (module, class name, loader of dnd_5e_core.data)
+STATIC_KINDS = {
+    'spell': ('dnd_5e_core.spells.spell', 'Spell', 'load_spell'),
+    'weapon': ('dnd_5e_core.equipment.weapon', 'WeaponData', 'load_weapon'),
+    'armor': ('dnd_5e_core.equipment.armor', 'ArmorData', 'load_armor'),
+    'equipment': ('dnd_5e_core.equipment.equipment', 'Equipment', 'load_equipment'),
+    'equipment-category': ('dnd_5e_core.equipment.equipment', 'EquipmentCategory', 'load_equipment_category'),
+    'weapon-property': ('dnd_5e_core.equipment.weapon', 'WeaponProperty', 'load_weapon_property'),
+    'damage-type': ('dnd_5e_core.equipment.weapon', 'DamageType', 'load_damage_type'),
+    'race': ('dnd_5e_core.races.race', 'Race', 'load_race'),
+    'subrace': ('dnd_5e_core.races.subrace', 'SubRace', 'load_subrace'),
+    'trait': ('dnd_5e_core.races.trait', 'Trait', 'load_trait'),
+    'language': ('dnd_5e_core.races.language', 'Language', 'load_language'),
+    'class': ('dnd_5e_core.classes.class_type', 'ClassType', 'load_class'),
+    'proficiency': ('dnd_5e_core.classes.proficiency', 'Proficiency', 'load_proficiency'),
+}
+
+# (module, class name) of a save -> (module, class name) of the class now
+RENAMED_CLASSES: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+# Classes pickled while their module was run as a script (python dungeon_pygame.py)
+MAIN_MODULES = ('dungeon_pygame', 'main')
+
+# Schema version -> function upgrading a loaded object of that version to the next one
+MIGRATIONS: Dict[int, Callable[[Any], Any]] = {}
+
+
+def migration(from_version: int):
+    """Register the upgrade of saves of schema version from_version to from_version + 1"""
+
+    def decorator(upgrade: Callable[[Any], Any]):
+        MIGRATIONS[from_version] = upgrade
+        return upgrade
+
+    return decorator
+
+
+@functools.lru_cache(maxsize=None)
+def _static_types() -> Dict[type, str]:
+    """Class -> kind, for the classes of STATIC_KINDS that can be imported"""
+    import importlib
+    types = {}
+    for kind, (module, name, _) in STATIC_KINDS.items():
+        try:
+            types[getattr(importlib.import_module(module), name)] = kind
+        except (ImportError, AttributeError):
+            pass
+    return types
+
+
+@functools.lru_cache(maxsize=None)
+def _template(kind: str, index: str):
+    """Object of the data files for (kind, index), loaded once per process (None if unknown)"""
+    from dnd_5e_core import data
+    try:
+        return getattr(data, STATIC_KINDS[kind][2])(index)
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _template_pickle(kind: str, index: str) -> bytes:
+    template = _template(kind, index)
+    if template is None:
+        raise pickle.UnpicklingError(f"Unknown {kind} {index!r}")
+    return pickle.dumps(template, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _restore(kind: str, index: str):
+    """Unpickling of a static reference: a new copy of the data file object (fields of the save applied after)"""
+    # Unpickled rather than deep-copied: several times faster, and nothing is shared with the template
+    return pickle.loads(_template_pickle(kind, index))
+
+
+class SavePickler(pickle.Pickler):
+    """Writes the objects of STATIC_KINDS as references"""
+
+    def reducer_override(self, obj):
+        kind = _static_types().get(type(obj))
+        index = getattr(obj, 'index', None) if kind else None
+        if not isinstance(index, str):
+            return NotImplemented
+        template = _template(kind, index)
+        if type(template) is not type(obj):
+            return NotImplemented
+        fields, defaults = vars(obj), vars(template)
+        if not defaults.keys() <= fields.keys():
+            return NotImplemented
+        changed = {}
+        for name, value in fields.items():
+            try:
+                same = name in defaults and bool(defaults[name] == value)
+            except Exception:
+                same = False
+            if not same:
+                changed[name] = value
+        # Changed fields are the BUILD state: restored after the object is memoized, cycles included
+        return _restore, (kind, index), changed or None
+
+
+class SaveUnpickler(pickle.Unpickler):
+    """Resolves static references and classes renamed or moved since the save"""
+
+    def find_class(self, module: str, name: str):
+        if name == '_restore' and module in (__name__, 'tools.save_format'):
+            return _restore
+        module, name = RENAMED_CLASSES.get((module, name), (module, name))
+        try:
+            return super().find_class(module, name)
+        except (ImportError, AttributeError):
+            if module != '__main__':
+                raise
+        for main_module in MAIN_MODULES:
+            try:
+                return super().find_class(main_module, name)
+            except (ImportError, AttributeError):
+                continue
+        raise pickle.UnpicklingError(f"Can't find class {name} of __main__ in {', '.join(MAIN_MODULES)}")
+
+
+def dumps(obj) -> bytes:
+    buffer = io.BytesIO()
+    SavePickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    payload = buffer.getbuffer()
+    return HEADER.pack(MAGIC, SAVE_VERSION, len(payload)) + zlib.compress(payload, COMPRESSION_LEVEL)
+
+
+def loads(data: bytes):
+    """Object of a save (current format, older schema version or raw pickle), migrated to SAVE_VERSION"""
+    if data[:len(MAGIC)] == MAGIC:
+        _, version, size = HEADER.unpack_from(data)
+        if version > SAVE_VERSION:
+            raise pickle.UnpicklingError(f"Save schema version {version} is newer than {SAVE_VERSION}")
+        payload = zlib.decompress(data[HEADER.size:], bufsize=max(size, 1))
+    else:
+        version, payload = 0, data
+    obj = SaveUnpickler(io.BytesIO(payload)).load()
+    for from_version in range(version, SAVE_VERSION):
+        upgrade = MIGRATIONS.get(from_version)
+        if upgrade is not None:
+            obj = upgrade(obj)
+    return obj
+
+
+def dump(obj, path: str):
+    """Write the save of obj to path (replaced atomically: a failed save leaves the previous one)"""
+    data = dumps(obj)
+    tmp_file = f'{path}.tmp{os.getpid()}'
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file, path)
+
+
+def load(path: str):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def schema_version(path: str) -> int:
+    """Schema version of a save file, 0 for a raw pickle"""
+    with open(path, 'rb') as f:
+        head = f.read(HEADER.size)
+    return HEADER.unpack(head)[1] if len(head) == HEADER.size and head.startswith(MAGIC) else 0
+
+
+def _bench(paths):
+    import time
+    for path in paths:
+        obj = load(path)
+        raw, packed = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), dumps(obj)
+        timings = []
+        for decode, data in ((pickle.loads, raw), (loads, packed)):
+            start = time.perf_counter()
+            decode(data)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{os.path.basename(path)}: pickle {len(raw)} bytes {timings[0]:.2f} ms,"
+              f" save format {len(packed)} bytes {timings[1]:.2f} ms")
+
+
+if __name__ == '__main__':
+    _bench(sys.argv[1:])
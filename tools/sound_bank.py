@@ -0,0 +1,116 @@
+"""
+Banque d'effets sonores préchargés
+
+move_char, handle_fountains, open_chest... used to build a pygame.mixer.Sound
+from the file on every step, fountain visit or chest, decoding a WAV/MP3 file
+each time (the walk sound sometimes twice per move). SoundBank decodes the
+files of a sounds directory once and plays them on a bounded pool of mixer
+channels reserved for it, dropping a sound that is replayed too soon (the same sound
+twice within min_interval seconds).
+
+Without an audio device (mixer not available), playing is a no-op.
+"""
+import os
+import time
+from typing import Dict, List, Optional
+
+import pygame
+
+SOUND_EXTENSIONS = ('.wav', '.mp3', '.ogg')
+
+# Mixer channels reserved by the banks created so far
+_reserved_channels = 0
+
+
+class SoundBank:
+    """Sound effects of a directory by file name, decoded once"""
+
+    def __init__(self, directory: str, channels: int = 8, min_interval: float = 0.08):
+        self.directory = directory
+        self.min_interval = min_interval
+        self.sounds: Dict[str, Optional[pygame.mixer.Sound]] = {}
+        self._last_played: Dict[str, float] = {}
+        self._channels: List[pygame.mixer.Channel] = []
+        self._started: List[float] = []
+        self.played = self.dropped = 0  # instrumentation
+        if not self._init_mixer():
+            return
+        # The pool is reserved (the low channel numbers, after the pools of the other banks): Sound.play()
+        # elsewhere (Sprite.draw_effect, menus) never takes it, and gets as many channels as before
+        global _reserved_channels
+        first = _reserved_channels
+        pygame.mixer.set_num_channels(pygame.mixer.get_num_channels() + channels)
+        _reserved_channels = first + channels
+        pygame.mixer.set_reserved(_reserved_channels)
+        self._channels = [pygame.mixer.Channel(i) for i in range(first, first + channels)]
+        self._started = [0.0] * channels
+        if os.path.isdir(directory):
+            for filename in sorted(os.listdir(directory)):
+                if filename.lower().endswith(SOUND_EXTENSIONS):
+                    self._load(filename)
+
+    @staticmethod
+    def _init_mixer() -> bool:
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init()
+            except pygame.error as e:
+                print(f'Sound disabled: {e}')
+                return False
+        return True
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._channels)
+
+    def _load(self, filename: str) -> Optional[pygame.mixer.Sound]:
+        try:
+            sound = pygame.mixer.Sound(os.path.join(self.directory, filename))
+        except (FileNotFoundError, pygame.error) as e:
+            # Remembered as missing: reported once
+            print(f'Unable to load sound {filename}: {e}')
+            sound = None
+        self.sounds[filename] = sound
+        return sound
+
+    def _free_channel(self) -> int:
+        """Index of an idle channel of the pool, or of the one playing for the longest time"""
+        for i, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return i
+        return min(range(len(self._channels)), key=self._started.__getitem__)
+
+    def play(self, filename: str, min_interval: Optional[float] = None) -> Optional[pygame.mixer.Channel]:
+        """Play a sound of the bank (file name, or path in the bank directory), returns its channel or None if not played"""
+        if not self.enabled:
+            return None
+        filename = os.path.basename(filename)
+        sound = self.sounds[filename] if filename in self.sounds else self._load(filename)
+        if sound is None:
+            return None
+        now = time.monotonic()
+        if now - self._last_played.get(filename, -1e9) < (self.min_interval if min_interval is None else min_interval):
+            self.dropped += 1
+            return None
+        self._last_played[filename] = now
+        i = self._free_channel()
+        self._started[i] = now
+        self._channels[i].play(sound)
+        self.played += 1
+        return self._channels[i]
+
+
+# Sound banks by directory, created on first use
+sound_banks: Dict[str, SoundBank] = {}
+
+
+def get_sound_bank(directory: str) -> SoundBank:
+    directory = os.path.normpath(directory)
+    if directory not in sound_banks:
+        sound_banks[directory] = SoundBank(directory)
+    return sound_banks[directory]
+
+
+def play_sound(sound_file: str) -> Optional[pygame.mixer.Channel]:
+    """Play a sound file through the bank of its directory"""
+    return get_sound_bank(os.path.dirname(sound_file)).play(sound_file)
@@ -1,10 +1,10 @@
+import json
 import os
 import sys
 
 import pygame
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from pygame import Surface
-import hashlib
 
 # from dungeon_menu_pygame import SCREEN_HEIGHT
 # from dungeon_pygame import SCREEN_WIDTH
@@ -57,95 +57,102 @@ def extract_sprites(spritesheet_path, columns, rows) -> List[Surface]:
 
     return sprites
 
-def get_spritesheet_hash(spritesheet_path: str) -> str:
-    """Generate a hash of the spritesheet file to detect changes"""
-    with open(spritesheet_path, 'rb') as f:
-        return hashlib.md5(f.read()).hexdigest()
+# Frames already loaded in this process: (path, columns, rows) -> (size, mtime, frames)
+_sheets: Dict[tuple, tuple] = {}
 
 
-def extract_and_save_sprites(spritesheet_path: str, columns: int, rows: int, save_dir: str) -> List[Surface]:
-    """
-    Extract sprites from a spritesheet, save them individually, and return the loaded sprites.
+def _sheet_signature(spritesheet_path: str) -> Tuple[int, int]:
+    """(size, mtime) of the spritesheet file: changes whenever the file is edited, without reading it"""
+    stat = os.stat(spritesheet_path)
+    return stat.st_size, stat.st_mtime_ns
 
-    Args:
-        spritesheet_path: Path to the spritesheet image
-        columns: Number of columns in the spritesheet
-        rows: Number of rows in the spritesheet
-        save_dir: Directory to save individual sprite files
-    """
-    # Create hash of filename and parameters for the cache directory
-    spritesheet_name = os.path.splitext(os.path.basename(spritesheet_path))[0]
-    spritesheet_hash = get_spritesheet_hash(spritesheet_path)
-    cache_dir = os.path.join(save_dir, f"{spritesheet_name}_{spritesheet_hash}")
-
-    # Check if cached sprites exist and are valid
-    if os.path.exists(cache_dir):
-        return load_cached_sprites(cache_dir, columns * rows)
 
-    # Create cache directory if it doesn't exist
-    os.makedirs(cache_dir, exist_ok=True)
-
-    # Load the spritesheet
-    spritesheet = pygame.image.load(spritesheet_path).convert_alpha()
-
-    # Calculate sprite dimensions
-    sheet_width, sheet_height = spritesheet.get_size()
-    sprite_width = sheet_width // columns
-    sprite_height = sheet_height // rows
-
-    sprites: List[Surface] = []
-    num_sprites: int = columns * rows
-
-    for i in range(num_sprites):
-        row = i // columns
-        col = i % columns
+def _load_image(path: str) -> Surface:
+    image = pygame.image.load(path)
+    # Converted to the display format when there is one (not in headless tools / tests)
+    return image.convert_alpha() if pygame.display.get_surface() is not None else image
 
-        # Create sprite surface
-        sprite_surface = pygame.Surface((sprite_width, sprite_height), pygame.SRCALPHA)
 
-        # Extract sprite from sheet
-        sprite_surface.blit(spritesheet, (0, 0),
-                            (col * sprite_width, row * sprite_height,
-                             sprite_width, sprite_height))
+def _frame_rects(sheet_size: Tuple[int, int], columns: int, rows: int) -> List[Tuple[int, int, int, int]]:
+    sprite_width, sprite_height = sheet_size[0] // columns, sheet_size[1] // rows
+    return [(col * sprite_width, row * sprite_height, sprite_width, sprite_height) for row in range(rows) for col in range(columns)]
 
-        # Save individual sprite
-        sprite_path = os.path.join(cache_dir, f"sprite_{i}.png")
-        pygame.image.save(sprite_surface, sprite_path)
 
-        sprites.append(sprite_surface)
+def sheet_frames(spritesheet_path: str, columns: int, rows: int) -> List[Surface]:
+    """
+    Frames of a spritesheet, as subsurfaces of the sheet loaded once per process
+    (reloaded when the file size or mtime changes). Frames are shared: do not draw on them.
+    """
+    key = (os.path.abspath(spritesheet_path), columns, rows)
+    signature = _sheet_signature(spritesheet_path)
+    loaded = _sheets.get(key)
+    if loaded and loaded[0] == signature:
+        return loaded[1]
+    sheet = _load_image(spritesheet_path)
+    frames = [sheet.subsurface(rect) for rect in _frame_rects(sheet.get_size(), columns, rows)]
+    _sheets[key] = (signature, frames)
+    return frames
 
-    # Save metadata
-    save_metadata(cache_dir, columns, rows, sprite_width, sprite_height)
 
-    return sprites
+def extract_and_save_sprites(spritesheet_path: str, columns: int, rows: int, save_dir: str) -> List[Surface]:
+    """
+    Extract sprites from a spritesheet, cache them in save_dir and return the loaded sprites.
+    The cache is one packed image of all frames plus a JSON index (frame rectangles, source size and mtime),
+    so a cache hit decodes a single image and hands back subsurfaces of it.
 
+    Args:
+        spritesheet_path: Path to the spritesheet image
+        columns: Number of columns in the spritesheet
+        rows: Number of rows in the spritesheet
+        save_dir: Directory of the packed frames cache
+    """
+    key = (os.path.abspath(spritesheet_path), columns, rows)
+    signature = _sheet_signature(spritesheet_path)
+    loaded = _sheets.get(key)
+    if loaded and loaded[0] == signature:
+        return loaded[1]
 
-def load_cached_sprites(cache_dir: str, expected_count: int) -> List[Surface]:
-    """Load sprites from cache directory"""
-    sprites: List[Surface] = []
+    spritesheet_name = os.path.splitext(os.path.basename(spritesheet_path))[0]
+    cache_file = os.path.join(save_dir, f"{spritesheet_name}_{columns}x{rows}.frames")
 
-    for i in range(expected_count):
-        sprite_path = os.path.join(cache_dir, f"sprite_{i}.png")
-        if os.path.exists(sprite_path):
-            sprite = pygame.image.load(sprite_path).convert_alpha()
-            sprites.append(sprite)
-        else:
-            raise FileNotFoundError(f"Cached sprite {i} not found")
+    frames = load_packed_sprites(cache_file, signature)
+    if frames is None:
+        spritesheet = _load_image(spritesheet_path)
+        rects = _frame_rects(spritesheet.get_size(), columns, rows)
+        # Frames only: the margins of a sheet that does not divide evenly are left out
+        packed = spritesheet.subsurface((0, 0, rects[-1][0] + rects[-1][2], rects[-1][1] + rects[-1][3]))
+        save_packed_sprites(cache_file, packed, rects, signature)
+        frames = [spritesheet.subsurface(rect) for rect in rects]
 
-    return sprites
+    _sheets[key] = (signature, frames)
+    return frames
 
 
-def save_metadata(cache_dir: str, columns: int, rows: int, width: int, height: int):
-    """Save spritesheet metadata"""
-    metadata = {
-        'columns': columns,
-        'rows': rows,
-        'width': width,
-        'height': height
-    }
-    with open(os.path.join(cache_dir, 'metadata.txt'), 'w') as f:
-        for key, value in metadata.items():
-            f.write(f"{key}={value}\n")
+def load_packed_sprites(cache_file: str, signature: Tuple[int, int]) -> Optional[List[Surface]]:
+    """Frames from a packed cache (None if missing or built from another version of the spritesheet)"""
+    try:
+        with open(f"{cache_file}.json", 'r') as f:
+            index = json.load(f)
+        if tuple(index['source']) != tuple(signature):
+            return None
+        packed = _load_image(f"{cache_file}.png")
+        return [packed.subsurface(rect) for rect in index['frames']]
+    except (OSError, ValueError, KeyError, pygame.error):
+        return None
+
+
+def save_packed_sprites(cache_file: str, packed: Surface, rects: List[tuple], signature: Tuple[int, int]):
+    """Save the frames image and its index (the index last, so that it never points to a partial image)"""
+    try:
+        os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+        pygame.image.save(packed, f"{cache_file}.png")
+        tmp_file = f"{cache_file}.json.tmp{os.getpid()}"
+        with open(tmp_file, 'w') as f:
+            json.dump({'source': list(signature), 'frames': [list(rect) for rect in rects]}, f)
+        os.replace(tmp_file, f"{cache_file}.json")
+    except (OSError, pygame.error) as e:
+        # Read-only install: frames are still served from memory
+        print(f"Unable to cache sprites {cache_file}: {e}")
 
 
 def load_sprites(spritesheet_path: str, columns: int, rows: int, save_dir: str) -> List[Surface]:
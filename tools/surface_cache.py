@@ -0,0 +1,117 @@
+"""
+Cache des images (surfaces pygame) partagé entre niveaux et parties
+
+Every level change and wandering monster spawn used to decode (and rescale)
+the same monster, treasure and item PNG files again, and every monster token
+of the tokens directory was decoded at startup. SurfaceCache keeps decoded
+surfaces by (image path, size) with LRU eviction for the whole process, and
+TokenImages only decodes a token the first time that monster is seen.
+
+Sprite ids (keys of the sprites dictionaries) come from a session counter
+instead of max(sprites) + 1.
+"""
+import itertools
+import os
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional, Tuple
+
+import pygame
+from pygame import Surface
+
+FIRST_SPRITE_ID = 2  # 1 is the hero (sprites) and the fountain (level sprites)
+_sprite_ids = itertools.count(FIRST_SPRITE_ID)
+
+
+def new_sprite_id() -> int:
+    """Sprite id never used before in this session"""
+    return next(_sprite_ids)
+
+
+class SurfaceCache:
+    """
+    Decoded images by (path, size), the least recently used ones evicted beyond max_entries.
+    Surfaces are shared: callers must not draw on them.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._surfaces: OrderedDict = OrderedDict()
+        self.hits = self.misses = 0  # instrumentation
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def get(self, path: str, size: Optional[Tuple[int, int]] = None) -> Surface:
+        """
+        Image at path, scaled to size if given (FileNotFoundError if missing, as pygame.image.load)
+        Converted to the display format once a display mode is set.
+        """
+        key = (os.path.normpath(path), tuple(size) if size else None)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        if size:
+            surface = pygame.transform.scale(self.get(path), key[1])
+        else:
+            surface = pygame.image.load(key[0])
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+        self._surfaces[key] = surface
+        while len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def get_first(self, paths: Iterable[str], size: Optional[Tuple[int, int]] = None) -> Surface:
+        """First image found among paths (FileNotFoundError if none exists)"""
+        error: Optional[FileNotFoundError] = None
+        for path in paths:
+            try:
+                return self.get(path, size)
+            except FileNotFoundError as e:
+                error = e
+        raise error or FileNotFoundError('no image path given')
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+surface_cache = SurfaceCache()
+
+
+class TokenImages:
+    """Monster tokens by monster name (file name without extension), decoded and scaled on first sighting"""
+
+    def __init__(self, directory: str, size: Tuple[int, int] = (105, 105), cache: Optional[SurfaceCache] = None):
+        self.directory = directory
+        self.size = size
+        self.cache = cache if cache is not None else surface_cache
+        self._files = {os.path.splitext(filename)[0]: filename for filename in os.listdir(directory)} if os.path.isdir(directory) else {}
+
+    def get(self, monster_name: str, default=None) -> Optional[Surface]:
+        filename = self._files.get(monster_name)
+        if filename is None:
+            return default
+        try:
+            return self.cache.get(os.path.join(self.directory, filename), self.size)
+        except (FileNotFoundError, pygame.error) as e:
+            print(f'Unable to load token {filename}: {e}')
+            del self._files[monster_name]
+            return default
+
+    def __getitem__(self, monster_name: str) -> Surface:
+        token = self.get(monster_name)
+        if token is None:
+            raise KeyError(monster_name)
+        return token
+
+    def __contains__(self, monster_name: str) -> bool:
+        return monster_name in self._files
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._files))
+
+    def __len__(self) -> int:
+        return len(self._files)